@@ -0,0 +1,258 @@
+"""
+MadVerse Genre Ambience
+Endless procedural background beds, one per genre, synthesized in small
+chunks on a background thread into a ring buffer that the mixer drains.
+Switching genre cross-fades the old bed into the new one.
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from audio.sounds import HAS_NUMPY, SAMPLE_RATE, oscillate, _to_pcm16, _write_wav
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+CHUNK_FRAMES = 1024                  # ~23 ms per synthesis step
+RING_FRAMES = 8 * CHUNK_FRAMES       # ~190 ms written ahead of playback
+CROSSFADE_SECONDS = 1.5
+MAX_LAYERS = 4                       # bounds the per-chunk cost of any genre
+MAX_BEDS = 2                         # beds rendered at once during a cross-fade
+
+# Each layer is a drone whose level is swept by a slow LFO:
+#   level = volume * (1 - depth * (0.5 + 0.5 * sin(2π · lfo · t)))
+AMBIENCE_SPECS: Dict[str, List[Dict]] = {
+    "horror": [
+        {"freq": 55,    "waveform": "sawtooth", "volume": 0.05, "lfo": 0.13, "depth": 0.9},
+        {"freq": 58.3,  "waveform": "sine",     "volume": 0.08, "lfo": 0.07, "depth": 0.5},
+    ],
+    "scifi": [
+        {"freq": 110,   "waveform": "sine",     "volume": 0.06, "lfo": 0.25, "depth": 0.4},
+        {"freq": 165,   "waveform": "sine",     "volume": 0.04, "lfo": 0.5,  "depth": 0.6},
+        {"freq": 880,   "waveform": "square",   "volume": 0.006, "lfo": 3.0, "depth": 1.0},
+    ],
+    "fantasy": [
+        {"freq": 196,   "waveform": "sine",     "volume": 0.04, "lfo": 0.10, "depth": 0.6},
+        {"freq": 247,   "waveform": "sine",     "volume": 0.035, "lfo": 0.15, "depth": 0.7},
+        {"freq": 294,   "waveform": "sine",     "volume": 0.03, "lfo": 0.20, "depth": 0.8},
+    ],
+    "romance": [
+        {"freq": 247,   "waveform": "sine",     "volume": 0.05, "lfo": 0.2,  "depth": 0.5},
+        {"freq": 311,   "waveform": "sine",     "volume": 0.04, "lfo": 0.3,  "depth": 0.6},
+    ],
+    "academic": [
+        {"freq": 165,   "waveform": "sine",     "volume": 0.03, "lfo": 0.05, "depth": 0.3},
+        {"freq": 330,   "waveform": "sine",     "volume": 0.02, "lfo": 0.08, "depth": 0.5},
+    ],
+    "existential": [
+        {"freq": 55,    "waveform": "sine",     "volume": 0.07, "lfo": 0.03, "depth": 0.6},
+        {"freq": 110,   "waveform": "sine",     "volume": 0.04, "lfo": 0.05, "depth": 0.8},
+    ],
+    "ai": [
+        {"freq": 220,   "waveform": "square",   "volume": 0.012, "lfo": 4.0, "depth": 1.0},
+        {"freq": 330,   "waveform": "sine",     "volume": 0.04, "lfo": 0.5,  "depth": 0.5},
+        {"freq": 440,   "waveform": "sawtooth", "volume": 0.01, "lfo": 0.25, "depth": 0.7},
+    ],
+}
+
+
+class AmbienceGenerator:
+    """
+    One genre's bed as a pure function of stream position, so successive
+    chunks join seamlessly and any render is reproducible.
+    """
+
+    def __init__(self, genre_id: str, sample_rate: int = SAMPLE_RATE):
+        self.genre_id = genre_id
+        self.sample_rate = sample_rate
+        self.layers = AMBIENCE_SPECS.get(genre_id, [])[:MAX_LAYERS]
+        self.pos = 0
+
+    def render(self, frames: int):
+        t = (self.pos + np.arange(frames, dtype=np.float64)) / self.sample_rate
+        out = np.zeros(frames, dtype=np.float64)
+        for layer in self.layers:
+            level = layer["volume"] * (1 - layer["depth"] * (
+                0.5 + 0.5 * np.sin(2 * np.pi * layer["lfo"] * t)))
+            out += oscillate(layer["freq"], t, layer["waveform"]) * level
+        self.pos += frames
+        return out
+
+
+class AmbienceEngine:
+    """
+    Streams genre ambience in CHUNK_FRAMES steps.
+
+    Call start() to synthesize on a background thread and read() from the
+    audio side, or call render() directly for deterministic offline output.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, chunk_frames: int = CHUNK_FRAMES,
+                 ring_frames: int = RING_FRAMES, crossfade: float = CROSSFADE_SECONDS):
+        self.sample_rate = sample_rate
+        self.chunk_frames = chunk_frames
+        self.fade_frames = max(1, int(crossfade * sample_rate))
+
+        # Beds being rendered: [generator, gain, gain change per frame]
+        self._beds: List[list] = []
+        self._requests: List[Optional[str]] = []
+
+        self._ring = np.zeros(ring_frames, dtype=np.float32)
+        self._read_pos = 0      # total frames consumed
+        self._write_pos = 0     # total frames produced
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._stats = {"chunks": 0, "render_s": 0.0, "render_max_s": 0.0, "underruns": 0}
+
+    # ─── CONTROL ──────────────────────────────────────────
+
+    def set_genre(self, genre_id: Optional[str]):
+        """Cross-fade to genre_id's bed (None fades to silence)."""
+        with self._cond:
+            self._requests.append(genre_id)
+            self._cond.notify_all()
+
+    @property
+    def genre_id(self) -> Optional[str]:
+        rising = [bed[0].genre_id for bed in self._beds if bed[2] >= 0]
+        return rising[-1] if rising else None
+
+    def is_silent(self) -> bool:
+        """Nothing left to play: no beds, no pending switch, nothing buffered."""
+        with self._cond:
+            return not (self._beds or self._requests) and self._write_pos == self._read_pos
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ambience", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(1.0)
+        self._thread = None
+
+    # ─── PRODUCER ─────────────────────────────────────────
+
+    def render(self, frames: int):
+        """Synthesize the next `frames` samples as floats in [-1, 1]."""
+        started = time.perf_counter()
+        with self._cond:
+            requests, self._requests = self._requests, []
+        for genre_id in requests:
+            self._switch(genre_id)
+
+        out = np.zeros(frames, dtype=np.float64)
+        ramp = np.arange(1, frames + 1, dtype=np.float64)
+        for bed in self._beds:
+            gen, gain, step = bed
+            gains = np.clip(gain + step * ramp, 0.0, 1.0) if step else gain
+            out += gen.render(frames) * gains
+            bed[1] = min(1.0, max(0.0, gain + step * frames))
+        self._beds = [bed for bed in self._beds if bed[1] > 0 or bed[2] > 0]
+
+        elapsed = time.perf_counter() - started
+        self._stats["chunks"] += 1
+        self._stats["render_s"] += elapsed
+        self._stats["render_max_s"] = max(self._stats["render_max_s"], elapsed)
+        return out
+
+    def _switch(self, genre_id: Optional[str]):
+        step = 1.0 / self.fade_frames
+        for bed in self._beds:
+            bed[2] = -step
+        if genre_id in AMBIENCE_SPECS:
+            self._beds.append([AmbienceGenerator(genre_id, self.sample_rate), 0.0, step])
+        # Keep the cost bounded if genres are switched faster than the fade
+        while len(self._beds) > MAX_BEDS:
+            self._beds.remove(min(self._beds[:-1], key=lambda bed: bed[1]))
+
+    def _run(self):
+        size = len(self._ring)
+        while True:
+            with self._cond:
+                # Sleep while the ring is full or there is nothing to play;
+                # read(), set_genre() and stop() notify
+                while self._running and (
+                        self._write_pos - self._read_pos > size - self.chunk_frames
+                        or not (self._beds or self._requests)):
+                    self._cond.wait()
+                if not self._running:
+                    return
+            chunk = self.render(self.chunk_frames).astype(np.float32)
+            with self._cond:
+                start = self._write_pos % size
+                first = min(len(chunk), size - start)
+                self._ring[start:start + first] = chunk[:first]
+                self._ring[:len(chunk) - first] = chunk[first:]
+                self._write_pos += len(chunk)
+
+    # ─── CONSUMER ─────────────────────────────────────────
+
+    def read(self, frames: int):
+        """Take up to `frames` buffered samples; any shortfall is silence."""
+        out = np.zeros(frames, dtype=np.float32)
+        size = len(self._ring)
+        with self._cond:
+            n = min(frames, self._write_pos - self._read_pos)
+            start = self._read_pos % size
+            first = min(n, size - start)
+            out[:first] = self._ring[start:start + first]
+            out[first:n] = self._ring[:n - first]
+            self._read_pos += n
+            if n < frames and self._running:
+                self._stats["underruns"] += 1
+            self._cond.notify_all()
+        return out
+
+    def stats(self) -> Dict:
+        s = dict(self._stats)
+        s["render_avg_ms"] = s["render_s"] / s["chunks"] * 1000 if s["chunks"] else 0.0
+        s["render_max_ms"] = s.pop("render_max_s") * 1000
+        s.pop("render_s")
+        s["buffered_ms"] = (self._write_pos - self._read_pos) / self.sample_rate * 1000
+        return s
+
+
+def render_ambience(changes: Sequence[Tuple[float, Optional[str]]], seconds: float,
+                    sample_rate: int = SAMPLE_RATE) -> bytes:
+    """
+    Offline render to 16-bit PCM. `changes` is a list of (time, genre_id)
+    switches; the output depends only on its arguments.
+    """
+    engine = AmbienceEngine(sample_rate)
+    total = int(seconds * sample_rate)
+    pending = sorted((int(at * sample_rate), genre_id) for at, genre_id in changes)
+    chunks, pos = [], 0
+    while pos < total:
+        while pending and pending[0][0] <= pos:
+            engine.set_genre(pending.pop(0)[1])
+        n = min(engine.chunk_frames, total - pos)
+        if pending:
+            n = min(n, pending[0][0] - pos)
+        chunks.append(engine.render(n))
+        pos += n
+    return _to_pcm16(np.concatenate(chunks) if chunks else np.zeros(0))
+
+
+if __name__ == "__main__":
+    import sys
+    # python -m audio.ambience out.wav horror [seconds] [next_genre]
+    out_path = sys.argv[1] if len(sys.argv) > 1 else "ambience.wav"
+    genre = sys.argv[2] if len(sys.argv) > 2 else "horror"
+    secs = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    plan = [(0.0, genre)]
+    if len(sys.argv) > 4:
+        plan.append((secs / 2, sys.argv[4]))
+    _write_wav(out_path, render_ambience(plan, secs))
+    print(f"wrote {out_path}")
@@ -0,0 +1,299 @@
+"""
+MadVerse Audio Mixer
+Sums a fixed pool of voices from preloaded PCM into one 16-bit mono stream,
+fed to a single QAudioSink. The mixer itself has no Qt dependency, so the
+mix can be rendered headless into a buffer.
+"""
+
+import time
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from PyQt6.QtMultimedia import QAudio, QAudioFormat, QAudioSink, QMediaDevices
+    from PyQt6.QtCore import QIODevice, Qt, QTimer, pyqtSignal
+    HAS_SOUND = True
+except ImportError:
+    HAS_SOUND = False
+
+
+SAMPLE_RATE = 44100          # must match audio.sounds.SAMPLE_RATE
+DEFAULT_VOICES = 12
+# Sink buffer: ~46 ms at 44.1 kHz. The sink pulls on the GUI thread, so
+# this must outlast the longest stall there (a screen build or repaint)
+BUFFER_FRAMES = 2048
+
+# Minimum seconds between two starts of the same sound; later triggers are dropped
+RATE_LIMITS = {
+    "typing": 0.035,
+    "sentence_pop": 0.06,
+    "click": 0.05,
+}
+
+
+class Mixer:
+    """
+    Fixed-size voice pool over preloaded sounds.
+    When every voice is busy the one that has played longest is stolen.
+    Rate limits are measured on the mixer's own sample clock, so rendering
+    offline behaves exactly like real-time playback.
+    """
+
+    def __init__(self, voices: int = DEFAULT_VOICES, sample_rate: int = SAMPLE_RATE,
+                 rate_limits: Optional[Dict[str, float]] = None):
+        self.sample_rate = sample_rate
+        self.voices = voices
+        self.master_gain = 1.0
+        self.stream = None                  # read(frames) → floats in [-1, 1]; NumPy only
+        self.stream_gain = 1.0
+        self.rate_limits = dict(RATE_LIMITS if rate_limits is None else rate_limits)
+
+        self._sounds: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._clock = 0                     # frames rendered so far
+        self._last_start: Dict[str, int] = {}
+
+        # Voice pool, one slot per voice (name None → free)
+        self._v_name: List[Optional[str]] = [None] * voices
+        self._v_pos = [0] * voices
+        self._v_gain = [1.0] * voices
+        self._v_start = [0] * voices
+
+        self._stats = {"plays": 0, "stolen": 0, "rate_limited": 0,
+                       "chunks": 0, "render_s": 0.0, "render_max_s": 0.0}
+
+    # ─── SOUNDS ───────────────────────────────────────────
+
+    def add_sound(self, name: str, pcm: bytes):
+        """Preload 16-bit mono PCM under name; returns the stored buffer."""
+        if HAS_NUMPY:
+            data = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+        else:
+            data = array("h", pcm)
+        with self._lock:
+            self._sounds[name] = data
+        return data
+
+    def has_sound(self, name: str) -> bool:
+        return name in self._sounds
+
+    # ─── VOICES ───────────────────────────────────────────
+
+    def play(self, name: str, gain: float = 1.0) -> Optional[int]:
+        """Start a voice; returns its slot, or None if unknown or rate limited."""
+        with self._lock:
+            if name not in self._sounds:
+                return None
+            min_gap = self.rate_limits.get(name)
+            last = self._last_start.get(name)
+            if min_gap and last is not None and self._clock - last < min_gap * self.sample_rate:
+                self._stats["rate_limited"] += 1
+                return None
+
+            slot = self._free_slot()
+            if slot is None:
+                slot = min(range(self.voices), key=self._v_start.__getitem__)
+                self._stats["stolen"] += 1
+            self._v_name[slot] = name
+            self._v_pos[slot] = 0
+            self._v_gain[slot] = gain
+            self._v_start[slot] = self._clock
+            self._last_start[name] = self._clock
+            self._stats["plays"] += 1
+            return slot
+
+    def stop_all(self):
+        with self._lock:
+            self._v_name = [None] * self.voices
+
+    def active_voices(self) -> int:
+        return sum(1 for n in self._v_name if n is not None)
+
+    def is_idle(self) -> bool:
+        """True while every render is silence: no voices, no audible stream."""
+        stream = self.stream
+        return self.active_voices() == 0 and (stream is None or stream.is_silent())
+
+    def _free_slot(self) -> Optional[int]:
+        for slot, name in enumerate(self._v_name):
+            if name is None:
+                return slot
+        return None
+
+    # ─── RENDERING ────────────────────────────────────────
+
+    def render(self, frames: int) -> bytes:
+        """Mix the next `frames` samples of all active voices to 16-bit PCM."""
+        started = time.perf_counter()
+        with self._lock:
+            out = self._mix_numpy(frames) if HAS_NUMPY else self._mix_python(frames)
+            self._clock += frames
+        elapsed = time.perf_counter() - started
+        self._stats["chunks"] += 1
+        self._stats["render_s"] += elapsed
+        self._stats["render_max_s"] = max(self._stats["render_max_s"], elapsed)
+        return out
+
+    def _mix_numpy(self, frames: int) -> bytes:
+        acc = np.zeros(frames, dtype=np.float32)
+        for slot, n, remaining in self._advance_voices(frames):
+            data = self._sounds[self._v_name[slot]]
+            pos = self._v_pos[slot] - n
+            acc[:n] += data[pos:pos + n] * self._v_gain[slot]
+            if remaining <= 0:
+                self._v_name[slot] = None
+        if self.stream is not None:
+            acc += self.stream.read(frames) * (32767 * self.stream_gain)
+        acc *= self.master_gain
+        np.clip(acc, -32768, 32767, out=acc)
+        return acc.astype("<i2").tobytes()
+
+    def _mix_python(self, frames: int) -> bytes:
+        acc = [0.0] * frames
+        for slot, n, remaining in self._advance_voices(frames):
+            data = self._sounds[self._v_name[slot]]
+            pos = self._v_pos[slot] - n
+            gain = self._v_gain[slot]
+            for i in range(n):
+                acc[i] += data[pos + i] * gain
+            if remaining <= 0:
+                self._v_name[slot] = None
+        g = self.master_gain
+        return array("h", (max(-32768, min(32767, int(s * g))) for s in acc)).tobytes()
+
+    def _advance_voices(self, frames: int):
+        """Yield (slot, samples this chunk, samples left) and advance positions."""
+        for slot, name in enumerate(self._v_name):
+            if name is None:
+                continue
+            length = len(self._sounds[name])
+            n = min(frames, length - self._v_pos[slot])
+            self._v_pos[slot] += n
+            yield slot, n, length - self._v_pos[slot]
+
+    # ─── STATS ────────────────────────────────────────────
+
+    def stats(self) -> Dict:
+        s = dict(self._stats)
+        s["active_voices"] = self.active_voices()
+        s["render_avg_ms"] = s["render_s"] / s["chunks"] * 1000 if s["chunks"] else 0.0
+        s["render_max_ms"] = s.pop("render_max_s") * 1000
+        s.pop("render_s")
+        return s
+
+
+if HAS_SOUND:
+    class MixerDevice(QIODevice):
+        """
+        Pull-mode source for QAudioSink: every read renders the mix on demand.
+        A read that finds the sink's buffer already empty is counted as an
+        underrun; `idle` is emitted once the mix has gone silent.
+        """
+
+        idle = pyqtSignal()
+
+        def __init__(self, mixer: Mixer, buffer_frames: int = BUFFER_FRAMES, parent=None):
+            super().__init__(parent)
+            self.mixer = mixer
+            self.buffer_frames = buffer_frames
+            self.sink = None                    # set by MixerOutput
+            self.underruns = 0
+            self._primed = False                # the sink buffer has been filled once
+            self._idle = False
+            self.open(QIODevice.OpenModeFlag.ReadOnly)
+
+        def isSequential(self) -> bool:
+            return True
+
+        def bytesAvailable(self) -> int:
+            return self.buffer_frames * 2 + super().bytesAvailable()
+
+        def rewind(self):
+            """Playback (re)starts from an empty buffer, which is no underrun."""
+            self._primed = False
+            self._idle = False
+
+        def readData(self, maxlen: int) -> bytes:
+            if self.sink is not None:
+                if self._primed and self.sink.bytesFree() >= self.sink.bufferSize():
+                    self.underruns += 1
+                self._primed = True
+            frames = min(maxlen // 2, self.buffer_frames)
+            out = self.mixer.render(frames) if frames > 0 else b""
+            if self.mixer.is_idle() != self._idle:
+                self._idle = not self._idle
+                if self._idle:
+                    self.idle.emit()
+            return out
+
+        def writeData(self, data) -> int:
+            return -1
+
+
+    class MixerOutput:
+        """
+        One QAudioSink pulling from a Mixer for the lifetime of the app.
+        The sink is suspended once the mix has been silent for a buffer's
+        length, so an idle app does no audio work; wake() resumes it and
+        must follow anything that makes the mix audible again.
+        """
+
+        def __init__(self, mixer: Mixer, buffer_frames: int = BUFFER_FRAMES):
+            fmt = QAudioFormat()
+            fmt.setSampleRate(mixer.sample_rate)
+            fmt.setChannelCount(1)
+            fmt.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+
+            self.mixer = mixer
+            self.device = MixerDevice(mixer, buffer_frames)
+            self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), fmt)
+            self.sink.setBufferSize(buffer_frames * 2)
+            self.device.sink = self.sink
+            self.sink_underruns = 0
+            self.suspends = 0
+            self.sink.stateChanged.connect(self._on_state)
+
+            # Let what is already buffered play out before suspending
+            self._suspend_timer = QTimer()
+            self._suspend_timer.setSingleShot(True)
+            self._suspend_timer.setInterval(int(buffer_frames / mixer.sample_rate * 1000) + 20)
+            self._suspend_timer.timeout.connect(self._suspend_if_idle)
+            self.device.idle.connect(self._suspend_timer.start, Qt.ConnectionType.QueuedConnection)
+
+            self.sink.start(self.device)
+
+        def _on_state(self, state):
+            if state == QAudio.State.IdleState and self.sink.error() == QAudio.Error.UnderrunError:
+                self.sink_underruns += 1
+
+        def _suspend_if_idle(self):
+            if self.mixer.is_idle() and self.sink.state() == QAudio.State.ActiveState:
+                self.sink.suspend()
+                self.suspends += 1
+
+        def wake(self):
+            """Resume the sink if it was suspended (call after play())."""
+            self._suspend_timer.stop()
+            if self.sink.state() == QAudio.State.SuspendedState:
+                self.device.rewind()
+                self.sink.resume()
+
+        def stop(self):
+            self._suspend_timer.stop()
+            self.sink.stop()
+            self.device.close()
+
+        def stats(self) -> Dict:
+            s = self.mixer.stats()
+            s["latency_ms"] = self.sink.bufferSize() / 2 / self.mixer.sample_rate * 1000
+            s["underruns"] = self.device.underruns + self.sink_underruns
+            s["suspends"] = self.suspends
+            s["suspended"] = self.sink.state() == QAudio.State.SuspendedState
+            return s
@@ -4,11 +4,21 @@ Generates and plays sound effects using Qt's multimedia or fallback beeps.
 """
 
 import os
+import sys
+import json
 import math
-import struct
+import time
 import wave
-import tempfile
-from typing import Optional
+import hashlib
+from array import array
+from typing import Callable, Dict, List, Optional
+
+# NumPy renders whole buffers at once; without it we fall back to array('h')
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 try:
     from PyQt6.QtMultimedia import QSoundEffect
@@ -17,158 +27,528 @@ try:
 except ImportError:
     HAS_SOUND = False
 
+from audio.mixer import Mixer
+if HAS_SOUND:
+    from audio.mixer import MixerOutput
+
 try:
-    from PyQt6.QtCore import QTimer
+    from PyQt6.QtCore import QCoreApplication, QThread, pyqtSignal
     HAS_QT = True
 except ImportError:
     HAS_QT = False
 
 
 SOUNDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sounds")
+MANIFEST_NAME = "manifest.json"
+SAMPLE_RATE = 44100
+WAV_HEADER_BYTES = 44
 
+# Bump when synthesis changes output for unchanged specs, to force a rebuild
+SYNTH_VERSION = 1
+# Play synthesized PCM straight from memory instead of WAV files on disk
+IN_MEMORY_PLAYBACK = True
+# Process pool only pays off for the slow pure-Python synthesis; with NumPy
+# the whole set renders faster than the pool starts
+USE_PROCESS_POOL = not HAS_NUMPY
+# Fewer stale sounds than this are rendered in-process (pool start-up dominates)
+PARALLEL_MIN_SOUNDS = 4
 
-def _generate_wav(filename: str, freq: float, duration: float,
-                  volume: float = 0.5, waveform: str = "sine",
-                  decay: bool = True):
-    """Generate a simple WAV file programmatically."""
-    sample_rate = 44100
-    num_samples = int(sample_rate * duration)
-
-    samples = []
-    for i in range(num_samples):
-        t = i / sample_rate
-        if waveform == "sine":
-            val = math.sin(2 * math.pi * freq * t)
-        elif waveform == "square":
-            val = 1.0 if math.sin(2 * math.pi * freq * t) > 0 else -1.0
-        elif waveform == "sawtooth":
-            val = 2 * (t * freq - math.floor(t * freq + 0.5))
-        else:
-            val = math.sin(2 * math.pi * freq * t)
 
-        # Envelope: attack + decay
+def _envelope(n: int, decay: bool):
+    """Per-sample gain: square-root decay, or a 10 ms linear attack."""
+    if HAS_NUMPY:
+        i = np.arange(n, dtype=np.float64)
         if decay:
-            envelope = max(0.0, 1.0 - (i / num_samples) ** 0.5)
-        else:
-            attack = min(1.0, i / (sample_rate * 0.01))
-            envelope = attack
-        val = val * volume * envelope
+            return np.maximum(0.0, 1.0 - np.sqrt(i / n))
+        return np.minimum(1.0, i / (SAMPLE_RATE * 0.01))
+    if decay:
+        return [max(0.0, 1.0 - (i / n) ** 0.5) for i in range(n)]
+    attack = SAMPLE_RATE * 0.01
+    return [min(1.0, i / attack) for i in range(n)]
+
+
+def _to_pcm16(samples) -> bytes:
+    """Scale [-1, 1] floats to little-endian signed 16-bit PCM (truncating, like int())."""
+    if HAS_NUMPY:
+        return (samples * 32767).astype("<i2").tobytes()
+    pcm = array("h", [int(v * 32767) for v in samples])
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def oscillate(freq: float, t, waveform: str = "sine"):
+    """Unit-amplitude waveform at times t (seconds, NumPy array)."""
+    if waveform == "square":
+        return np.where(np.sin(2 * np.pi * freq * t) > 0, 1.0, -1.0)
+    if waveform == "sawtooth":
+        return 2 * (t * freq - np.floor(t * freq + 0.5))
+    return np.sin(2 * np.pi * freq * t)
 
-        # Convert to 16-bit PCM
-        samples.append(int(val * 32767))
 
+def synth_tone(freq: float, duration: float, volume: float = 0.5,
+               waveform: str = "sine", decay: bool = True) -> bytes:
+    """Render a single enveloped tone as 16-bit mono PCM."""
+    n = int(SAMPLE_RATE * duration)
+    env = _envelope(n, decay)
+
+    if HAS_NUMPY:
+        t = np.arange(n, dtype=np.float64) / SAMPLE_RATE
+        return _to_pcm16(oscillate(freq, t, waveform) * (volume * env))
+
+    # Pure-Python fallback: same maths, one pass per buffer
+    w = 2 * math.pi * freq
+    sin, floor = math.sin, math.floor
+    ts = [i / SAMPLE_RATE for i in range(n)]
+    if waveform == "square":
+        wave_ = [1.0 if sin(w * t) > 0 else -1.0 for t in ts]
+    elif waveform == "sawtooth":
+        wave_ = [2 * (t * freq - floor(t * freq + 0.5)) for t in ts]
+    else:
+        wave_ = [sin(w * t) for t in ts]
+    return _to_pcm16([v * volume * e for v, e in zip(wave_, env)])
+
+
+def synth_chord(freqs: list, duration: float, volume: float = 0.4) -> bytes:
+    """Render an equal mix of sine partials with a linear decay."""
+    n = int(SAMPLE_RATE * duration)
+
+    if HAS_NUMPY:
+        t = np.arange(n, dtype=np.float64) / SAMPLE_RATE
+        mix = np.sin(2 * np.pi * np.outer(freqs, t)).sum(axis=0) / len(freqs)
+        env = np.maximum(0.0, 1.0 - np.arange(n) / n)
+        return _to_pcm16(mix * (volume * env))
+
+    ws = [2 * math.pi * f for f in freqs]
+    sin, k = math.sin, len(freqs)
+    return _to_pcm16([
+        sum(sin(w * (i / SAMPLE_RATE)) for w in ws) / k * volume * max(0.0, 1.0 - i / n)
+        for i in range(n)
+    ])
+
+
+def _write_wav(filename: str, pcm: bytes):
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     with wave.open(filename, "w") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        packed = struct.pack(f"<{len(samples)}h", *samples)
-        wf.writeframes(packed)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+
+
+def _generate_wav(filename: str, freq: float, duration: float,
+                  volume: float = 0.5, waveform: str = "sine",
+                  decay: bool = True):
+    """Generate a simple WAV file programmatically."""
+    _write_wav(filename, synth_tone(freq, duration, volume, waveform, decay))
 
 
 def _generate_chord_wav(filename: str, freqs: list, duration: float, volume: float = 0.4):
     """Generate a WAV with multiple frequencies (chord)."""
-    sample_rate = 44100
-    num_samples = int(sample_rate * duration)
-    samples = []
-    for i in range(num_samples):
-        t = i / sample_rate
-        val = sum(math.sin(2 * math.pi * f * t) for f in freqs) / len(freqs)
-        envelope = max(0.0, 1.0 - (i / num_samples))
-        val = val * volume * envelope
-        samples.append(int(val * 32767))
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with wave.open(filename, "w") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        packed = struct.pack(f"<{len(samples)}h", *samples)
-        wf.writeframes(packed)
+    _write_wav(filename, synth_chord(freqs, duration, volume))
+
+
+# name → synthesis parameters; UI sounds first so they are ready soonest
+SOUND_SPECS = {
+    # UI sounds
+    "click":        {"kind": "tone",  "freq": 800,  "duration": 0.08, "volume": 0.3},
+    "select":       {"kind": "tone",  "freq": 1200, "duration": 0.12, "volume": 0.35},
+    "reveal":       {"kind": "chord", "freqs": [523, 659, 784], "duration": 0.5, "volume": 0.4},
+    "complete":     {"kind": "chord", "freqs": [523, 659, 784, 1047], "duration": 0.8, "volume": 0.45},
+    "achievement":  {"kind": "tone",  "freq": 1047, "duration": 1.0,  "volume": 0.5, "waveform": "sine"},
+    "error":        {"kind": "tone",  "freq": 200,  "duration": 0.3,  "volume": 0.4, "waveform": "square"},
+    "save":         {"kind": "tone",  "freq": 660,  "duration": 0.2,  "volume": 0.35},
+    "typing":       {"kind": "tone",  "freq": 400,  "duration": 0.04, "volume": 0.2},
+
+    # Story reveal per-sentence stinger
+    "sentence_pop": {"kind": "tone",  "freq": 600,  "duration": 0.06, "volume": 0.2},
+    "fourth_wall":  {"kind": "tone",  "freq": 300,  "duration": 0.4,  "volume": 0.35, "waveform": "square"},
+
+    # Genre theme sounds (ambient stingers)
+    "horror_theme":      {"kind": "tone",  "freq": 80,  "duration": 1.5, "volume": 0.4, "waveform": "sawtooth"},
+    "scifi_theme":       {"kind": "chord", "freqs": [440, 550, 880], "duration": 0.6, "volume": 0.4},
+    "fantasy_theme":     {"kind": "chord", "freqs": [392, 494, 587], "duration": 1.0, "volume": 0.4},
+    "romance_theme":     {"kind": "tone",  "freq": 494, "duration": 0.8, "volume": 0.35, "waveform": "sine", "decay": False},
+    "academic_theme":    {"kind": "tone",  "freq": 330, "duration": 0.3, "volume": 0.25},
+    "existential_theme": {"kind": "tone",  "freq": 110, "duration": 2.0, "volume": 0.3, "waveform": "sine"},
+    "ai_theme":          {"kind": "chord", "freqs": [220, 440, 660, 880], "duration": 0.5, "volume": 0.4},
+}
+
+
+def render_sound(spec: dict) -> bytes:
+    """Synthesize one SOUND_SPECS entry to 16-bit mono PCM."""
+    params = {k: v for k, v in spec.items() if k != "kind"}
+    if spec["kind"] == "chord":
+        return synth_chord(**params)
+    return synth_tone(**params)
+
+
+def sound_path(name: str) -> str:
+    return os.path.join(SOUNDS_DIR, f"{name}.wav")
+
+
+def generate_sound(name: str):
+    """Write a single sound asset to SOUNDS_DIR."""
+    _write_wav(sound_path(name), render_sound(SOUND_SPECS[name]))
 
 
 def generate_all_sounds():
     """Pre-generate all sound effect WAV files."""
+    build_sounds(list(SOUND_SPECS))
+
+
+# ─────────────────────────────────────────────────────────────
+# ASSET MANIFEST
+# ─────────────────────────────────────────────────────────────
+
+def spec_hash(name: str) -> str:
+    """Stable hash of everything that determines a sound's bytes."""
+    key = json.dumps({"spec": SOUND_SPECS[name], "rate": SAMPLE_RATE,
+                      "version": SYNTH_VERSION}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def expected_size(name: str) -> int:
+    """WAV file size implied by a spec (header + 16-bit mono samples)."""
+    return WAV_HEADER_BYTES + 2 * int(SAMPLE_RATE * SOUND_SPECS[name]["duration"])
+
+
+def load_manifest() -> Dict[str, Dict]:
+    try:
+        with open(os.path.join(SOUNDS_DIR, MANIFEST_NAME), "r") as f:
+            return json.load(f).get("sounds", {})
+    except Exception:
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict]):
+    path = os.path.join(SOUNDS_DIR, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"sounds": manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_fresh(name: str, manifest: Dict[str, Dict]) -> bool:
+    """True if the asset on disk matches its spec (stats the file only)."""
+    entry = manifest.get(name)
+    try:
+        size = os.stat(sound_path(name)).st_size
+    except OSError:
+        return False
+    return (entry is not None and entry.get("hash") == spec_hash(name)
+            and size == entry.get("size") == expected_size(name))
+
+
+def stale_sounds(manifest: Optional[Dict[str, Dict]] = None) -> List[str]:
+    """
+    Names whose asset is missing, truncated or built from different parameters.
+    Only stats files, never reads WAV bodies.
+    """
+    if manifest is None:
+        manifest = load_manifest()
+    return [name for name in SOUND_SPECS if not is_fresh(name, manifest)]
+
+
+def load_pcm(name: str, manifest: Optional[Dict[str, Dict]] = None) -> bytes:
+    """
+    PCM for a sound without writing anything: the shipped asset if it is
+    current, otherwise synthesized in memory.
+    """
+    if manifest is None:
+        manifest = load_manifest()
+    if is_fresh(name, manifest):
+        try:
+            with wave.open(sound_path(name), "rb") as wf:
+                return wf.readframes(wf.getnframes())
+        except (OSError, wave.Error, EOFError):
+            pass
+    return render_sound(SOUND_SPECS[name])
+
+
+def _store_sound(name: str, pcm: bytes, manifest: Dict[str, Dict]):
+    _write_wav(sound_path(name), pcm)
+    manifest[name] = {"hash": spec_hash(name), "size": os.path.getsize(sound_path(name))}
+    save_manifest(manifest)
+
+
+def build_sounds(names: List[str], on_ready: Optional[Callable[[str], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None):
+    """
+    Render and write the given sounds, updating the manifest after each.
+    Without NumPy, large batches are synthesized across a process pool.
+    """
     os.makedirs(SOUNDS_DIR, exist_ok=True)
+    manifest = load_manifest()
+    remaining = list(names)
 
-    # UI sounds
-    _generate_wav(f"{SOUNDS_DIR}/click.wav",       freq=800,  duration=0.08,  volume=0.3)
-    _generate_wav(f"{SOUNDS_DIR}/select.wav",      freq=1200, duration=0.12,  volume=0.35)
-    _generate_chord_wav(f"{SOUNDS_DIR}/reveal.wav",   freqs=[523, 659, 784], duration=0.5,  volume=0.4)
-    _generate_chord_wav(f"{SOUNDS_DIR}/complete.wav", freqs=[523, 659, 784, 1047], duration=0.8, volume=0.45)
-    _generate_wav(f"{SOUNDS_DIR}/achievement.wav", freq=1047, duration=1.0,   volume=0.5, waveform="sine")
-    _generate_wav(f"{SOUNDS_DIR}/error.wav",       freq=200,  duration=0.3,   volume=0.4, waveform="square")
-    _generate_wav(f"{SOUNDS_DIR}/save.wav",        freq=660,  duration=0.2,   volume=0.35)
-    _generate_wav(f"{SOUNDS_DIR}/typing.wav",      freq=400,  duration=0.04,  volume=0.2)
+    if USE_PROCESS_POOL and len(remaining) >= PARALLEL_MIN_SOUNDS:
+        try:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            workers = min(len(remaining), os.cpu_count() or 1)
+            # spawn: forking a process that is running Qt threads is unsafe
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = {pool.submit(render_sound, SOUND_SPECS[n]): n for n in remaining}
+                for fut in as_completed(futures):
+                    if should_stop and should_stop():
+                        pool.shutdown(cancel_futures=True)
+                        return
+                    name = futures[fut]
+                    _store_sound(name, fut.result(), manifest)
+                    remaining.remove(name)
+                    if on_ready:
+                        on_ready(name)
+        except Exception:
+            pass  # no pool available (sandbox, frozen app…): finish in-process
 
-    # Genre theme sounds (ambient stingers)
-    _generate_wav(f"{SOUNDS_DIR}/horror_theme.wav",      freq=80,  duration=1.5,  volume=0.4, waveform="sawtooth")
-    _generate_chord_wav(f"{SOUNDS_DIR}/scifi_theme.wav",       freqs=[440, 550, 880], duration=0.6, volume=0.4)
-    _generate_chord_wav(f"{SOUNDS_DIR}/fantasy_theme.wav",     freqs=[392, 494, 587], duration=1.0, volume=0.4)
-    _generate_wav(f"{SOUNDS_DIR}/romance_theme.wav",     freq=494, duration=0.8,  volume=0.35, waveform="sine", decay=False)
-    _generate_wav(f"{SOUNDS_DIR}/academic_theme.wav",    freq=330, duration=0.3,  volume=0.25)
-    _generate_wav(f"{SOUNDS_DIR}/existential_theme.wav", freq=110, duration=2.0,  volume=0.3, waveform="sine")
-    _generate_chord_wav(f"{SOUNDS_DIR}/ai_theme.wav",          freqs=[220, 440, 660, 880], duration=0.5, volume=0.4)
+    for name in remaining:
+        if should_stop and should_stop():
+            return
+        _store_sound(name, render_sound(SOUND_SPECS[name]), manifest)
+        if on_ready:
+            on_ready(name)
 
-    # Story reveal per-sentence stinger
-    _generate_wav(f"{SOUNDS_DIR}/sentence_pop.wav", freq=600, duration=0.06, volume=0.2)
-    _generate_wav(f"{SOUNDS_DIR}/fourth_wall.wav",  freq=300, duration=0.4,  volume=0.35, waveform="square")
+
+if HAS_QT:
+    class SoundGenerationWorker(QThread):
+        """
+        Background thread that writes missing or stale sound assets.
+        Emits sound_ready(name) after each file so it can be loaded at once.
+        """
+        sound_ready = pyqtSignal(str)
+
+        def __init__(self, names: list, parent=None):
+            super().__init__(parent)
+            self.names = names
+
+        def run(self):
+            try:
+                build_sounds(self.names, on_ready=self.sound_ready.emit,
+                             should_stop=self.isInterruptionRequested)
+            except Exception:
+                pass
 
 
 class SoundManager:
-    """Manages sound playback for MadVerse."""
+    """
+    Manages sound playback for MadVerse.
+    Effects are created on first use, or earlier via prefetch() when the UI
+    can guess what is coming (hovering a genre card, entering word input).
+
+    In memory mode (the default) PCM is taken from current shipped assets or
+    synthesized on the spot, and nothing is ever written, so the install
+    directory may be read-only. Sounds are preloaded into a Mixer and
+    played through one shared QAudioSink. File mode regenerates stale WAVs under
+    SOUNDS_DIR and plays them through QSoundEffect.
+    """
 
-    def __init__(self):
+    def __init__(self, in_memory: bool = IN_MEMORY_PLAYBACK):
         self._enabled = True
         self._volume = 0.7
+        self._in_memory = in_memory
+        self._manifest: Optional[Dict[str, Dict]] = None
         self._effects = {}
-        self._ensure_sounds()
-        self._load_effects()
+        self._status: Dict[str, Dict] = {}   # name → {"state", "requested", "load_ms"}
+        self._building = set()               # stale assets still being regenerated
+        self._wanted = set()                 # requested while building
+        self._worker = None
+        self.mixer = Mixer()
+        self.mixer.master_gain = self._volume
+        self._output = None                  # MixerOutput, opened on first play
+        self._ambience = None                # AmbienceEngine, started on first genre
+        if not in_memory:
+            self._ensure_sounds(stale_sounds())
+
+    def _ensure_sounds(self, stale: List[str]):
+        """Rebuild stale assets, off the GUI thread when Qt is running."""
+        if not stale:
+            return
+        if HAS_QT and QCoreApplication.instance() is not None:
+            self._building.update(stale)
+            for name in stale:
+                self._set_state(name, "building")
+            self._worker = SoundGenerationWorker(stale)
+            self._worker.sound_ready.connect(self._on_sound_built)
+            self._worker.start()
+        else:
+            build_sounds(stale)
 
-    def _ensure_sounds(self):
-        if not os.path.exists(f"{SOUNDS_DIR}/click.wav"):
-            generate_all_sounds()
+    def _on_sound_built(self, name: str):
+        self._building.discard(name)
+        self._set_state(name, "idle")
+        if name in self._wanted:
+            self._wanted.discard(name)
+            self._effect(name)
 
-    def _load_effects(self):
-        if not HAS_SOUND:
+    # ─── LAZY LOADING ─────────────────────────────────────
+
+    def prefetch(self, *names: str):
+        """Start loading effects that are likely to be played soon."""
+        for name in names:
+            self._effect(name)
+
+    def _effect(self, name: str):
+        """The loaded (or loading) effect for name, created on demand."""
+        fx = self._effects.get(name)
+        if fx is not None or not HAS_SOUND or name not in SOUND_SPECS:
+            return fx
+        if name in self._building:
+            self._wanted.add(name)
+            return None
+        return self._load_effect(name)
+
+    def _load_effect(self, name: str):
+        if self._in_memory:
+            return self._load_memory_sound(name)
+        try:
+            fx = QSoundEffect()
+            self._status[name] = {"state": "loading", "requested": time.perf_counter(),
+                                  "load_ms": None}
+            fx.statusChanged.connect(lambda n=name: self._on_effect_status(n))
+            fx.setSource(QUrl.fromLocalFile(os.path.abspath(sound_path(name))))
+            fx.setVolume(self._volume)
+            self._effects[name] = fx
+            return fx
+        except Exception:
+            self._set_state(name, "error")
+            return None
+
+    def _load_memory_sound(self, name: str):
+        started = time.perf_counter()
+        try:
+            if self._manifest is None:
+                self._manifest = load_manifest()
+            fx = self.mixer.add_sound(name, load_pcm(name, self._manifest))
+        except Exception:
+            self._set_state(name, "error")
+            return None
+        self._effects[name] = fx
+        self._status[name] = {"state": "ready", "requested": started,
+                              "load_ms": (time.perf_counter() - started) * 1000}
+        return fx
+
+    def _on_effect_status(self, name: str):
+        fx = self._effects.get(name)
+        if fx is None:
             return
-        sound_names = [
-            "click", "select", "reveal", "complete", "achievement",
-            "error", "save", "typing", "sentence_pop", "fourth_wall",
-            "horror_theme", "scifi_theme", "fantasy_theme", "romance_theme",
-            "academic_theme", "existential_theme", "ai_theme",
-        ]
-        for name in sound_names:
-            path = f"{SOUNDS_DIR}/{name}.wav"
-            if os.path.exists(path):
-                try:
-                    fx = QSoundEffect()
-                    fx.setSource(QUrl.fromLocalFile(os.path.abspath(path)))
-                    fx.setVolume(self._volume)
-                    self._effects[name] = fx
-                except Exception:
-                    pass
-
-    def play(self, name: str):
+        status = fx.status()
+        if status == QSoundEffect.Status.Ready:
+            entry = self._status[name]
+            entry["state"] = "ready"
+            entry["load_ms"] = (time.perf_counter() - entry["requested"]) * 1000
+        elif status == QSoundEffect.Status.Error:
+            self._set_state(name, "error")
+
+    def _set_state(self, name: str, state: str):
+        self._status.setdefault(name, {"requested": None, "load_ms": None})["state"] = state
+
+    def is_ready(self, name: str) -> bool:
+        """True once an effect has been decoded and can play immediately."""
+        return self._status.get(name, {}).get("state") == "ready"
+
+    def load_status(self) -> Dict[str, Dict]:
+        """
+        Per-sound load state and timing.
+        state: idle | building | loading | ready | error | unavailable
+        """
+        out = {}
+        for name in SOUND_SPECS:
+            entry = self._status.get(name, {})
+            state = entry.get("state", "idle")
+            if not HAS_SOUND and state == "idle":
+                state = "unavailable"
+            out[name] = {"state": state, "load_ms": entry.get("load_ms")}
+        return out
+
+    def shutdown(self):
+        """Stop background generation and audio output (call before the app exits)."""
+        if self._worker is not None and self._worker.isRunning():
+            self._worker.requestInterruption()
+            self._worker.wait(2000)
+        if self._output is not None:
+            self._output.stop()
+            self._output = None
+        self.stop_ambience()
+
+    def play(self, name: str, gain: float = 1.0):
         if not self._enabled:
             return
         if not HAS_SOUND:
             return
-        fx = self._effects.get(name)
-        if fx:
+        # QSoundEffect queues play() until its source has finished loading
+        fx = self._effect(name)
+        if fx is None:
+            return
+        if self._in_memory:
+            self._play_mixed(name, gain)
+            return
+        try:
+            fx.setVolume(self._volume * gain)
+            fx.play()
+        except Exception:
+            pass
+
+    def _play_mixed(self, name: str, gain: float):
+        if self._output is None:
             try:
-                fx.setVolume(self._volume)
-                fx.play()
+                self._output = MixerOutput(self.mixer)
+            except Exception:
+                return
+        if self.mixer.play(name, gain) is not None:
+            self._output.wake()
+
+    def audio_stats(self) -> Dict:
+        """Mixer voice, latency and underrun counters (memory mode)."""
+        stats = self._output.stats() if self._output is not None else self.mixer.stats()
+        if self._ambience is not None:
+            stats["ambience"] = self._ambience.stats()
+        return stats
+
+    def set_ambience(self, genre_id: Optional[str]):
+        """Cross-fade the background bed to genre_id (None for silence)."""
+        if not (self._in_memory and HAS_SOUND and HAS_NUMPY):
+            return
+        if self._ambience is None:
+            if genre_id is None:
+                return
+            from audio.ambience import AmbienceEngine
+            self._ambience = AmbienceEngine()
+            self._ambience.start()
+            if self._enabled:
+                self.mixer.stream = self._ambience
+        self._ambience.set_genre(genre_id)
+        if self._output is None:
+            try:
+                self._output = MixerOutput(self.mixer)
             except Exception:
                 pass
+        else:
+            self._output.wake()
+
+    def stop_ambience(self):
+        """Stop the ambience thread at once; set_ambience() starts a new one."""
+        if self._ambience is None:
+            return
+        self.mixer.stream = None
+        self._ambience.stop()
+        self._ambience = None
 
     def play_genre_theme(self, genre_id: str):
         self.play(f"{genre_id}_theme")
 
     def set_enabled(self, enabled: bool):
         self._enabled = enabled
+        self.mixer.stream = self._ambience if enabled else None
+        if not enabled:
+            self.mixer.stop_all()
+        elif self._output is not None:
+            self._output.wake()
 
     def set_volume(self, volume: float):
         self._volume = max(0.0, min(1.0, volume))
+        self.mixer.master_gain = self._volume
 
     def is_enabled(self) -> bool:
         return self._enabled
@@ -182,3 +562,10 @@ def get_sound_manager() -> SoundManager:
     if _manager is None:
         _manager = SoundManager()
     return _manager
+
+
+if __name__ == "__main__":
+    # Regenerate out-of-date assets under SOUNDS_DIR
+    stale = stale_sounds()
+    build_sounds(stale, on_ready=lambda name: print(f"wrote {sound_path(name)}"))
+    print(f"{len(stale)} of {len(SOUND_SPECS)} sounds rebuilt")
@@ -0,0 +1,151 @@
+"""
+MadVerse Audio Benchmarks
+Headless timings for the audio stack, reported as JSON:
+
+  synthesis    — render time per SOUND_SPECS entry, and a full asset build
+  startup      — SoundManager construction (memory and file modes)
+  play         — cost of a play() call, through SoundManager and the Mixer
+  mixer        — time to fill one output buffer at various voice counts
+  ambience     — time to synthesize one ambience chunk per genre
+
+Usage:
+  python -m benchmarks.bench_audio [--repeat N] [--out report.json]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from audio import sounds
+from audio.mixer import BUFFER_FRAMES, DEFAULT_VOICES, Mixer
+from benchmarks.common import environment, time_calls, write_report
+
+
+def bench_synthesis(repeat: int) -> dict:
+    per_sound = {
+        name: time_calls(lambda spec=spec: sounds.render_sound(spec), repeat)
+        for name, spec in sounds.SOUND_SPECS.items()
+    }
+
+    # Full build into a scratch directory, serial and with the process pool
+    original_dir = sounds.SOUNDS_DIR
+    builds = {}
+    try:
+        for label, use_pool in (("serial", False), ("process_pool", True)):
+            scratch = tempfile.mkdtemp(prefix="madverse-bench-")
+            sounds.SOUNDS_DIR = scratch
+            saved, sounds.USE_PROCESS_POOL = sounds.USE_PROCESS_POOL, use_pool
+            try:
+                builds[label] = time_calls(sounds.generate_all_sounds, repeat=1, warmup=0)
+            finally:
+                sounds.USE_PROCESS_POOL = saved
+                shutil.rmtree(scratch, ignore_errors=True)
+    finally:
+        sounds.SOUNDS_DIR = original_dir
+
+    return {"per_sound": per_sound, "generate_all": builds}
+
+
+def bench_startup(repeat: int) -> dict:
+    result = {
+        "memory_mode": time_calls(lambda: sounds.SoundManager(in_memory=True), repeat),
+        "file_mode_current_assets": time_calls(lambda: sounds.SoundManager(in_memory=False), repeat),
+    }
+    manager = sounds.SoundManager(in_memory=True)
+    result["load_pcm_per_sound"] = {
+        name: time_calls(lambda n=name: sounds.load_pcm(n, manager._manifest or {}), repeat)
+        for name in ("click", "complete", "existential_theme")
+    }
+    return result
+
+
+def bench_play(repeat: int) -> dict:
+    manager = sounds.SoundManager(in_memory=True)
+    manager.prefetch("click", "typing", "sentence_pop")
+    mixer = Mixer()
+    mixer.add_sound("click", sounds.load_pcm("click"))
+    mixer.rate_limits.clear()
+    calls = max(repeat * 50, 1000)
+    return {
+        "sound_backend": sounds.HAS_SOUND,
+        "manager_play": time_calls(lambda: manager.play("sentence_pop"), calls),
+        "mixer_play": time_calls(lambda: mixer.play("click"), calls),
+    }
+
+
+def bench_mixer(repeat: int) -> dict:
+    pcm = {name: sounds.load_pcm(name) for name in sounds.SOUND_SPECS}
+    result = {"buffer_frames": BUFFER_FRAMES,
+              "buffer_ms": BUFFER_FRAMES / sounds.SAMPLE_RATE * 1000}
+    for voices in (0, 1, 4, DEFAULT_VOICES):
+        mixer = Mixer()
+        mixer.rate_limits.clear()
+        for name, data in pcm.items():
+            mixer.add_sound(name, data)
+
+        def fill(m=mixer, v=voices):
+            # Keep `v` long voices sounding through every buffer
+            while m.active_voices() < v:
+                m.play("existential_theme")
+            m.render(BUFFER_FRAMES)
+        result[f"voices_{voices}"] = time_calls(fill, repeat * 10)
+
+    if sounds.HAS_NUMPY:
+        from audio.ambience import AmbienceEngine
+        # Draining the ring buffer; synthesis itself is measured under "ambience"
+        mixer = Mixer()
+        mixer.stream = AmbienceEngine()
+        result["ambience_stream"] = time_calls(lambda: mixer.render(BUFFER_FRAMES), repeat * 10)
+    return result
+
+
+def bench_ambience(repeat: int) -> dict:
+    if not sounds.HAS_NUMPY:
+        return {"skipped": "numpy not installed"}
+    from audio.ambience import AMBIENCE_SPECS, CHUNK_FRAMES, AmbienceEngine
+    result = {"chunk_frames": CHUNK_FRAMES,
+              "chunk_ms": CHUNK_FRAMES / sounds.SAMPLE_RATE * 1000}
+    for genre_id in AMBIENCE_SPECS:
+        engine = AmbienceEngine()
+        engine.set_genre(genre_id)
+        result[genre_id] = time_calls(lambda e=engine: e.render(CHUNK_FRAMES), repeat * 10)
+
+    engine = AmbienceEngine()
+    engine.set_genre("horror")
+    engine.render(CHUNK_FRAMES)
+    engine.set_genre("ai")
+    # Both beds are rendered for the whole fade (~65 chunks)
+    result["crossfade"] = time_calls(lambda: engine.render(CHUNK_FRAMES), repeat * 5, warmup=0)
+    return result
+
+
+SUITES = {
+    "synthesis": bench_synthesis,
+    "startup": bench_startup,
+    "play": bench_play,
+    "mixer": bench_mixer,
+    "ambience": bench_ambience,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MadVerse audio benchmarks")
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls per measurement")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--only", nargs="*", choices=sorted(SUITES), help="run a subset")
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication([])
+
+    report = {"benchmark": "audio", "environment": environment(), "results": {}}
+    for name in args.only or SUITES:
+        report["results"][name] = SUITES[name](args.repeat)
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+MadVerse Rendering Benchmarks
+Drives AnimatedBackground offscreen through every effect at several
+resolutions and reports, per effect and size, percentiles of:
+
+  update     — one clock tick (simulation stepped inline, dirty region)
+  simulate   — the simulation step alone
+  paint      — paintEvent into a QImage
+  frame      — update + paint
+  particles  — live particle count
+
+The simulation is seeded and stepped on the calling thread, so runs are
+reproducible. With --baseline, each frame p95 is checked against a previous
+report and the exit status is 1 if any regressed beyond --tolerance.
+
+Every particle effect is also stepped at each quality level. The mean number
+of particles drawn must fall with every level down and stay within the
+level's particle share of the effect's population, or the exit status is 1.
+
+Usage:
+  python -m benchmarks.bench_render [--frames N] [--sizes 800x600 ...]
+                                    [--out report.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.common import environment, summarize, write_report
+
+
+EFFECTS = ("flicker", "glitch", "sparkle", "hearts", "footnote", "void", "matrix")
+SIZES = ("800x600", "1100x740", "1920x1080")
+SEED = 1234
+WARMUP_TICKS = 120      # long enough for every effect to reach steady state
+
+
+def theme_for(effect: str):
+    """The theme of the first genre using effect."""
+    from data.genres import ALL_GENRES
+    for genre in ALL_GENRES:
+        if genre.theme.effect == effect:
+            return genre.theme
+    return ALL_GENRES[0].theme
+
+
+def bench_effect(effect: str, size: str, frames: int, quality: int) -> dict:
+    from PyQt6.QtGui import QImage
+    from ui.background import AnimatedBackground
+
+    w, h = (int(v) for v in size.split("x"))
+    bg = AnimatedBackground(seed=SEED, threaded=False)
+    bg.resize(w, h)
+    bg.adaptive = False
+    bg.set_quality(quality)
+    bg.set_effect(effect, theme_for(effect))
+
+    image = QImage(w, h, QImage.Format.Format_ARGB32_Premultiplied)
+    # First paint builds the static layer and sprite atlases
+    bg.render(image)
+    first_paint = bg.paint_ms
+    for _ in range(WARMUP_TICKS):
+        bg._update()
+    bg.render(image)
+
+    update, simulate, paint, frame, particles = [], [], [], [], []
+    for _ in range(frames):
+        bg._update()
+        bg.render(image)
+        update.append(bg.update_ms)
+        simulate.append(bg.frame.step_ms)
+        paint.append(bg.paint_ms)
+        frame.append(bg.update_ms + bg.paint_ms)
+        particles.append(len(bg.frame))
+    bg.deleteLater()
+
+    return {
+        "first_paint_ms": round(first_paint, 4),
+        "update": summarize(update),
+        "simulate": summarize(simulate),
+        "paint": summarize(paint),
+        "frame": summarize(frame),
+        "particles": summarize(particles, unit="count"),
+    }
+
+
+def particles_per_level(effect: str, size: str, frames: int) -> list:
+    """Mean particles drawn per frame at each quality level, best first."""
+    from ui.background import AnimatedBackground, QUALITY_LEVELS
+
+    w, h = (int(v) for v in size.split("x"))
+    means = []
+    for level in range(len(QUALITY_LEVELS)):
+        bg = AnimatedBackground(seed=SEED, threaded=False)
+        bg.resize(w, h)
+        bg.adaptive = False
+        bg.set_quality(level)
+        bg.set_effect(effect, theme_for(effect))
+        for _ in range(WARMUP_TICKS):
+            bg._update()
+        drawn = 0
+        for _ in range(frames):
+            bg._update()
+            drawn += len(bg.frame)
+        bg.deleteLater()
+        means.append(round(drawn / frames, 2))
+    return means
+
+
+def levels_reduce(effect: str, means: list) -> bool:
+    """Each level down draws fewer particles, within its share of the population."""
+    from ui.background import QUALITY_LEVELS
+    from ui.simulation import EFFECT_POPULATION
+
+    population = EFFECT_POPULATION[effect]
+    for level in range(1, len(means)):
+        cap = max(1, int(population * QUALITY_LEVELS[level]["particles"]))
+        if means[level] >= means[level - 1] or means[level] > cap:
+            return False
+    return True
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """(effect, size, old p95, new p95) for every frame p95 over tolerance."""
+    regressions = []
+    for effect, sizes in results.items():
+        for size, result in sizes.items():
+            old = baseline.get(effect, {}).get(size)
+            if old is None:
+                continue
+            before, after = old["frame"]["p95_ms"], result["frame"]["p95_ms"]
+            if after > before * (1 + tolerance):
+                regressions.append((effect, size, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MadVerse rendering benchmarks")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per effect and size")
+    parser.add_argument("--sizes", nargs="*", default=list(SIZES), help="WIDTHxHEIGHT resolutions")
+    parser.add_argument("--only", nargs="*", choices=EFFECTS, help="run a subset of effects")
+    parser.add_argument("--quality", type=int, default=0, help="pinned quality level (0 = best)")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="earlier report to check frame p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 slowdown vs the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from ui.simulation import EFFECT_POPULATION
+
+    results, levels = {}, {}
+    for effect in args.only or EFFECTS:
+        results[effect] = {size: bench_effect(effect, size, args.frames, args.quality)
+                           for size in args.sizes}
+        if effect in EFFECT_POPULATION:
+            levels[effect] = particles_per_level(effect, args.sizes[0], args.frames)
+    not_reduced = [e for e, means in levels.items() if not levels_reduce(e, means)]
+
+    report = {
+        "benchmark": "render",
+        "environment": environment(),
+        "config": {"frames": args.frames, "warmup_ticks": WARMUP_TICKS,
+                   "seed": SEED, "quality": args.quality},
+        "results": results,
+        "particles_per_quality_level": levels,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        report["regressions"] = [
+            {"effect": e, "size": s, "baseline_p95_ms": b, "p95_ms": a}
+            for e, s, b, a in regressions
+        ]
+    write_report(report, args.out)
+
+    for effect, size, before, after in regressions:
+        sys.stderr.write(f"regression: {effect} @ {size}: frame p95 {before:.3f} → {after:.3f} ms\n")
+    for effect in not_reduced:
+        sys.stderr.write(f"quality: {effect} particles per level {levels[effect]} not capped\n")
+    if regressions or not_reduced:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
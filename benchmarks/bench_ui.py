@@ -0,0 +1,307 @@
+"""
+MadVerse UI Benchmarks
+Headless timings for the main window, reported as JSON:
+
+  startup      — fresh interpreter to first painted window: import, window
+                 construction and first paint wall times, plus a
+                 `-X importtime` breakdown of `import ui.main_window`.
+                 Exits 1 if any module that should load only after the first
+                 paint (STARTUP_DEFERRED) was already imported by then.
+  theme_switch — genre selection, from the click until the incoming screen
+                 has been painted once, with MainWindow's own breakdown
+                 (settings bar stylesheet, effects, screen restyle)
+  previews     — fresh window until every genre card has its preview loop:
+                 time taken, GUI time per frame spent rendering loops, and
+                 the longest the event loop went without running after the
+                 first paint
+
+Usage:
+  python -m benchmarks.bench_ui [--repeat N] [--out report.json]
+
+Every suite keeps its archive, search index and stats in a scratch
+directory, so running them never touches the app's own data.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.common import environment, summarize, write_report
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first navigation or after the window is up, never before
+STARTUP_DEFERRED = (
+    "audio.sounds", "audio.mixer", "PyQt6.QtMultimedia", "data.stats",
+    "engine.story_engine", "ui.story_reveal", "ui.stats_screen", "ui.loading_screen",
+)
+
+# Run in a fresh interpreter; prints one JSON line at the first paint
+STARTUP_SCRIPT = r"""
+import json, sys, time
+started = time.perf_counter()
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+from ui.main_window import MainWindow
+imported = time.perf_counter()
+import data.archive     # already loaded by ui.main_window
+data.archive._archive = data.archive.StoryArchive(sys.argv[2])   # else opened by the window
+window = MainWindow()
+built = time.perf_counter()
+
+def painted():
+    now = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "construct_ms": (built - imported) * 1000,
+        "first_paint_ms": (now - started) * 1000,
+        "deferred_loaded": [m for m in json.loads(sys.argv[1]) if m in sys.modules],
+    }))
+    app.exit(0)
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not self.seen:
+            self.seen = True
+            QTimer.singleShot(0, painted)   # once the whole window has painted
+        return False
+
+watcher = FirstPaint()
+watcher.seen = False
+window.installEventFilter(watcher)
+window.show()
+app.exec()
+window.close()
+"""
+
+
+# Run in a fresh interpreter (empty preview cache); prints one JSON line
+PREVIEWS_SCRIPT = r"""
+import json, os, sys, time
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+from ui.main_window import MainWindow
+from ui.previews import get_preview_scheduler
+import data.archive, data.stats
+data.archive._archive = data.archive.StoryArchive(sys.argv[1])
+data.stats.STATS_FILE = os.path.join(sys.argv[1], "stats.json")
+window = MainWindow()
+previews = get_preview_scheduler()
+cards = len(previews._cards)
+gaps, last = [], [None]
+
+def beat():
+    now = time.perf_counter()
+    if last[0] is not None:
+        gaps.append((now - last[0]) * 1000)
+    last[0] = now
+    if previews.stats()["loops"] >= cards:
+        stats = previews.stats()
+        print(json.dumps({
+            "all_loops_ms": (now - shown) * 1000,
+            "loops": stats["loops"],
+            "render_ticks": stats["render_ticks"],
+            "render_ms": stats["render_ms"],
+            "render_max_ms": stats["render_max_ms"],
+            "loop_gap_max_ms": max(gaps),
+        }))
+        app.exit(0)
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not heartbeat.isActive():
+            QTimer.singleShot(0, lambda: heartbeat.start(1))   # gaps after the first paint
+        return False
+
+heartbeat = QTimer()
+heartbeat.timeout.connect(beat)
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+window.show()
+shown = time.perf_counter()
+app.exec()
+window.close()
+"""
+
+
+@contextmanager
+def _scratch_dir():
+    scratch = tempfile.mkdtemp(prefix="madverse-bench-")
+    try:
+        yield scratch
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+@contextmanager
+def _scratch_data():
+    """Point the shared archive, search index and stats file at a scratch directory."""
+    import data.archive as archive
+    import data.search as search
+    import data.stats as stats
+
+    saved = archive._archive, search._index, stats._tracker, stats.STATS_FILE
+    with _scratch_dir() as scratch:
+        archive._archive = archive.StoryArchive(scratch)
+        search._index, stats._tracker = None, None
+        stats.STATS_FILE = os.path.join(scratch, "stats.json")
+        try:
+            yield scratch
+        finally:
+            search.close_search_index()
+            archive._archive.close()
+            archive._archive, search._index, stats._tracker, stats.STATS_FILE = saved
+
+
+def _pump(app, ms: float):
+    end = time.monotonic() + ms / 1000
+    while time.monotonic() < end:
+        app.processEvents()
+
+
+def _import_times() -> dict:
+    """Parse `python -X importtime -c "import ui.main_window"` (microseconds)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import ui.main_window"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    # A module is listed after everything it imported, so ui.main_window's
+    # subtree is the run of deeper rows just before it
+    end = next(i for i, r in enumerate(rows) if r[0] == "ui.main_window")
+    _, depth, _, total = rows[end]
+    start = end
+    while start > 0 and rows[start - 1][1] > depth:
+        start -= 1
+    nested = rows[start:end]
+    # Heaviest first, as [name, ms] pairs so the order survives the report
+    direct = sorted((r for r in nested if r[1] == depth + 1), key=lambda r: -r[3])
+    by_self = sorted(nested, key=lambda r: -r[2])
+    return {
+        "total_ms": round(total / 1000, 3),
+        "direct_imports_ms": [[n, round(c / 1000, 3)] for n, d, s, c in direct[:15]],
+        "top_self_ms": [[n, round(s / 1000, 3)] for n, d, s, c in by_self[:15]],
+    }
+
+
+def bench_startup(app, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        with _scratch_dir() as scratch:
+            proc = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT,
+                                   json.dumps(STARTUP_DEFERRED), scratch],
+                                  cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    loaded = sorted({m for run in runs for m in run["deferred_loaded"]})
+    return {
+        "import": summarize([r["import_ms"] for r in runs]),
+        "construct": summarize([r["construct_ms"] for r in runs]),
+        "first_paint": summarize([r["first_paint_ms"] for r in runs]),
+        "deferred_loaded_before_paint": loaded,
+        "importtime": _import_times(),
+    }
+
+
+def bench_previews(app, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        with _scratch_dir() as scratch:
+            proc = subprocess.run([sys.executable, "-c", PREVIEWS_SCRIPT, scratch],
+                                  cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {
+        "all_loops": summarize([r["all_loops_ms"] for r in runs]),
+        "render_per_frame_max": summarize([r["render_max_ms"] for r in runs]),
+        "render_total": summarize([r["render_ms"] for r in runs]),
+        "render_ticks": summarize([r["render_ticks"] for r in runs], unit="count"),
+        "event_loop_gap_max": summarize([r["loop_gap_max_ms"] for r in runs]),
+    }
+
+
+def bench_theme_switch(app, repeat: int) -> dict:
+    with _scratch_data():
+        return _bench_theme_switch(app, repeat)
+
+
+def _bench_theme_switch(app, repeat: int) -> dict:
+    from data.genres import ALL_GENRES
+    from ui.main_window import MainWindow, SCREEN_GENRE
+    from ui.theme import get_story_type_format
+
+    window = MainWindow()
+    window.show()
+    _pump(app, 200)
+
+    select, breakdown = [], {"stylesheet_ms": [], "effects_ms": [], "page_ms": [], "total_ms": []}
+    for _ in range(repeat):
+        for genre in ALL_GENRES:
+            window._go_to(SCREEN_GENRE)
+            window._transition.finish()
+            _pump(app, 20)
+            started = time.perf_counter()
+            window._on_genre_selected(genre)
+            select.append((time.perf_counter() - started) * 1000)
+            last = window.theme_stats()["last"]
+            for key, samples in breakdown.items():
+                samples.append(last[key])
+            window._transition.finish()
+    window.close()
+
+    theme = ALL_GENRES[0].theme
+    formats = []
+    for _ in range(repeat * 100):
+        started = time.perf_counter()
+        get_story_type_format("callback", theme)
+        formats.append((time.perf_counter() - started) * 1000)
+
+    result = {"on_genre_selected": summarize(select), "story_type_format": summarize(formats)}
+    result.update({key: summarize(samples) for key, samples in breakdown.items()})
+    return result
+
+
+SUITES = {
+    "startup": bench_startup,
+    "theme_switch": bench_theme_switch,
+    "previews": bench_previews,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MadVerse UI benchmarks")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="fresh startups, and passes over every genre")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--only", nargs="*", choices=sorted(SUITES), help="run a subset")
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    report = {"benchmark": "ui", "environment": environment(), "results": {}}
+    for name in args.only or SUITES:
+        report["results"][name] = SUITES[name](app, args.repeat)
+    write_report(report, args.out)
+
+    loaded = report["results"].get("startup", {}).get("deferred_loaded_before_paint")
+    if loaded:
+        sys.stderr.write(f"startup: loaded before first paint: {', '.join(loaded)}\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
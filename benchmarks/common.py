@@ -0,0 +1,67 @@
+"""
+MadVerse Benchmark Helpers
+Timing and JSON reporting shared by the benchmark scripts.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def time_calls(fn: Callable[[], object], repeat: int = 20, warmup: int = 1) -> Dict[str, float]:
+    """Call fn `repeat` times and summarize the wall time of each call in ms."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples: List[float], unit: str = "ms") -> Dict[str, float]:
+    """Mean and percentiles of samples; keys carry the unit (mean_ms, p95_ms…)."""
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    return {
+        "n": len(ordered),
+        f"mean_{unit}": round(statistics.fmean(ordered), 4),
+        f"median_{unit}": round(statistics.median(ordered), 4),
+        f"p95_{unit}": round(pct(0.95), 4),
+        f"p99_{unit}": round(pct(0.99), 4),
+        f"min_{unit}": round(ordered[0], 4),
+        f"max_{unit}": round(ordered[-1], 4),
+    }
+
+
+def environment() -> Dict[str, object]:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_report(report: Dict, out_path: Optional[str] = None):
+    """Print the report as JSON, or write it to out_path."""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if out_path:
+        with open(out_path, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,259 @@
+"""
+MadVerse Story Archive
+Append-only, block-compressed store of every generated story.
+
+Layout on disk (all under ARCHIVE_DIR):
+  stories.dat  — zlib-compressed blocks, each a run of length-prefixed JSON records
+  stories.idx  — one fixed-width entry per story id, so lookup is a single seek
+  stories.jnl  — records not yet sealed into a block (replayed on open)
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+DATA_NAME = "stories.dat"
+INDEX_NAME = "stories.idx"
+JOURNAL_NAME = "stories.jnl"
+
+# Block header: compressed length, raw length
+BLOCK_HEADER = struct.Struct("<II")
+# Index entry: block offset, block length (incl. header), record offset in block, record length
+INDEX_ENTRY = struct.Struct("<QIII")
+# Journal header: id of the first journalled record
+JOURNAL_HEADER = struct.Struct("<Q")
+RECORD_LEN = struct.Struct("<I")
+
+DEFAULT_BLOCK_BYTES = 64 * 1024
+BLOCK_CACHE_SIZE = 8
+
+
+class StoryArchive:
+    """
+    Stores story records by integer id (0, 1, 2, …).
+    New records go to a small journal; once the pending records reach
+    block_bytes they are compressed into a single block and indexed.
+    Safe to read from one thread (e.g. the search indexer) while another appends.
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR, block_bytes: int = DEFAULT_BLOCK_BYTES):
+        self.directory = directory
+        self.block_bytes = block_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._data_path = os.path.join(directory, DATA_NAME)
+        self._index_path = os.path.join(directory, INDEX_NAME)
+        self._journal_path = os.path.join(directory, JOURNAL_NAME)
+
+        self._data_f = open(self._data_path, "a+b")
+        self._index_f = open(self._index_path, "a+b")
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+
+        self._block_cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._lock = threading.RLock()
+
+        self._sealed = self._repair_index()
+        self._replay_journal()
+        self._journal_f = open(self._journal_path, "ab")
+        if self._journal_f.tell() == 0:
+            self._write_journal_header()
+
+    # ─────────────────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._sealed + len(self._pending)
+
+    def append(self, record: Dict) -> int:
+        """Append a record and return its story id."""
+        with self._lock:
+            story_id = len(self)
+            record = dict(record, id=story_id)
+            raw = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+            self._journal_f.write(RECORD_LEN.pack(len(raw)) + raw)
+            self._journal_f.flush()
+            self._pending.append(raw)
+            self._pending_bytes += RECORD_LEN.size + len(raw)
+
+            if self._pending_bytes >= self.block_bytes:
+                self.flush()
+            return story_id
+
+    def record_story(self, genre_id: str, words: Dict[str, str], parts: List[Dict],
+                     seed: Optional[int] = None, is_ai: bool = False,
+                     ai_meta: Optional[Dict] = None) -> int:
+        """Archive a finished story and return its id."""
+        return self.append({
+            "created": datetime.now().isoformat(),
+            "genre": genre_id,
+            "words": words,
+            "parts": parts,
+            "seed": seed,
+            "is_ai": is_ai,
+            "ai": ai_meta or {},
+        })
+
+    def get(self, story_id: int) -> Dict:
+        """Return the record for story_id. Raises IndexError if unknown."""
+        with self._lock:
+            if story_id < 0 or story_id >= len(self):
+                raise IndexError(f"story id {story_id} out of range")
+            if story_id >= self._sealed:
+                raw = self._pending[story_id - self._sealed]
+            else:
+                block_off, block_len, rec_off, rec_len = self._index_entry(story_id)
+                block = self._read_block(block_off, block_len)
+                raw = block[rec_off:rec_off + rec_len]
+        return json.loads(raw.decode("utf-8"))
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        """Yield records with ids in [start, stop)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for story_id in range(max(0, start), stop):
+            yield self.get(story_id)
+
+    def flush(self):
+        """Seal all pending records into one compressed block."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            raw_block = bytearray()
+            offsets = []
+            for raw in self._pending:
+                raw_block += RECORD_LEN.pack(len(raw))
+                offsets.append((len(raw_block), len(raw)))
+                raw_block += raw
+            compressed = zlib.compress(bytes(raw_block), 6)
+
+            self._data_f.seek(0, os.SEEK_END)
+            block_off = self._data_f.tell()
+            self._data_f.write(BLOCK_HEADER.pack(len(compressed), len(raw_block)))
+            self._data_f.write(compressed)
+            self._data_f.flush()
+            os.fsync(self._data_f.fileno())
+            block_len = BLOCK_HEADER.size + len(compressed)
+
+            entries = b"".join(INDEX_ENTRY.pack(block_off, block_len, off, length)
+                               for off, length in offsets)
+            self._index_f.seek(0, os.SEEK_END)
+            self._index_f.write(entries)
+            self._index_f.flush()
+            os.fsync(self._index_f.fileno())
+
+            self._sealed += len(self._pending)
+            self._pending = []
+            self._pending_bytes = 0
+            self._remap()
+
+            self._journal_f.truncate(0)
+            self._journal_f.seek(0)
+            self._write_journal_header()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for m in (self._data_map, self._index_map):
+                if m is not None:
+                    m.close()
+            self._data_map = self._index_map = None
+            for f in (self._journal_f, self._data_f, self._index_f):
+                f.close()
+
+    # ─────────────────────────────────────────────────────────
+    # INTERNAL HELPERS
+    # ─────────────────────────────────────────────────────────
+
+    def _repair_index(self) -> int:
+        """Drop a torn trailing index entry left by a crash; return sealed count."""
+        size = os.path.getsize(self._index_path)
+        whole = size - size % INDEX_ENTRY.size
+        if whole != size:
+            self._index_f.truncate(whole)
+        self._remap()
+        return whole // INDEX_ENTRY.size
+
+    def _replay_journal(self):
+        if not os.path.exists(self._journal_path):
+            return
+        with open(self._journal_path, "rb") as f:
+            buf = f.read()
+        if len(buf) < JOURNAL_HEADER.size:
+            os.remove(self._journal_path)
+            return
+        (story_id,) = JOURNAL_HEADER.unpack_from(buf, 0)
+        pos = JOURNAL_HEADER.size
+        while pos + RECORD_LEN.size <= len(buf):
+            (length,) = RECORD_LEN.unpack_from(buf, pos)
+            pos += RECORD_LEN.size
+            if pos + length > len(buf):
+                break  # torn write
+            # Records already sealed before a crash are skipped
+            if story_id >= self._sealed:
+                raw = buf[pos:pos + length]
+                self._pending.append(raw)
+                self._pending_bytes += RECORD_LEN.size + length
+            pos += length
+            story_id += 1
+        os.remove(self._journal_path)
+        # Rewrite a clean journal holding only the surviving pending records
+        with open(self._journal_path, "wb") as f:
+            f.write(JOURNAL_HEADER.pack(self._sealed))
+            for raw in self._pending:
+                f.write(RECORD_LEN.pack(len(raw)) + raw)
+
+    def _write_journal_header(self):
+        self._journal_f.write(JOURNAL_HEADER.pack(self._sealed))
+        self._journal_f.flush()
+
+    def _remap(self):
+        for attr, f in (("_data_map", self._data_f), ("_index_map", self._index_f)):
+            old = getattr(self, attr)
+            if old is not None:
+                old.close()
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            setattr(self, attr, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) if size else None)
+
+    def _index_entry(self, story_id: int):
+        pos = story_id * INDEX_ENTRY.size
+        return INDEX_ENTRY.unpack_from(self._index_map, pos)
+
+    def _read_block(self, block_off: int, block_len: int) -> bytes:
+        block = self._block_cache.get(block_off)
+        if block is not None:
+            self._block_cache.move_to_end(block_off)
+            return block
+        comp_len, _raw_len = BLOCK_HEADER.unpack_from(self._data_map, block_off)
+        start = block_off + BLOCK_HEADER.size
+        block = zlib.decompress(self._data_map[start:start + comp_len])
+        self._block_cache[block_off] = block
+        if len(self._block_cache) > BLOCK_CACHE_SIZE:
+            self._block_cache.popitem(last=False)
+        return block
+
+
+# Singleton
+_archive: Optional[StoryArchive] = None
+
+def get_archive() -> StoryArchive:
+    global _archive
+    if _archive is None:
+        _archive = StoryArchive()
+    return _archive
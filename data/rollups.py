@@ -0,0 +1,183 @@
+"""
+MadVerse Stats Rollups
+Fixed-size ring buffers of per-hour, per-day and per-week play aggregates,
+plus LTTB downsampling for charting long series.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# resolution → (bucket length in seconds, number of buckets kept)
+RESOLUTIONS = {
+    "hour": (3600, 168),        # one week of hours
+    "day":  (86400, 366),       # one year of days
+    "week": (7 * 86400, 260),   # five years of weeks
+}
+
+# Unix epoch was a Thursday; shift so weekly buckets start on Monday
+WEEK_OFFSET = 3 * 86400
+
+METRICS = ("stories", "ai_stories", "ai_latency_sum", "ai_latency_count")
+
+
+def _local_seconds(ts: float) -> float:
+    """Seconds since the epoch in local wall-clock time."""
+    offset = datetime.fromtimestamp(ts).astimezone().utcoffset()
+    return ts + (offset.total_seconds() if offset else 0)
+
+
+class RingRollup:
+    """
+    Aggregates for the last `size` buckets of `bucket_seconds` each.
+    Slot i holds bucket number b where b % size == i; slots are cleared
+    lazily as time advances, so every update is O(1) amortized.
+    """
+
+    def __init__(self, bucket_seconds: int, size: int, offset: int = 0):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.offset = offset
+        self.last_bucket: Optional[int] = None
+        self.metrics: Dict[str, List[float]] = {m: [0] * size for m in METRICS}
+        self.genres: Dict[str, List[int]] = {}
+
+    def bucket_of(self, ts: float) -> int:
+        return int((_local_seconds(ts) + self.offset) // self.bucket_seconds)
+
+    def add(self, ts: float, genre_id: str, is_ai: bool = False,
+            ai_latency: Optional[float] = None):
+        slot = self._advance(self.bucket_of(ts))
+        if slot is None:
+            return  # older than the retained window
+        self.metrics["stories"][slot] += 1
+        if is_ai:
+            self.metrics["ai_stories"][slot] += 1
+        if ai_latency is not None:
+            self.metrics["ai_latency_sum"][slot] += ai_latency
+            self.metrics["ai_latency_count"][slot] += 1
+        counts = self.genres.get(genre_id)
+        if counts is None:
+            counts = self.genres[genre_id] = [0] * self.size
+        counts[slot] += 1
+
+    def series(self, metric: str = "stories", genre_id: Optional[str] = None,
+               now: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Oldest-to-newest (bucket_number, value) pairs for the whole window,
+        ending at the bucket containing `now`. Always `size` points long.
+        """
+        end = self.bucket_of(time.time() if now is None else now)
+        if genre_id is not None:
+            values = self.genres.get(genre_id, [0] * self.size)
+        elif metric == "ai_latency_avg":
+            values = [s / c if c else 0.0 for s, c in
+                      zip(self.metrics["ai_latency_sum"], self.metrics["ai_latency_count"])]
+        else:
+            values = self.metrics[metric]
+
+        out = []
+        for b in range(end - self.size + 1, end + 1):
+            live = self.last_bucket is not None and self.last_bucket - self.size < b <= self.last_bucket
+            out.append((b, values[b % self.size] if live else 0))
+        return out
+
+    def bucket_start(self, bucket: int) -> datetime:
+        """Local datetime at which a bucket number begins."""
+        local = bucket * self.bucket_seconds - self.offset
+        return datetime.fromtimestamp(local, timezone.utc).replace(tzinfo=None)
+
+    def _advance(self, bucket: int) -> Optional[int]:
+        if self.last_bucket is None:
+            self.last_bucket = bucket
+        elif bucket > self.last_bucket:
+            # Clear slots for the buckets we skipped over (at most one lap)
+            for b in range(self.last_bucket + 1, min(bucket, self.last_bucket + self.size) + 1):
+                self._clear_slot(b % self.size)
+            self.last_bucket = bucket
+        elif bucket <= self.last_bucket - self.size:
+            return None
+        return bucket % self.size
+
+    def _clear_slot(self, slot: int):
+        for values in self.metrics.values():
+            values[slot] = 0
+        for values in self.genres.values():
+            values[slot] = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "last_bucket": self.last_bucket,
+            "metrics": self.metrics,
+            "genres": self.genres,
+        }
+
+    def load(self, d: Dict):
+        metrics = d.get("metrics", {})
+        if any(len(metrics.get(m, ())) != self.size for m in METRICS):
+            return  # window size changed; start fresh
+        self.last_bucket = d.get("last_bucket")
+        self.metrics = {m: list(metrics[m]) for m in METRICS}
+        self.genres = {g: list(v) for g, v in d.get("genres", {}).items() if len(v) == self.size}
+
+
+class StatsRollups:
+    """Hour, day and week rollups updated together."""
+
+    def __init__(self, d: Optional[Dict] = None):
+        self.rollups = {
+            name: RingRollup(seconds, size, WEEK_OFFSET if name == "week" else 0)
+            for name, (seconds, size) in RESOLUTIONS.items()
+        }
+        for name, data in (d or {}).items():
+            if name in self.rollups and isinstance(data, dict):
+                self.rollups[name].load(data)
+
+    def __getitem__(self, resolution: str) -> RingRollup:
+        return self.rollups[resolution]
+
+    def add(self, genre_id: str, is_ai: bool = False, ai_latency: Optional[float] = None,
+            ts: Optional[float] = None):
+        ts = time.time() if ts is None else ts
+        for rollup in self.rollups.values():
+            rollup.add(ts, genre_id, is_ai, ai_latency)
+
+    def to_dict(self) -> Dict:
+        return {name: r.to_dict() for name, r in self.rollups.items()}
+
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Keeps the first and last point and, from each of threshold-2 buckets,
+    the point forming the largest triangle with its neighbours.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(p[0] for p in points[next_start:next_end]) / span
+        avg_y = sum(p[1] for p in points[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            px, py = points[j]
+            area = abs((ax - avg_x) * (py - ay) - (ax - px) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
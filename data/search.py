@@ -0,0 +1,575 @@
+"""
+MadVerse Story Search
+Inverted index over the story archive: term → sorted posting list of story ids.
+
+Terms are stored as "field:token". Fields are:
+  any          — every token from the story text, the user's words and the genre
+  word         — tokens the user typed
+  <part type>  — tokens appearing in parts of that type (opening, callback, …)
+  genre        — the genre id
+  type         — part types present in the story
+
+The index has two layers: a compacted, mmap'd segment file and an in-memory
+delta for stories recorded since the last compaction (persisted to a log).
+In the app a worker thread loads the index, catches up with the archive and
+compacts; the GUI thread only queries and asks for a sync.
+
+Query syntax:  banana   genre:horror type:callback   ban*   horror OR romance
+Whitespace means AND, OR binds looser than AND, a trailing * is a prefix match
+over the first MAX_PREFIX_TERMS matching terms in sort order (query() reports
+which prefixes were cut short). A token that splits into several words, like
+ice-cream, matches stories containing all of them.
+
+Run `python -m data.search rebuild|compact|query …` from the project root.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from data.archive import ARCHIVE_DIR, StoryArchive, get_archive
+
+
+SEGMENT_NAME = "search.seg"
+LOG_NAME = "search.log"
+
+SEG_MAGIC = b"MVS1"
+# magic, term count, docs covered, byte offset of the postings region
+SEG_HEADER = struct.Struct("<4sIQQ")
+TERM_LEN = struct.Struct("<H")
+# posting offset (in ids), posting count
+TERM_ENTRY = struct.Struct("<QI")
+
+# Delta stories kept in memory before the background indexer compacts
+AUTO_COMPACT_DOCS = 5000
+# Stories indexed per lock hold while catching up, so queries wait at most one batch
+SYNC_BATCH = 32
+# Terms a prefix expands to, so "w1*" never walks or merges the whole vocabulary
+MAX_PREFIX_TERMS = 128
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def story_terms(record: Dict) -> List[str]:
+    """Return the unique field-qualified terms for an archived story."""
+    terms = set()
+    genre = record.get("genre")
+    if genre:
+        terms.add(f"genre:{genre.lower()}")
+        terms.add(f"any:{genre.lower()}")
+
+    for value in record.get("words", {}).values():
+        for tok in tokenize(value):
+            terms.add(f"word:{tok}")
+            terms.add(f"any:{tok}")
+
+    for part in record.get("parts", []):
+        part_type = part.get("type", "middle")
+        terms.add(f"type:{part_type}")
+        for tok in tokenize(part.get("text", "")):
+            terms.add(f"{part_type}:{tok}")
+            terms.add(f"any:{tok}")
+    return sorted(terms)
+
+
+class SearchResult(NamedTuple):
+    ids: List[int]          # matching story ids, ascending
+    truncated: List[str]    # prefix tokens that matched more than MAX_PREFIX_TERMS terms
+
+
+class _Postings:
+    """Read-only view over a segment posting array followed by delta ids."""
+    __slots__ = ("_seg", "_delta")
+
+    def __init__(self, seg: Sequence[int], delta: Sequence[int]):
+        self._seg = seg
+        self._delta = delta
+
+    def __len__(self) -> int:
+        return len(self._seg) + len(self._delta)
+
+    def __iter__(self):
+        yield from self._seg
+        yield from self._delta
+
+    def __contains__(self, story_id: int) -> bool:
+        for arr in (self._seg, self._delta):
+            i = bisect_left(arr, story_id)
+            if i < len(arr) and arr[i] == story_id:
+                return True
+        return False
+
+
+class _Union:
+    """Lazy OR of posting lists: probed by membership, merged only when iterated."""
+    __slots__ = ("_parts",)
+
+    def __init__(self, parts: List[_Postings]):
+        self._parts = parts
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._parts)     # upper bound
+
+    def __iter__(self):
+        merged = set()
+        for p in self._parts:
+            merged.update(p)
+        yield from merged
+
+    def __contains__(self, story_id: int) -> bool:
+        return any(story_id in p for p in self._parts)
+
+
+class StoryIndex:
+    """
+    Incrementally maintained inverted index over a StoryArchive.
+    Call sync() after recording stories; it indexes only the new ids.
+
+    With background=True the segment is loaded, new stories are indexed and
+    the delta is compacted on a worker thread; callers use request_sync(),
+    which returns at once, and queries wait only for the initial load.
+    Listeners registered with add_listener() are called on the worker with
+    the number of stories indexed after every sync that indexed any.
+    """
+
+    def __init__(self, archive: StoryArchive, directory: str = ARCHIVE_DIR,
+                 background: bool = False):
+        self.archive = archive
+        self.directory = directory
+        self._seg_path = os.path.join(directory, SEGMENT_NAME)
+        self._log_path = os.path.join(directory, LOG_NAME)
+
+        self._seg_map: Optional[mmap.mmap] = None
+        self._seg_ids: Optional[memoryview] = None
+        self._seg_terms: List[str] = []
+        self._seg_entries: Dict[str, tuple] = {}
+        self._seg_docs = 0
+
+        self._delta: Dict[str, List[int]] = {}
+        self._delta_terms: List[str] = []       # sorted, rebuilt lazily
+        self._delta_terms_dirty = False
+        self._indexed = 0
+        self._log_f = None
+
+        # Guards the segment, delta and log; held per query, batch or swap
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._cond = threading.Condition()
+        self._sync_requested = True
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[int], None]] = []
+
+        if background:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+            self._thread.start()
+        else:
+            self._open()
+
+    # ─────────────────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._indexed
+
+    def sync(self, limit: Optional[int] = None) -> int:
+        """Index (up to `limit`) stories added to the archive since the last sync."""
+        stop = len(self.archive)
+        if limit is not None:
+            stop = min(stop, self._indexed + limit)
+        # Records are read, tokenized and logged outside the lock
+        batch = [(story_id, story_terms(self.archive.get(story_id)))
+                 for story_id in range(self._indexed, stop)]
+        if not batch:
+            return 0
+        self._log_f.write("".join(json.dumps({"id": story_id, "terms": terms}) + "\n"
+                                  for story_id, terms in batch))
+        self._log_f.flush()
+        with self._lock:
+            for story_id, terms in batch:
+                self._add(story_id, terms)
+        return len(batch)
+
+    def request_sync(self):
+        """Index new stories on the worker (inline without one); returns at once."""
+        if self._thread is None:
+            self.sync()
+            return
+        with self._cond:
+            self._sync_requested = True
+            self._cond.notify()
+
+    def add_listener(self, listener: Callable[[int], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def needs_compaction(self) -> bool:
+        return self._indexed - self._seg_docs >= AUTO_COMPACT_DOCS
+
+    def lookup(self, term: str, field: str = "any", prefix: bool = False) -> List[int]:
+        """Sorted story ids whose `field` contains `term` (or a term starting with it)."""
+        self._loaded.wait()
+        with self._lock:
+            postings, _ = self._postings_for(f"{field}:{term.lower()}", prefix)
+            if len(postings) == 1:
+                return list(postings[0])
+            return self._union(postings)
+
+    def search(self, query: str) -> List[int]:
+        """Evaluate a query string and return matching story ids, ascending."""
+        return self.query(query).ids
+
+    def query(self, query: str) -> SearchResult:
+        """search(), also naming the prefix tokens whose expansion was capped."""
+        self._loaded.wait()
+        truncated: List[str] = []
+        with self._lock:
+            groups = []
+            for clause in re.split(r"\s+OR\s+", query.strip()):
+                postings = []
+                for token in clause.split():
+                    postings.extend(self._postings_for_query_token(token, truncated))
+                if postings:
+                    groups.append(self._intersect(postings))
+            if not groups:
+                ids = []
+            elif len(groups) == 1:
+                ids = groups[0]
+            else:
+                ids = self._union(groups)
+        return SearchResult(ids, truncated)
+
+    def compact(self):
+        """
+        Merge the delta into a new segment file and truncate the log. The
+        file is written and its term table parsed without holding the lock;
+        queries are blocked only while the new segment is swapped in.
+        Call it from the thread that indexes (the worker, or the only one).
+        """
+        terms = sorted(set(self._seg_terms) | set(self._delta))
+        term_blob = bytearray()
+        postings = array("I")
+        for term in terms:
+            start = len(postings)
+            seg = self._seg_postings(term)
+            if seg is not None:
+                postings.extend(seg)
+            postings.extend(self._delta.get(term, ()))
+            raw = term.encode("utf-8")
+            term_blob += TERM_LEN.pack(len(raw)) + raw
+            term_blob += TERM_ENTRY.pack(start, len(postings) - start)
+        seg = None  # drop the last view so the old segment can be unmapped
+
+        postings_off = SEG_HEADER.size + len(term_blob)
+        postings_off += -postings_off % postings.itemsize
+        tmp_path = self._seg_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SEG_HEADER.pack(SEG_MAGIC, len(terms), self._indexed, postings_off))
+            f.write(term_blob)
+            f.write(b"\0" * (postings_off - SEG_HEADER.size - len(term_blob)))
+            postings.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        table = self._read_term_table(tmp_path)
+
+        # Freed after the lock is released: dropping them is not free at scale
+        retired = (self._seg_terms, self._seg_entries, self._delta, self._delta_terms)
+        with self._lock:
+            self._close_segment()
+            os.replace(tmp_path, self._seg_path)
+            self._map_segment(table)
+
+            self._delta = {}
+            self._delta_terms = []
+            self._delta_terms_dirty = False
+            self._log_f.truncate(0)
+            self._log_f.seek(0)
+        del retired
+
+    def rebuild(self):
+        """Discard the index and re-index every story in the archive (no worker)."""
+        self._close_segment()
+        if os.path.exists(self._seg_path):
+            os.remove(self._seg_path)
+        self._seg_docs = 0
+        self._delta = {}
+        self._delta_terms_dirty = True
+        self._indexed = 0
+        self._log_f.truncate(0)
+        self._log_f.seek(0)
+        for story_id in range(len(self.archive)):
+            self._add(story_id, story_terms(self.archive.get(story_id)))
+        self.compact()
+
+    def close(self):
+        """Stop the worker (letting a running compaction finish) and close files."""
+        if self._thread is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify()
+            self._thread.join()
+            self._thread = None
+        if self._log_f is not None:
+            self._log_f.close()
+            self._log_f = None
+        self._close_segment()
+
+    # ─────────────────────────────────────────────────────────
+    # INTERNAL HELPERS
+    # ─────────────────────────────────────────────────────────
+
+    def _open(self):
+        self._load_segment()
+        self._replay_log()
+        self._log_f = open(self._log_path, "a", encoding="utf-8")
+        self._loaded.set()
+
+    def _run(self):
+        with self._lock:
+            try:
+                self._open()
+            finally:
+                self._loaded.set()     # never leave queries waiting
+        while True:
+            with self._cond:
+                while self._running and not self._sync_requested:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                self._sync_requested = False
+            synced = 0
+            while self._running:
+                n = self.sync(SYNC_BATCH)
+                if not n:
+                    break
+                synced += n
+            if synced and self._running:
+                for listener in list(self._listeners):
+                    listener(self._indexed)
+            if self._running and self.needs_compaction():
+                self.compact()
+
+    def _add(self, story_id: int, terms: Iterable[str]):
+        for term in terms:
+            ids = self._delta.get(term)
+            if ids is None:
+                self._delta[term] = [story_id]
+                self._delta_terms_dirty = True
+            else:
+                ids.append(story_id)
+        self._indexed = story_id + 1
+
+    def _postings_for_query_token(self, token: str, truncated: List[str]) -> List[_Postings]:
+        """One posting list per word of token, to be intersected."""
+        field, _, term = token.rpartition(":")
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if not field:
+            field = "any"
+        if field in ("genre", "type"):
+            words = [term]
+        else:
+            # Match the index's tokenization, e.g. "Banana!" → "banana",
+            # "ice-cream" → "ice" AND "cream"; a * applies to the last word
+            words = tokenize(term) or [""]
+        result = []
+        for i, word in enumerate(words):
+            postings, cut = self._postings_for(f"{field}:{word.lower()}",
+                                               prefix and i == len(words) - 1)
+            if cut:
+                truncated.append(token)
+            result.append(postings[0] if len(postings) == 1 else _Union(postings))
+        return result
+
+    def _postings_for(self, key: str, prefix: bool) -> Tuple[List[_Postings], bool]:
+        """Posting lists for key (every term it prefixes), and whether the prefix was capped."""
+        if not prefix:
+            seg = self._seg_postings(key)
+            return [_Postings(seg if seg is not None else (), self._delta.get(key, ()))], False
+
+        keys = set(self._prefix_range(self._seg_terms, key))
+        keys.update(self._prefix_range(self._sorted_delta_terms(), key))
+        result = []
+        for k in sorted(keys)[:MAX_PREFIX_TERMS]:
+            seg = self._seg_postings(k)
+            result.append(_Postings(seg if seg is not None else (), self._delta.get(k, ())))
+        return result or [_Postings((), ())], len(keys) > MAX_PREFIX_TERMS
+
+    @staticmethod
+    def _prefix_range(terms: List[str], prefix: str) -> List[str]:
+        """The first MAX_PREFIX_TERMS + 1 terms starting with prefix (one more shows a cut)."""
+        i = bisect_left(terms, prefix)
+        out = []
+        while i < len(terms) and len(out) <= MAX_PREFIX_TERMS and terms[i].startswith(prefix):
+            out.append(terms[i])
+            i += 1
+        return out
+
+    def _sorted_delta_terms(self) -> List[str]:
+        if self._delta_terms_dirty:
+            self._delta_terms = sorted(self._delta)
+            self._delta_terms_dirty = False
+        return self._delta_terms
+
+    @staticmethod
+    def _intersect(postings: List[_Postings]) -> List[int]:
+        # Start from the shortest list; probe much longer lists by binary
+        # search, and scan comparable ones with a C-level set intersection
+        postings = sorted(postings, key=len)
+        result = set(postings[0])
+        for p in postings[1:]:
+            if not result:
+                break
+            if len(p) > 32 * len(result):
+                result = {i for i in result if i in p}
+            else:
+                result = result.intersection(p)
+        return sorted(result)
+
+    @staticmethod
+    def _union(postings: Iterable) -> List[int]:
+        merged = set()
+        for p in postings:
+            merged.update(p)
+        return sorted(merged)
+
+    def _seg_postings(self, term: str) -> Optional[memoryview]:
+        entry = self._seg_entries.get(term)
+        if entry is None:
+            return None
+        start, count = entry
+        return self._seg_ids[start:start + count]
+
+    def _load_segment(self):
+        self._seg_docs = 0
+        table = self._read_term_table(self._seg_path)
+        if table is not None:
+            self._map_segment(table)
+
+    @staticmethod
+    def _read_term_table(path: str) -> Optional[tuple]:
+        """(terms, entries, docs covered, postings offset) of a segment file, or None."""
+        if not os.path.exists(path) or os.path.getsize(path) < SEG_HEADER.size:
+            return None
+        with open(path, "rb") as f:
+            magic, n_terms, n_docs, postings_off = SEG_HEADER.unpack(f.read(SEG_HEADER.size))
+            if magic != SEG_MAGIC:
+                return None
+            blob = f.read(postings_off - SEG_HEADER.size)
+
+        terms, entries = [], {}
+        pos = 0
+        for _ in range(n_terms):
+            (length,) = TERM_LEN.unpack_from(blob, pos)
+            pos += TERM_LEN.size
+            term = blob[pos:pos + length].decode("utf-8")
+            pos += length
+            entries[term] = TERM_ENTRY.unpack_from(blob, pos)
+            pos += TERM_ENTRY.size
+            terms.append(term)
+        return terms, entries, n_docs, postings_off
+
+    def _map_segment(self, table: tuple):
+        terms, entries, n_docs, postings_off = table
+        with open(self._seg_path, "rb") as f:
+            self._seg_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._seg_ids = memoryview(self._seg_map)[postings_off:].cast("I")
+        self._seg_terms = terms
+        self._seg_entries = entries
+        self._seg_docs = n_docs
+        self._indexed = n_docs
+
+    def _close_segment(self):
+        if self._seg_ids is not None:
+            self._seg_ids.release()
+            self._seg_ids = None
+        if self._seg_map is not None:
+            self._seg_map.close()
+            self._seg_map = None
+        self._seg_terms = []
+        self._seg_entries = {}
+
+    def _replay_log(self):
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write
+                # Only replay contiguous ids newer than the segment
+                if entry["id"] == self._indexed:
+                    self._add(entry["id"], entry["terms"])
+
+
+# Singleton
+_index: Optional[StoryIndex] = None
+
+def get_search_index(background: bool = False) -> StoryIndex:
+    """The shared index, kept beside the shared archive; the first caller decides whether it has a worker."""
+    global _index
+    if _index is None:
+        archive = get_archive()
+        _index = StoryIndex(archive, archive.directory, background=background)
+    return _index
+
+
+def close_search_index():
+    """Stop the shared index's worker and close its files, if it was opened."""
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m data.search",
+                                     description="Maintain or query the MadVerse story index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="re-index every archived story")
+    sub.add_parser("compact", help="merge recent stories into the segment file")
+    q = sub.add_parser("query", help="print ids of stories matching a query")
+    q.add_argument("query", nargs="+")
+    args = parser.parse_args(argv)
+
+    index = get_search_index()
+    if args.command != "rebuild":
+        index.sync()
+    if args.command == "rebuild":
+        index.rebuild()
+        print(f"Indexed {len(index)} stories.")
+    elif args.command == "compact":
+        index.compact()
+        print(f"Compacted {len(index)} stories.")
+    else:
+        ids, truncated = index.query(" ".join(args.query))
+        print(f"{len(ids)} match(es)")
+        for token in truncated:
+            print(f"note: {token} matched more than {MAX_PREFIX_TERMS} terms; "
+                  f"only the first {MAX_PREFIX_TERMS} were searched")
+        for story_id in ids:
+            print(story_id)
+    index.close()
+    index.archive.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
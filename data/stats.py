@@ -6,12 +6,17 @@ Persists play stats and unlocks achievements.
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+from data.rollups import StatsRollups
 
 
 STATS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                            "data", "stats.json")
 
+# Optional extra achievements, declared as data (see _condition_from_spec)
+ACHIEVEMENTS_FILE = os.path.join(os.path.dirname(STATS_FILE), "achievements.json")
+
 ACHIEVEMENTS = [
     {
         "id": "first_story",
@@ -114,10 +119,88 @@ ACHIEVEMENTS = [
 ]
 
 
+def _condition_from_spec(spec: Dict) -> Callable[[Dict], bool]:
+    """
+    Build an achievement condition from a declarative spec:
+      {"stat": "total_stories", "min": 100}
+      {"genre": "horror", "min": 20}
+      {"word": "banana", "min": 3}
+    """
+    threshold = spec.get("min", 1)
+    if "genre" in spec:
+        genre = spec["genre"]
+        return lambda s: s.get("genre_counts", {}).get(genre, 0) >= threshold
+    if "word" in spec:
+        word = spec["word"].lower()
+        return lambda s: s.get("word_frequency", {}).get(word, 0) >= threshold
+    stat = spec.get("stat", "total_stories")
+    return lambda s: s.get(stat, 0) >= threshold
+
+
+def load_achievement_catalogue(path: str = ACHIEVEMENTS_FILE) -> List[Dict]:
+    """Built-in achievements plus any declared in achievements.json."""
+    catalogue = list(ACHIEVEMENTS)
+    if not os.path.exists(path):
+        return catalogue
+    known = {a["id"] for a in catalogue}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except Exception:
+        return catalogue
+    for entry in entries:
+        try:
+            if entry["id"] in known:
+                continue
+            catalogue.append({
+                "id": entry["id"],
+                "name": entry["name"],
+                "desc": entry.get("desc", ""),
+                "icon": entry.get("icon", "🏅"),
+                "condition": _condition_from_spec(entry.get("condition", {})),
+            })
+            known.add(entry["id"])
+        except (KeyError, TypeError):
+            pass
+    return catalogue
+
+
 class StatsTracker:
+    """
+    Persists play stats and unlocks achievements.
+    Listeners registered with add_listener() are called after every change
+    with (changed_summary_values, newly_unlocked_achievement_ids).
+    """
+
     def __init__(self):
+        self.achievements = load_achievement_catalogue()
         self.data = self._load()
+        self.rollups = StatsRollups(self.data.pop("rollups", None))
         self.session_stories = 0
+        self._listeners: List[Callable[[Dict, List[str]], None]] = []
+        self._top_word: Optional[str] = None
+        self._published = self.get_stats_summary()
+
+    def add_listener(self, listener: Callable[[Dict, List[str]], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict, List[str]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, newly_unlocked: List[Dict]):
+        """Tell listeners which summary values changed since the last call."""
+        summary = self.get_stats_summary()
+        changed = {k: v for k, v in summary.items() if self._published.get(k) != v}
+        self._published = summary
+        if not changed and not newly_unlocked:
+            return
+        unlocked_ids = [a["id"] for a in newly_unlocked]
+        for listener in list(self._listeners):
+            try:
+                listener(changed, unlocked_ids)
+            except Exception:
+                pass
 
     def _load(self) -> Dict:
         os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
@@ -145,19 +228,33 @@ class StatsTracker:
             "session_stories": 0,
             "last_played": None,
             "favorite_genre": "none",
+            "ai_stories": 0,
+            "local_stories": 0,
+            "ai_latency_total": 0.0,
+            "ai_latency_count": 0,
         }
 
     def _save(self):
         data = dict(self.data)
         data["genres_played"] = list(data["genres_played"])
         data["session_stories"] = self.session_stories
+        data["rollups"] = self.rollups.to_dict()
         os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
         with open(STATS_FILE, "w") as f:
             json.dump(data, f, indent=2)
 
-    def record_story(self, genre_id: str, words: Dict[str, str]) -> List[Dict]:
+    def record_story(self, genre_id: str, words: Dict[str, str], is_ai: bool = False,
+                     ai_latency: Optional[float] = None) -> List[Dict]:
         """Record a story play and return newly unlocked achievements."""
         self.data["total_stories"] = self.data.get("total_stories", 0) + 1
+        if is_ai:
+            self.data["ai_stories"] = self.data.get("ai_stories", 0) + 1
+        else:
+            self.data["local_stories"] = self.data.get("local_stories", 0) + 1
+        if ai_latency is not None:
+            self.data["ai_latency_total"] = self.data.get("ai_latency_total", 0.0) + ai_latency
+            self.data["ai_latency_count"] = self.data.get("ai_latency_count", 0) + 1
+        self.rollups.add(genre_id, is_ai, ai_latency)
         self.session_stories += 1
         self.data["session_stories"] = self.session_stories
         self.data["last_played"] = datetime.now().isoformat()
@@ -178,23 +275,27 @@ class StatsTracker:
             if word.strip():
                 word_list.append(word.lower())
                 freq[word.lower()] = freq.get(word.lower(), 0) + 1
+                self._bump_top_word(word.lower(), freq)
         self.data["all_words_used"] = word_list[-500:]  # keep last 500
         self.data["word_frequency"] = freq
 
         newly_unlocked = self._check_achievements()
         self._save()
+        self._notify(newly_unlocked)
         return newly_unlocked
 
     def record_save(self):
         self.data["stories_saved"] = self.data.get("stories_saved", 0) + 1
         newly_unlocked = self._check_achievements()
         self._save()
+        self._notify(newly_unlocked)
         return newly_unlocked
 
     def record_regeneration(self):
         self.data["regenerations"] = self.data.get("regenerations", 0) + 1
         newly_unlocked = self._check_achievements()
         self._save()
+        self._notify(newly_unlocked)
         return newly_unlocked
 
     def _check_achievements(self) -> List[Dict]:
@@ -204,7 +305,7 @@ class StatsTracker:
         check_data = dict(self.data)
         check_data["session_stories"] = self.session_stories
 
-        for ach in ACHIEVEMENTS:
+        for ach in self.achievements:
             if ach["id"] not in unlocked:
                 try:
                     if ach["condition"](check_data):
@@ -220,7 +321,16 @@ class StatsTracker:
         freq = self.data.get("word_frequency", {})
         if not freq:
             return "none yet"
-        return max(freq, key=freq.get)
+        top = self._top_word
+        if top is None or top not in freq:
+            top = self._top_word = max(freq, key=freq.get)
+        return top
+
+    def _bump_top_word(self, word: str, freq: Dict[str, int]):
+        """Keep the most-used word current without rescanning every word."""
+        top = self._top_word
+        if top is None or freq[word] > freq.get(top, 0):
+            self._top_word = word
 
     def get_stats_summary(self) -> Dict:
         return {
@@ -231,14 +341,24 @@ class StatsTracker:
             "most_used_word": self.get_most_used_word(),
             "genres_played": len(self.data.get("genres_played", set())),
             "achievements_unlocked": len(self.data.get("unlocked_achievements", [])),
-            "total_achievements": len(ACHIEVEMENTS),
+            "total_achievements": len(self.achievements),
+            "ai_stories": self.data.get("ai_stories", 0),
+            "local_stories": self.data.get("local_stories", 0),
+            "avg_ai_latency": self.get_average_ai_latency(),
         }
 
+    def get_average_ai_latency(self) -> Optional[float]:
+        """Mean seconds from AI request to finished story, or None if never used."""
+        count = self.data.get("ai_latency_count", 0)
+        if not count:
+            return None
+        return self.data.get("ai_latency_total", 0.0) / count
+
     def get_all_achievements(self) -> List[Dict]:
         """Return all achievements with unlock status."""
         unlocked = self.data.get("unlocked_achievements", [])
         result = []
-        for ach in ACHIEVEMENTS:
+        for ach in self.achievements:
             result.append({
                 **ach,
                 "unlocked": ach["id"] in unlocked,
@@ -15,9 +15,12 @@ class StoryEngine:
     Injects humor amplifiers: callbacks, escalation, fourth-wall breaks, mismatches.
     """
 
-    def __init__(self, genre: Genre, words: Dict[str, str]):
+    def __init__(self, genre: Genre, words: Dict[str, str], seed: Optional[int] = None):
         self.genre = genre
         self.words = words
+        # Seeded per story so an archived story can be re-assembled exactly
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self._rng = random.Random(self.seed)
         self._used_callbacks: List[str] = []  # words that have appeared (for callbacks)
         self._story_parts: List[Dict] = []     # assembled story segments
 
@@ -43,15 +46,15 @@ class StoryEngine:
 
         # 2. Middle (2–5 sentences, randomly ordered)
         pool = list(self.genre.middle_templates)
-        random.shuffle(pool)
-        count = random.randint(2, min(5, len(pool)))
+        self._rng.shuffle(pool)
+        count = self._rng.randint(2, min(5, len(pool)))
         selected = pool[:count]
 
         for i, template in enumerate(selected):
             # Occasionally inject escalation prefix
             prefix = ""
-            if i > 0 and random.random() < 0.35:
-                esc = random.choice(self.genre.escalation_lines)
+            if i > 0 and self._rng.random() < 0.35:
+                esc = self._rng.choice(self.genre.escalation_lines)
                 prefix = self._fill(esc) + " "
                 self._add_part(prefix.strip(), "escalation")
 
@@ -69,8 +72,8 @@ class StoryEngine:
                     self._add_part(cb, "callback")
 
             # Fourth-wall break: ~25% chance per middle sentence
-            if random.random() < 0.25 and self.genre.fourth_wall_lines:
-                fw = random.choice(self.genre.fourth_wall_lines)
+            if self._rng.random() < 0.25 and self.genre.fourth_wall_lines:
+                fw = self._rng.choice(self.genre.fourth_wall_lines)
                 fw_filled = self._fill(fw)
                 self._add_part(fw_filled, "fourth_wall")
 
@@ -86,7 +89,7 @@ class StoryEngine:
             f"Statistics show that {self.words.get('number', '0')}% of readers survived this story.",
             f"The author's feelings about the {self.words.get('object', 'object')} remain unresolved.",
         ]
-        self._add_part(random.choice(final_comments), "author_comment")
+        self._add_part(self._rng.choice(final_comments), "author_comment")
 
         return self._story_parts
 
@@ -97,7 +100,7 @@ class StoryEngine:
     def _pick_and_fill(self, templates: List[str]) -> str:
         if not templates:
             return ""
-        template = random.choice(templates)
+        template = self._rng.choice(templates)
         return self._fill(template)
 
     def _fill(self, template: str) -> str:
@@ -116,7 +119,7 @@ class StoryEngine:
     def _dramatic_capitalize(self, text: str) -> str:
         """Randomly capitalize the user's noun for dramatic effect (30% chance)."""
         noun = self.words.get('noun', '')
-        if noun and random.random() < 0.3 and noun.lower() in text.lower():
+        if noun and self._rng.random() < 0.3 and noun.lower() in text.lower():
             text = re.sub(re.escape(noun), noun.upper(), text, count=1, flags=re.IGNORECASE)
         return text
 
@@ -124,7 +127,7 @@ class StoryEngine:
         """Build a callback joke referencing a previously used word."""
         if not self._used_callbacks:
             return None
-        word = random.choice(self._used_callbacks)
+        word = self._rng.choice(self._used_callbacks)
         templates = [
             f"(Yes, that {word} again. It keeps coming up. Nobody knows why.)",
             f"The {word}. Always the {word}. We should have seen this coming.",
@@ -132,7 +135,7 @@ class StoryEngine:
             f"It bears repeating: the {word} was there before any of this started.",
             f"The {word} had been quietly {self.words.get('verb2', 'waiting')} this entire time.",
         ]
-        return random.choice(templates)
+        return self._rng.choice(templates)
 
     def _add_part(self, text: str, part_type: str):
         if not text.strip():
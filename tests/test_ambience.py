@@ -0,0 +1,83 @@
+"""Genre ambience: seamless generators, cross-fades and the feeder thread."""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio.ambience import (MAX_BEDS, AmbienceEngine, AmbienceGenerator,  # noqa: E402
+                            render_ambience)
+
+RATE = 8000
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_generator_chunks_join_seamlessly():
+    whole = AmbienceGenerator("horror", RATE).render(1024)
+    chunked = AmbienceGenerator("horror", RATE)
+    parts = np.concatenate([chunked.render(300), chunked.render(724)])
+    assert np.allclose(whole, parts)
+
+
+def test_offline_render_is_reproducible():
+    plan = [(0.0, "scifi"), (0.5, "romance")]
+    first = render_ambience(plan, 1.0, RATE)
+    assert first == render_ambience(plan, 1.0, RATE)
+    assert len(first) == 2 * RATE
+    assert any(first)
+
+
+def test_fade_to_silence_drops_the_bed():
+    engine = AmbienceEngine(RATE, chunk_frames=256, crossfade=0.1)
+    engine.set_genre("fantasy")
+    assert np.abs(engine.render(RATE // 2)).max() > 0
+    assert engine.genre_id == "fantasy"
+    engine.set_genre(None)
+    engine.render(RATE // 5)                    # longer than the fade
+    assert engine.genre_id is None
+    assert engine._beds == []
+    assert not engine.render(256).any()
+
+
+def test_rapid_switches_keep_at_most_max_beds():
+    engine = AmbienceEngine(RATE, crossfade=1.0)
+    for genre in ("horror", "scifi", "fantasy", "romance", "ai"):
+        engine.set_genre(genre)
+        engine.render(64)
+    assert len(engine._beds) <= MAX_BEDS
+    assert engine.genre_id == "ai"
+
+
+def test_feeder_only_runs_while_there_is_something_to_play():
+    engine = AmbienceEngine(RATE, chunk_frames=256, ring_frames=1024, crossfade=0.05)
+    engine.start()
+    try:
+        time.sleep(0.05)
+        assert engine._write_pos == 0 and engine.is_silent()
+
+        engine.set_genre("existential")
+        assert _wait_for(lambda: engine._write_pos >= 1024 - 256)
+        assert not engine.is_silent()
+        assert np.abs(engine.read(512)).max() > 0
+
+        engine.set_genre(None)
+
+        def drained():
+            engine.read(256)
+            return engine.is_silent()
+        assert _wait_for(drained)
+        written = engine._write_pos
+        time.sleep(0.05)
+        assert engine._write_pos == written     # feeder asleep, not writing silence
+    finally:
+        engine.stop()
+    assert engine._thread is None
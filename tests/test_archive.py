@@ -0,0 +1,104 @@
+"""StoryArchive storage, and recovery from writes torn by a crash."""
+
+import os
+
+import pytest
+
+from data.archive import INDEX_ENTRY, INDEX_NAME, JOURNAL_NAME, StoryArchive
+
+
+def _record(i):
+    return {"genre": "horror", "words": {"noun": f"word{i}"}, "parts": []}
+
+
+def _abandon(archive):
+    """Drop the archive's file handles without sealing anything, as a crash would."""
+    for f in (archive._journal_f, archive._data_f, archive._index_f):
+        f.close()
+
+
+def test_records_round_trip_across_blocks_and_reopen(tmp_path):
+    archive = StoryArchive(str(tmp_path), block_bytes=256)
+    ids = [archive.append(_record(i)) for i in range(50)]
+    assert ids == list(range(50))
+    assert archive._sealed > 0 and archive._pending    # some sealed, some journalled
+    assert archive.get(7)["words"]["noun"] == "word7"
+    archive.close()
+
+    archive = StoryArchive(str(tmp_path), block_bytes=256)
+    assert len(archive) == 50
+    assert [r["id"] for r in archive.iter_range(45)] == [45, 46, 47, 48, 49]
+    assert archive.get(49)["words"]["noun"] == "word49"
+    archive.close()
+
+
+def test_get_out_of_range(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    archive.append(_record(0))
+    with pytest.raises(IndexError):
+        archive.get(1)
+    with pytest.raises(IndexError):
+        archive.get(-1)
+    archive.close()
+
+
+def test_journalled_records_survive_a_crash(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    for i in range(3):
+        archive.append(_record(i))
+    _abandon(archive)
+
+    archive = StoryArchive(str(tmp_path))
+    assert len(archive) == 3
+    assert archive.get(2)["words"]["noun"] == "word2"
+    archive.close()
+
+
+def test_torn_journal_record_is_dropped(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    for i in range(3):
+        archive.append(_record(i))
+    _abandon(archive)
+    journal = os.path.join(str(tmp_path), JOURNAL_NAME)
+    with open(journal, "r+b") as f:
+        f.truncate(os.path.getsize(journal) - 5)
+
+    archive = StoryArchive(str(tmp_path))
+    assert len(archive) == 2
+    assert archive.append(_record(9)) == 2     # ids carry on without a gap
+    archive.close()
+
+
+def test_torn_index_entry_is_truncated(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    for i in range(4):
+        archive.append(_record(i))
+    archive.close()
+    index = os.path.join(str(tmp_path), INDEX_NAME)
+    with open(index, "ab") as f:
+        f.write(b"\x01" * (INDEX_ENTRY.size // 2))
+
+    archive = StoryArchive(str(tmp_path))
+    assert len(archive) == 4
+    assert os.path.getsize(index) == 4 * INDEX_ENTRY.size
+    assert archive.get(3)["words"]["noun"] == "word3"
+    archive.close()
+
+
+def test_records_sealed_before_the_journal_reset_are_not_duplicated(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    for i in range(3):
+        archive.append(_record(i))
+    journal = os.path.join(str(tmp_path), JOURNAL_NAME)
+    with open(journal, "rb") as f:
+        stale = f.read()
+    archive.flush()
+    _abandon(archive)
+    # Crash between sealing the block and truncating the journal
+    with open(journal, "wb") as f:
+        f.write(stale)
+
+    archive = StoryArchive(str(tmp_path))
+    assert len(archive) == 3
+    assert archive._pending == []
+    archive.close()
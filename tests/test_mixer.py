@@ -0,0 +1,99 @@
+"""Mixer voice pool: stealing, rate limits and rendering (headless)."""
+
+from array import array
+
+import pytest
+
+from audio import mixer as mixer_mod
+from audio.mixer import Mixer
+
+RATE = 1000     # small sample rate keeps the sample-clock arithmetic readable
+
+
+def _pcm(value, frames):
+    return array("h", [value] * frames).tobytes()
+
+
+def _samples(pcm):
+    return list(array("h", pcm))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def mixer(request, monkeypatch):
+    if request.param == "numpy" and not mixer_mod.HAS_NUMPY:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(mixer_mod, "HAS_NUMPY", request.param == "numpy")
+    m = Mixer(voices=2, sample_rate=RATE, rate_limits={"tick": 0.1})
+    m.add_sound("long", _pcm(100, 50))
+    m.add_sound("short", _pcm(1000, 5))
+    m.add_sound("tick", _pcm(10, 5))
+    return m
+
+
+def test_voices_are_summed_and_freed(mixer):
+    mixer.play("long")
+    mixer.play("short", gain=0.5)
+    out = _samples(mixer.render(10))
+    assert out[:5] == [600] * 5 and out[5:] == [100] * 5
+    assert mixer.active_voices() == 1
+    mixer.render(40)
+    assert mixer.active_voices() == 0
+    assert mixer.is_idle()
+
+
+def test_oldest_voice_is_stolen_when_the_pool_is_full(mixer):
+    first = mixer.play("long")
+    mixer.render(1)
+    second = mixer.play("long")
+    mixer.render(1)
+    assert mixer.play("short") == first
+    stats = mixer.stats()
+    assert stats["stolen"] == 1 and stats["plays"] == 3
+    assert mixer.active_voices() == 2 and second != first
+
+
+def test_rate_limit_uses_the_sample_clock(mixer):
+    assert mixer.play("tick") is not None
+    assert mixer.play("tick") is None               # same instant
+    mixer.render(int(0.1 * RATE) - 1)
+    assert mixer.play("tick") is None               # just under the gap
+    mixer.render(1)
+    assert mixer.play("tick") is not None
+    assert mixer.stats()["rate_limited"] == 2
+    assert mixer.play("long") is not None           # unlimited sounds always start
+
+
+def test_unknown_sound_and_clipping(mixer):
+    assert mixer.play("missing") is None
+    mixer.add_sound("loud", _pcm(30000, 4))
+    mixer.play("loud")
+    mixer.play("loud")
+    assert _samples(mixer.render(4)) == [32767] * 4
+
+
+def test_master_gain_and_stop_all(mixer):
+    mixer.master_gain = 0.5
+    mixer.play("long")
+    assert _samples(mixer.render(2)) == [50, 50]
+    mixer.stop_all()
+    assert _samples(mixer.render(2)) == [0, 0]
+
+
+def test_idle_waits_for_a_silent_stream():
+    pytest.importorskip("numpy")
+    import numpy as np
+
+    class Stream:
+        silent = False
+
+        def read(self, frames):
+            return np.zeros(frames, dtype=np.float32)
+
+        def is_silent(self):
+            return self.silent
+
+    m = Mixer(voices=1, sample_rate=RATE)
+    m.stream = Stream()
+    assert not m.is_idle()
+    m.stream.silent = True
+    assert m.is_idle()
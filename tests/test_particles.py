@@ -0,0 +1,75 @@
+"""ParticleSystem struct-of-arrays store, on the NumPy and pure-Python paths."""
+
+import pytest
+
+from ui import particles as particles_mod
+from ui.particles import CIRCLE, HEART, ParticleSystem
+
+
+@pytest.fixture(params=["numpy", "python"])
+def make(request, monkeypatch):
+    if request.param == "numpy" and not particles_mod.HAS_NUMPY:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(particles_mod, "HAS_NUMPY", request.param == "numpy")
+    return lambda capacity=8: ParticleSystem(capacity, seed=1)
+
+
+def _spawn(ps, n, life=(3, 3), **kw):
+    args = dict(x=10.0, y=20.0, vx=1.0, vy=0.0, life=life, size=2.0, color=1, shape=CIRCLE)
+    args.update(kw)
+    return ps.spawn(n, **args)
+
+
+def test_spawn_fills_free_slots_up_to_the_limit(make):
+    ps = make(8)
+    assert _spawn(ps, 5) == 5
+    assert len(ps) == 5
+    ps.limit = 6
+    assert _spawn(ps, 5) == 1
+    assert _spawn(ps, 1) == 0
+    assert sorted(int(i) for i in ps.live()) == list(range(6))
+
+
+def test_ranges_are_drawn_per_particle(make):
+    ps = make(64)
+    _spawn(ps, 64, x=(0.0, 100.0), life=(5, 9), shape=HEART)
+    xs, shapes = ps.columns(ps.live(), "x", "shape")
+    assert all(0.0 <= x <= 100.0 for x in xs)
+    assert len(set(round(x, 3) for x in xs)) > 1
+    assert set(shapes) == {HEART}
+    lives = ps.columns(ps.live(), "life")[0]
+    assert all(5 <= life <= 9 for life in lives)
+
+
+def test_step_integrates_ages_and_frees_slots(make):
+    ps = make(4)
+    _spawn(ps, 2, life=(2, 2))
+    ps.step(gravity=0.5)
+    xs, ys, vys = ps.columns(ps.live(), "x", "y", "vy")
+    assert xs == [11.0, 11.0] and ys == [20.0, 20.0] and vys == [0.5, 0.5]
+    assert ps.alphas(ps.live()) == [127, 127]
+    ps.step()
+    assert len(ps) == 0 and len(ps.live()) == 0
+    assert ps.bounds() is None
+    # Freed slots are reused
+    assert _spawn(ps, 4) == 4
+
+
+def test_dead_slots_stay_put(make):
+    ps = make(4)
+    _spawn(ps, 1, life=(1, 1))
+    _spawn(ps, 1, life=(5, 5), x=50.0)
+    ps.step()
+    assert len(ps) == 1
+    before = ps.columns([0], "x")[0]
+    ps.step()
+    assert ps.columns([0], "x")[0] == before    # only live particles move
+
+
+def test_bounds_and_clear(make):
+    ps = make(8)
+    _spawn(ps, 1, x=0.0, y=5.0)
+    _spawn(ps, 1, x=30.0, y=-5.0)
+    assert ps.bounds(pad=1.0) == (-1.0, -6.0, 31.0, 6.0)
+    ps.clear()
+    assert len(ps) == 0 and ps.bounds() is None
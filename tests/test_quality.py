@@ -0,0 +1,107 @@
+"""Adaptive background quality: hysteresis between levels and particle caps."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from ui.background import (DEGRADE_FRAMES, FRAME_BUDGET_MS, QUALITY_LEVELS,  # noqa: E402
+                           RECOVER_FRAMES, AnimatedBackground)
+from ui.simulation import EFFECT_POPULATION, ParticleSimulation  # noqa: E402
+
+OVER = FRAME_BUDGET_MS * 1.5
+BAND = FRAME_BUDGET_MS * 0.75       # between half the budget and the budget
+UNDER = FRAME_BUDGET_MS * 0.25
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def bg(app):
+    bg = AnimatedBackground(seed=1, threaded=False)
+    yield bg
+    bg.simulation.stop()
+    bg.deleteLater()
+
+
+def _frames(bg, ms, n):
+    """Feed n frames that each took ms (the moving average stays at ms)."""
+    bg.frame_ms = ms
+    bg.update_ms, bg.paint_ms = ms, 0.0
+    for _ in range(n):
+        bg._adapt_quality()
+
+
+def test_steps_down_after_sustained_overrun(bg):
+    _frames(bg, OVER, DEGRADE_FRAMES - 1)
+    assert bg.quality_level == 0
+    _frames(bg, OVER, 1)
+    assert bg.quality_level == 1
+
+
+def test_frames_inside_the_band_reset_both_counters(bg):
+    _frames(bg, OVER, DEGRADE_FRAMES - 1)
+    _frames(bg, BAND, 1)
+    _frames(bg, OVER, DEGRADE_FRAMES - 1)
+    assert bg.quality_level == 0
+
+    bg.set_quality(2)
+    _frames(bg, UNDER, RECOVER_FRAMES - 1)
+    _frames(bg, BAND, 50)
+    _frames(bg, UNDER, RECOVER_FRAMES - 1)
+    assert bg.quality_level == 2
+
+
+def test_steps_up_only_after_long_headroom(bg):
+    bg.set_quality(2)
+    _frames(bg, UNDER, RECOVER_FRAMES - 1)
+    assert bg.quality_level == 2
+    _frames(bg, UNDER, 1)
+    assert bg.quality_level == 1
+    _frames(bg, UNDER, RECOVER_FRAMES)
+    assert bg.quality_level == 0
+    _frames(bg, UNDER, RECOVER_FRAMES)
+    assert bg.quality_level == 0
+
+
+def test_level_is_clamped_and_adaptive_can_be_disabled(bg):
+    _frames(bg, OVER, DEGRADE_FRAMES * (len(QUALITY_LEVELS) + 2))
+    assert bg.quality_level == len(QUALITY_LEVELS) - 1
+    bg.set_quality(99)
+    assert bg.quality_level == len(QUALITY_LEVELS) - 1
+
+    bg.set_quality(0)
+    bg.adaptive = False
+    _frames(bg, OVER, DEGRADE_FRAMES * 3)
+    assert bg.quality_level == 0
+
+
+@pytest.mark.parametrize("effect", sorted(EFFECT_POPULATION))
+def test_each_level_caps_particles_at_its_share(effect):
+    for level, quality in enumerate(QUALITY_LEVELS):
+        sim = ParticleSimulation(seed=3, threaded=False)
+        sim.set_quality(quality["particles"], quality["spawn"])
+        sim.configure(effect)
+        peak = 0
+        for _ in range(400):
+            sim.request_step(800, 600)
+            peak = max(peak, len(sim.latest()))
+        if level == 0:
+            assert sim.particles.limit == sim.particles.capacity
+            assert peak > 0
+        else:
+            cap = max(1, int(EFFECT_POPULATION[effect] * quality["particles"]))
+            assert sim.particles.limit == cap
+            assert peak <= cap
+
+
+def test_effects_without_a_population_are_uncapped():
+    sim = ParticleSimulation(seed=3, threaded=False)
+    sim.set_quality(QUALITY_LEVELS[-1]["particles"], QUALITY_LEVELS[-1]["spawn"])
+    sim.configure("flicker")
+    assert sim.particles.limit == sim.particles.capacity
@@ -0,0 +1,88 @@
+"""RingRollup windows and LTTB downsampling."""
+
+from data.rollups import RingRollup, StatsRollups, lttb
+
+BASE = 1_700_000_000.0      # any fixed instant; buckets are relative to it
+
+
+def _rollup(size=4):
+    rollup = RingRollup(10, size)
+    return rollup, rollup.bucket_of(BASE)
+
+
+def test_series_covers_the_window_ending_now():
+    rollup, b0 = _rollup()
+    rollup.add(BASE, "horror")
+    rollup.add(BASE + 1, "horror", is_ai=True)
+    rollup.add(BASE + 20, "romance")
+    series = rollup.series(now=BASE + 20)
+    assert [b for b, _ in series] == [b0 - 1, b0, b0 + 1, b0 + 2]
+    assert [v for _, v in series] == [0, 2, 0, 1]
+    assert [v for _, v in rollup.series("ai_stories", now=BASE + 20)] == [0, 1, 0, 0]
+    assert [v for _, v in rollup.series(genre_id="romance", now=BASE + 20)] == [0, 0, 0, 1]
+
+
+def test_buckets_leaving_the_window_are_cleared():
+    rollup, b0 = _rollup()
+    rollup.add(BASE, "horror")
+    rollup.add(BASE + 40, "horror")           # one full lap later, same slot
+    assert rollup.series(now=BASE + 40) == [(b0 + 1, 0), (b0 + 2, 0), (b0 + 3, 0), (b0 + 4, 1)]
+    # Reading far ahead shows an empty window without touching the data
+    assert all(v == 0 for _, v in rollup.series(now=BASE + 1000))
+    assert rollup.series(now=BASE + 40)[-1] == (b0 + 4, 1)
+
+
+def test_stories_older_than_the_window_are_dropped():
+    rollup, b0 = _rollup()
+    rollup.add(BASE + 100, "horror")
+    rollup.add(BASE, "horror")                # 10 buckets back, outside a 4-bucket window
+    assert sum(v for _, v in rollup.series(now=BASE + 100)) == 1
+    rollup.add(BASE + 80, "horror")           # still inside
+    assert sum(v for _, v in rollup.series(now=BASE + 100)) == 2
+
+
+def test_average_latency_metric():
+    rollup, _ = _rollup()
+    rollup.add(BASE, "ai", is_ai=True, ai_latency=2.0)
+    rollup.add(BASE, "ai", is_ai=True, ai_latency=4.0)
+    assert rollup.series("ai_latency_avg", now=BASE)[-1][1] == 3.0
+
+
+def test_round_trip_and_resized_window():
+    rollup, b0 = _rollup()
+    rollup.add(BASE, "horror")
+    copy = RingRollup(10, 4)
+    copy.load(rollup.to_dict())
+    assert copy.series(now=BASE) == rollup.series(now=BASE)
+    assert copy.series(genre_id="horror", now=BASE)[-1] == (b0, 1)
+
+    resized = RingRollup(10, 8)
+    resized.load(rollup.to_dict())
+    assert resized.last_bucket is None
+
+
+def test_week_buckets_start_on_monday():
+    rollups = StatsRollups()
+    rollups.add("horror", ts=BASE)
+    week = rollups["week"]
+    assert week.bucket_start(week.bucket_of(BASE)).weekday() == 0
+    assert rollups["day"].series(now=BASE)[-1][1] == 1
+    assert StatsRollups(rollups.to_dict())["hour"].series(now=BASE)[-1][1] == 1
+
+
+def test_lttb_passthrough():
+    points = [(i, i * i) for i in range(10)]
+    assert lttb(points, 10) == points
+    assert lttb(points, 50) == points
+    assert lttb(points, 2) == points
+
+
+def test_lttb_keeps_ends_and_spikes():
+    points = [(i, 0.0) for i in range(1000)]
+    points[437] = (437, 50.0)
+    points[811] = (811, -20.0)
+    sampled = lttb(points, 30)
+    assert len(sampled) == 30
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (437, 50.0) in sampled and (811, -20.0) in sampled
+    assert [x for x, _ in sampled] == sorted(x for x, _ in sampled)
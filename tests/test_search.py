@@ -0,0 +1,119 @@
+"""StoryIndex: incremental sync, compaction, query syntax and the background worker."""
+
+import threading
+
+import pytest
+
+from data.archive import StoryArchive
+from data.search import MAX_PREFIX_TERMS, StoryIndex, story_terms, tokenize
+
+
+def _story(genre, noun, text="", part_type="opening"):
+    return {"genre": genre, "words": {"noun": noun},
+            "parts": [{"type": part_type, "text": text}]}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    archive.append(_story("horror", "banana", "The ice was cold"))           # 0
+    archive.append(_story("romance", "ice-cream", "Sweet nothings"))        # 1
+    archive.append(_story("horror", "pear", "ice cream at midnight", "callback"))  # 2
+    archive.append(_story("scifi", "bandana", "A ship"))                    # 3
+    yield archive
+    archive.close()
+
+
+@pytest.fixture
+def index(archive, tmp_path):
+    index = StoryIndex(archive, str(tmp_path))
+    index.sync()
+    yield index
+    index.close()
+
+
+def test_story_terms_are_field_qualified():
+    terms = story_terms(_story("horror", "Banana!", "Run", "callback"))
+    assert {"genre:horror", "word:banana", "any:banana", "callback:run", "type:callback"} <= set(terms)
+    assert tokenize("Ice-Cream, now") == ["ice", "cream", "now"]
+
+
+def test_sync_indexes_only_new_stories(archive, index):
+    assert len(index) == 4
+    assert index.sync() == 0
+    archive.append(_story("ai", "banana"))
+    assert index.sync(limit=1) == 1
+    assert index.search("banana") == [0, 4]
+
+
+def test_query_syntax(index):
+    assert index.search("banana") == [0]
+    assert index.search("genre:horror") == [0, 2]
+    assert index.search("genre:horror ice") == [0, 2]
+    assert index.search("type:callback") == [2]
+    assert index.search("banana OR pear") == [0, 2]
+    assert index.search("ban*") == [0, 3]
+    assert index.search("word:ban*") == [0, 3]
+    assert index.search("nothing") == []
+    assert index.search("") == []
+
+
+def test_multi_word_token_matches_all_its_words(index):
+    assert index.search("ice") == [0, 1, 2]
+    assert index.search("ice-cream") == [1, 2]
+    assert index.search("ice-cre*") == [1, 2]
+    assert index.search("word:ice-cream") == [1]
+
+
+def test_compaction_keeps_results_and_reopens(archive, index, tmp_path):
+    index.compact()
+    assert index._delta == {}
+    assert index.search("genre:horror") == [0, 2]
+    assert index.search("ban*") == [0, 3]
+    archive.append(_story("horror", "banana"))
+    index.sync()
+    assert index.search("banana") == [0, 4]
+    index.close()
+
+    reopened = StoryIndex(archive, str(tmp_path))
+    assert len(reopened) == 5           # segment plus the replayed log
+    assert reopened.search("genre:horror") == [0, 2, 4]
+    assert reopened.search("ice-cream") == [1, 2]
+    assert reopened.search("banana") == [0, 4]
+    reopened.close()
+
+
+def test_prefix_expansion_is_capped_and_reported(tmp_path):
+    archive = StoryArchive(str(tmp_path))
+    for i in range(MAX_PREFIX_TERMS + 10):
+        archive.append(_story("ai", f"w{i:04d}"))
+    index = StoryIndex(archive, str(tmp_path))
+    index.sync()
+
+    result = index.query("word:w*")
+    assert result.truncated == ["word:w*"]
+    assert result.ids == list(range(MAX_PREFIX_TERMS))
+    assert index.query("word:w00*").truncated == []
+    assert len(index.lookup("w", field="word", prefix=True)) == MAX_PREFIX_TERMS
+
+    index.compact()                     # the cap holds across segment and delta
+    archive.append(_story("ai", "w9999"))
+    index.sync()
+    assert len(index.query("word:w*").ids) == MAX_PREFIX_TERMS
+    index.close()
+    archive.close()
+
+
+def test_background_worker_syncs_and_notifies(archive, tmp_path):
+    index = StoryIndex(archive, str(tmp_path), background=True)
+    synced = threading.Event()
+    index.add_listener(lambda indexed: synced.set())
+    assert synced.wait(5)
+    assert index.search("banana") == [0]
+
+    synced.clear()
+    archive.append(_story("horror", "banana"))
+    index.request_sync()
+    assert synced.wait(5)
+    assert index.search("banana") == [0, 4]
+    index.close()
@@ -0,0 +1,160 @@
+"""
+MadVerse Animation Clock
+One shared timer for every periodic UI animation. Subscribers are ticked
+only while their widget is actually on screen (visible, window not
+minimized, window exposed), and the timer stops completely when no
+subscriber is live, so an idle window costs no wake-ups.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from PyQt6.QtWidgets import QWidget
+
+
+# Events after which a subscriber may have gone on or off screen
+_VISIBILITY_EVENTS = {
+    QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange,
+    QEvent.Type.Expose, QEvent.Type.ParentChange,
+}
+
+
+def _now_ms() -> float:
+    return time.monotonic() * 1000
+
+
+class _Subscription:
+    __slots__ = ("widget", "callback", "interval", "due", "live")
+
+    def __init__(self, widget: QWidget, callback: Callable[[], None], interval: int):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.due = 0.0
+        self.live = False
+
+
+class AnimationClock(QObject):
+    """
+    subscribe(widget, callback, interval_ms) calls callback every interval_ms
+    while widget is on screen. Ticks are driven by a single-shot timer armed
+    for the earliest due subscriber.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subs: List[_Subscription] = []
+        self._watched = set()           # ids of widgets whose destroyed() we follow
+        self._refresh_pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    # ─── SUBSCRIPTIONS ────────────────────────────────────
+
+    def subscribe(self, widget: QWidget, callback: Callable[[], None], interval_ms: int):
+        """Tick callback every interval_ms while widget is on screen."""
+        self.unsubscribe(widget, callback)
+        self._subs.append(_Subscription(widget, callback, interval_ms))
+        self._watch(widget)
+        if id(widget) not in self._watched:
+            self._watched.add(id(widget))
+            widget.destroyed.connect(lambda _=None, w_id=id(widget): self._forget(w_id))
+        self._refresh()
+
+    def unsubscribe(self, widget: QWidget, callback: Optional[Callable[[], None]] = None):
+        """Stop ticking callback (or every callback) registered for widget."""
+        self._subs = [s for s in self._subs
+                      if not (s.widget is widget and (callback is None or s.callback == callback))]
+        self._schedule()
+
+    def is_subscribed(self, widget: QWidget, callback: Callable[[], None]) -> bool:
+        return any(s.widget is widget and s.callback == callback for s in self._subs)
+
+    def live_count(self) -> int:
+        """Subscribers currently being ticked."""
+        return sum(1 for s in self._subs if s.live)
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    # ─── VISIBILITY ───────────────────────────────────────
+
+    def _watch(self, widget: QWidget):
+        widget.installEventFilter(self)
+        window = widget.window()
+        if window is not widget:
+            window.installEventFilter(self)
+        handle = window.windowHandle()
+        if handle is not None:
+            handle.installEventFilter(self)
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() in _VISIBILITY_EVENTS and not self._refresh_pending:
+            # Coalesce the burst of events a screen switch produces
+            self._refresh_pending = True
+            QTimer.singleShot(0, self._refresh)
+        return False
+
+    @staticmethod
+    def _on_screen(widget: QWidget) -> bool:
+        if not widget.isVisible():
+            return False
+        window = widget.window()
+        if window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _refresh(self):
+        self._refresh_pending = False
+        now = _now_ms()
+        for sub in self._subs:
+            if not sub.live:
+                # The widget may have been reparented since it subscribed, or
+                # its window may only now have a handle
+                self._watch(sub.widget)
+            live = self._on_screen(sub.widget)
+            if live and not sub.live:
+                sub.due = now + sub.interval
+            sub.live = live
+        self._schedule()
+
+    def _forget(self, widget_id: int):
+        self._watched.discard(widget_id)
+        self._subs = [s for s in self._subs if id(s.widget) != widget_id]
+        try:
+            self._schedule()
+        except RuntimeError:
+            pass  # application teardown: the clock's timer is already gone
+
+    # ─── TICKING ──────────────────────────────────────────
+
+    def _schedule(self):
+        live = [s.due for s in self._subs if s.live]
+        if not live:
+            self._timer.stop()
+            return
+        self._timer.start(max(0, int(min(live) - _now_ms())))
+
+    def _tick(self):
+        now = _now_ms()
+        for sub in list(self._subs):
+            if sub.live and sub.due <= now + 1 and sub in self._subs:
+                # Skip missed ticks rather than bursting to catch up
+                sub.due += sub.interval
+                if sub.due <= now:
+                    sub.due = now + sub.interval
+                sub.callback()
+        self._schedule()
+
+
+# Singleton
+_clock: Optional[AnimationClock] = None
+
+def get_animation_clock() -> AnimationClock:
+    global _clock
+    if _clock is None:
+        _clock = AnimationClock()
+    return _clock
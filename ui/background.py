@@ -3,160 +3,221 @@ MadVerse Animated Background Widget
 Renders per-genre visual effects: flicker, glitch, sparkle, hearts, footnote, void, matrix.
 """
 
-import math
-import random
+import time
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import QTimer, Qt, QRectF, QPointF
-from PyQt6.QtGui import (QPainter, QColor, QPen, QBrush,
-                          QLinearGradient, QRadialGradient, QFont)
-
-
-class Particle:
-    def __init__(self, x, y, vx, vy, life, color, size, shape="circle"):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.life = life
-        self.max_life = life
-        self.color = color
-        self.size = size
-        self.shape = shape
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.vy += 0.05  # gravity
-
-    @property
-    def alpha(self):
-        return int(255 * (self.life / self.max_life))
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import (QPainter, QColor, QPen, QPixmap,
+                          QLinearGradient, QRadialGradient)
+
+from ui.animation_clock import get_animation_clock
+from ui.particles import CIRCLE, STAR, HEART, CHAR
+from ui.simulation import (ParticleSimulation, FrameSnapshot, EMPTY_FRAME,
+                           PARTICLE_COLORS, GREEN)
+from ui.sprites import GlyphAtlas, ShapeAtlas, draw_circle, draw_star, draw_heart
+
+MATRIX_CHARS = "01アイウエオ☰☷∅∞"
+MATRIX_SIZES = range(8, 15)     # point sizes spawned by the matrix effect
+
+FRAME_MS = 33   # ~30fps
+
+# Effects with something moving; the rest are a single static layer and
+# never tick
+ANIMATED_EFFECTS = {"flicker", "sparkle", "hearts", "matrix", "void"}
+
+# ─── ADAPTIVE QUALITY ─────────────────────────────────────
+# Level 0 is full quality; each level down trades looks for frame time.
+#   particles  — share of the effect's full-quality population allowed to be
+#                live (simulation.EFFECT_POPULATION)
+#   spawn      — multiplier on spawn counts
+#   antialias  — antialiased particle drawing
+#   layer      — resolution of the cached static layer (1.0 = device pixels)
+QUALITY_LEVELS = [
+    {"particles": 1.0,  "spawn": 1.0,  "antialias": True,  "layer": 1.0},
+    {"particles": 0.5,  "spawn": 0.75, "antialias": True,  "layer": 1.0},
+    {"particles": 0.25, "spawn": 0.5,  "antialias": False, "layer": 1.0},
+    {"particles": 0.1,  "spawn": 0.35, "antialias": False, "layer": 0.5},
+]
+
+# Picking up a frame and painting it share the GUI thread, so they get a
+# slice of each frame (simulation runs on its own thread)
+FRAME_BUDGET_MS = 8.0
+# Step down after this many consecutive frames over budget…
+DEGRADE_FRAMES = 10
+# …and back up only after this many frames under half the budget
+RECOVER_FRAMES = 150
+# Smoothing factor for the frame-time moving average
+FRAME_EMA = 0.2
+
+# Largest distance a particle sprite or glyph reaches from its position
+PARTICLE_PAD = 24
+
+# shape → (draw function, smallest size, largest size, quantization step)
+SHAPE_SPRITES = {
+    CIRCLE: (draw_circle, 0.5, 4.0, 0.25),
+    STAR:   (draw_star, 1.0, 5.0, 0.25),
+    HEART:  (draw_heart, 6.0, 20.0, 0.5),
+}
 
 
 class AnimatedBackground(QWidget):
     """
     Full-size background widget that renders animated effects.
     Place this behind all other widgets using lower z-order.
+
+    Each clock tick asks the ParticleSimulation for the next step and picks
+    up the latest completed FrameSnapshot; paintEvent draws only that
+    snapshot. Pass threaded=False to simulate inline (benchmarks).
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, seed: int = None, threaded: bool = True):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
 
         self.effect = "none"
         self.theme = None
-        self.particles: list[Particle] = []
-        self.tick = 0
-        self.flicker_alpha = 255
-        self.glitch_offset = 0
-        self.glitch_active = False
+        self.simulation = ParticleSimulation(seed=seed, threaded=threaded)
+        self._frame: FrameSnapshot = EMPTY_FRAME
+        self._glyphs: GlyphAtlas = None
+        self._sprites: dict = {}  # (shape, palette index) → ShapeAtlas
+
+        # Gradient + static effect layers, pre-rendered for the current
+        # (effect, theme colors, size, device pixel ratio)
+        self._static_layer: QPixmap = None
+        self._static_key = None
+
+        # Area repainted last tick; it must be repainted again to erase it
+        self._dirty = QRect()
+
+        # Frame timing and adaptive quality
+        self.adaptive = True
+        self.quality_level = 0
+        self.update_ms = 0.0
+        self.paint_ms = 0.0
+        self.frame_ms = 0.0                 # moving average of update + paint
+        self._over_budget = 0
+        self._under_budget = 0
+
+    # ─── QUALITY ──────────────────────────────────────────
+
+    @property
+    def frame(self) -> FrameSnapshot:
+        """The snapshot currently on screen."""
+        return self._frame
+
+    @property
+    def quality(self) -> dict:
+        return QUALITY_LEVELS[self.quality_level]
+
+    def set_quality(self, level: int):
+        """Switch quality level (0 = best) and apply its particle limit."""
+        level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self._over_budget = self._under_budget = 0
+        if level == self.quality_level:
+            return
+        self.quality_level = level
+        self.simulation.set_quality(self.quality["particles"], self.quality["spawn"])
+        self._static_layer = None   # layer resolution may have changed
+        self.update()
 
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update)
-        self._timer.start(33)  # ~30fps
+    def _adapt_quality(self):
+        """Step quality down when over budget, and up after sustained headroom."""
+        self.frame_ms += FRAME_EMA * (self.update_ms + self.paint_ms - self.frame_ms)
+        if not self.adaptive:
+            return
+        if self.frame_ms > FRAME_BUDGET_MS:
+            self._under_budget = 0
+            self._over_budget += 1
+            if self._over_budget >= DEGRADE_FRAMES and self.quality_level < len(QUALITY_LEVELS) - 1:
+                self.set_quality(self.quality_level + 1)
+        elif self.frame_ms < FRAME_BUDGET_MS / 2:
+            self._over_budget = 0
+            self._under_budget += 1
+            if self._under_budget >= RECOVER_FRAMES and self.quality_level > 0:
+                self.set_quality(self.quality_level - 1)
+        else:
+            self._over_budget = self._under_budget = 0
 
     def set_effect(self, effect: str, theme):
         self.effect = effect
         self.theme = theme
-        self.particles.clear()
-        self.tick = 0
+        self.simulation.configure(effect)
+        self._frame = self.simulation.latest()
+        self._static_layer = None
+        self._dirty = QRect()
+        clock = get_animation_clock()
+        if effect in ANIMATED_EFFECTS:
+            clock.subscribe(self, self._update, FRAME_MS)
+        else:
+            clock.unsubscribe(self)
         self.update()
 
-    def _update(self):
-        self.tick += 1
-
-        # Update particles
-        self.particles = [p for p in self.particles if p.life > 0]
-        for p in self.particles:
-            p.update()
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._static_layer = None
 
-        # Spawn new particles based on effect
+    def _update(self):
+        started = time.perf_counter()
         w, h = self.width(), self.height()
-        if w == 0 or h == 0:
-            self.update()
-            return
-
-        if self.effect == "sparkle":
-            if self.tick % 3 == 0:
-                for _ in range(2):
-                    self.particles.append(Particle(
-                        x=random.uniform(0, w),
-                        y=random.uniform(0, h),
-                        vx=random.uniform(-0.5, 0.5),
-                        vy=random.uniform(-1.5, -0.5),
-                        life=random.randint(30, 80),
-                        color=QColor(255, 215, 0),
-                        size=random.uniform(1.5, 4),
-                        shape="star",
-                    ))
-
-        elif self.effect == "hearts":
-            if self.tick % 6 == 0:
-                self.particles.append(Particle(
-                    x=random.uniform(w * 0.1, w * 0.9),
-                    y=h + 20,
-                    vx=random.uniform(-0.3, 0.3),
-                    vy=random.uniform(-1.5, -0.8),
-                    life=random.randint(60, 120),
-                    color=QColor(255, 80, 120),
-                    size=random.uniform(8, 18),
-                    shape="heart",
-                ))
-
-        elif self.effect == "matrix":
-            if self.tick % 4 == 0:
-                for _ in range(3):
-                    self.particles.append(Particle(
-                        x=random.uniform(0, w),
-                        y=0,
-                        vx=0,
-                        vy=random.uniform(2, 6),
-                        life=random.randint(40, 100),
-                        color=QColor(0, 255, 80),
-                        size=random.uniform(8, 14),
-                        shape="char",
-                    ))
-
-        elif self.effect == "void":
-            if self.tick % 8 == 0:
-                self.particles.append(Particle(
-                    x=w / 2,
-                    y=h / 2,
-                    vx=random.uniform(-2, 2),
-                    vy=random.uniform(-2, 2),
-                    life=random.randint(50, 100),
-                    color=QColor(120, 80, 200),
-                    size=random.uniform(1, 3),
-                    shape="circle",
-                ))
-
-        # Flicker effect
-        if self.effect == "flicker":
-            if random.random() < 0.03:
-                self.flicker_alpha = random.randint(180, 255)
-            else:
-                self.flicker_alpha = min(255, self.flicker_alpha + 5)
-
-        # Glitch effect
-        if self.effect == "glitch":
-            if random.random() < 0.05:
-                self.glitch_active = True
-                self.glitch_offset = random.randint(-8, 8)
-            else:
-                self.glitch_active = False
-                self.glitch_offset = 0
-
-        self.update()
+        self.simulation.request_step(w, h)
+        frame = self.simulation.latest()
+        if frame is not self._frame:
+            self._frame = frame
+            self._update_dirty(w)
+        self.update_ms = (time.perf_counter() - started) * 1000
+        self._adapt_quality()
+
+    def _update_dirty(self, w: int):
+        """Repaint only what moved: last tick's area plus this tick's."""
+        dirty = QRect()
+        frame = self._frame
+        if frame.bounds is not None:
+            left, top, right, bottom = frame.bounds
+            dirty = QRect(int(left) - PARTICLE_PAD, int(top) - PARTICLE_PAD,
+                          int(right - left) + 2 * PARTICLE_PAD + 1,
+                          int(bottom - top) + 2 * PARTICLE_PAD + 1)
+        for y in frame.noise_lines:
+            dirty = dirty.united(QRect(0, y - 1, w, 3))
+        region = dirty.united(self._dirty).intersected(self.rect())
+        self._dirty = dirty
+        if not region.isEmpty():
+            self.update(region)
 
     def paintEvent(self, event):
         if not self.theme:
             return
 
+        started = time.perf_counter()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         w, h = self.width(), self.height()
+        painter.drawPixmap(0, 0, self._static_pixmap(w, h))
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.quality["antialias"])
+
+        if self.effect == "flicker":
+            self._draw_flicker_noise(painter, w, h)
+
+        # Draw particles
+        self._draw_particles(painter)
+
+        painter.end()
+        self.paint_ms = (time.perf_counter() - started) * 1000
+
+    def _static_pixmap(self, w: int, h: int) -> QPixmap:
+        # At reduced quality the layer is cached at lower resolution and
+        # scaled up on blit (it is all gradients and faint lines)
+        dpr = self.devicePixelRatioF() * self.quality["layer"]
+        key = (self.effect, self.theme.bg_gradient_start, self.theme.bg_gradient_end, w, h, dpr)
+        if self._static_layer is None or self._static_key != key:
+            self._static_layer = self._render_static(w, h, dpr)
+            self._static_key = key
+        return self._static_layer
+
+    def _render_static(self, w: int, h: int, dpr: float) -> QPixmap:
+        """Everything that only changes with effect, theme or size."""
+        pixmap = QPixmap(max(1, round(w * dpr)), max(1, round(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Background gradient
         gradient = QLinearGradient(0, 0, 0, h)
@@ -172,32 +233,56 @@ class AnimatedBackground(QWidget):
         elif self.effect == "footnote":
             self._draw_footnote(painter, w, h)
 
-        # Draw particles
-        for p in self.particles:
-            alpha = p.alpha
+        painter.end()
+        return pixmap
+
+    def _draw_particles(self, painter):
+        frame = self._frame
+        if not len(frame):
+            return
+        xs, ys, sizes, lives, colors, shapes, alphas = frame.columns
+
+        # Batch fragments per atlas and draw each batch with one call
+        glyphs = []
+        batches: dict = {}
+        for x, y, size, life, color_idx, shape, alpha in zip(
+                xs, ys, sizes, lives, colors, shapes, alphas):
             if alpha <= 0:
                 continue
-            c = QColor(p.color)
-            c.setAlpha(alpha)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QBrush(c))
-
-            if p.shape == "circle":
-                r = p.size
-                painter.drawEllipse(QRectF(p.x - r, p.y - r, r * 2, r * 2))
-            elif p.shape == "star":
-                self._draw_star(painter, p.x, p.y, p.size, c)
-            elif p.shape == "heart":
-                self._draw_heart(painter, p.x, p.y, p.size, c)
-            elif p.shape == "char":
-                chars = "01アイウエオ☰☷∅∞"
-                char = chars[int(p.life) % len(chars)]
-                painter.setPen(QPen(c))
-                f = QFont("Courier New", int(p.size))
-                painter.setFont(f)
-                painter.drawText(int(p.x), int(p.y), char)
-
-        painter.end()
+            if shape == CHAR:
+                glyphs.append((x, y, size, life, alpha))
+                continue
+            batch = batches.get((shape, color_idx))
+            if batch is None:
+                batch = batches[(shape, color_idx)] = (self._sprite_atlas(shape, color_idx), [])
+            batch[1].append(batch[0].fragment(x, y, size, alpha / 255))
+
+        for atlas, fragments in batches.values():
+            atlas.draw(painter, fragments)
+        if glyphs:
+            self._draw_glyphs(painter, glyphs)
+
+    def _sprite_atlas(self, shape: int, color_idx: int) -> ShapeAtlas:
+        dpr = self.devicePixelRatioF()
+        atlas = self._sprites.get((shape, color_idx))
+        if atlas is None or atlas.dpr != dpr:
+            draw, lo, hi, step = SHAPE_SPRITES[shape]
+            atlas = self._sprites[(shape, color_idx)] = ShapeAtlas(
+                draw, lo, hi, step, QColor(*PARTICLE_COLORS[color_idx]), dpr)
+        return atlas
+
+    def _draw_glyphs(self, painter, glyphs):
+        """Matrix characters, blitted from a glyph atlas in one batch."""
+        dpr = self.devicePixelRatioF()
+        atlas = self._glyphs
+        if atlas is None or atlas.dpr != dpr:
+            atlas = self._glyphs = GlyphAtlas(
+                MATRIX_CHARS, MATRIX_SIZES, QColor(*PARTICLE_COLORS[GREEN]), dpr=dpr)
+        n = len(MATRIX_CHARS)
+        atlas.draw(painter, [
+            atlas.fragment(MATRIX_CHARS[int(life) % n], int(size), int(x), int(y), alpha / 255)
+            for x, y, size, life, alpha in glyphs
+        ])
 
     def _draw_flicker(self, painter, w, h):
         # Subtle red vignette
@@ -208,13 +293,14 @@ class AnimatedBackground(QWidget):
         radial.setColorAt(1, c2)
         painter.fillRect(0, 0, w, h, radial)
 
-        # Random noise lines
-        if random.random() < 0.1:
+    def _draw_flicker_noise(self, painter, w, h):
+        # Random noise lines (chosen each tick by the simulation)
+        noise_lines = self._frame.noise_lines
+        if noise_lines:
             pen = QPen(QColor(200, 0, 0, 30))
             pen.setWidth(1)
             painter.setPen(pen)
-            for _ in range(random.randint(1, 3)):
-                y = random.randint(0, h)
+            for y in noise_lines:
                 painter.drawLine(0, y, w, y)
 
     def _draw_glitch(self, painter, w, h):
@@ -252,32 +338,3 @@ class AnimatedBackground(QWidget):
         pen2.setWidth(1)
         painter.setPen(pen2)
         painter.drawLine(60, 0, 60, h)
-
-    def _draw_star(self, painter, cx, cy, r, color):
-        import math
-        points = []
-        for i in range(5):
-            angle = math.radians(i * 72 - 90)
-            points.append(QPointF(cx + r * math.cos(angle), cy + r * math.sin(angle)))
-            angle2 = math.radians(i * 72 - 90 + 36)
-            ir = r * 0.4
-            points.append(QPointF(cx + ir * math.cos(angle2), cy + ir * math.sin(angle2)))
-        from PyQt6.QtGui import QPolygonF
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(color))
-        painter.drawPolygon(QPolygonF(points))
-
-    def _draw_heart(self, painter, cx, cy, r, color):
-        from PyQt6.QtGui import QPainterPath
-        path = QPainterPath()
-        s = r * 0.1
-        path.moveTo(cx, cy + r * 0.3)
-        path.cubicTo(cx - r * 1.1, cy - r * 0.3,
-                     cx - r * 1.1, cy - r,
-                     cx, cy - r * 0.4)
-        path.cubicTo(cx + r * 1.1, cy - r,
-                     cx + r * 1.1, cy - r * 0.3,
-                     cx, cy + r * 0.3)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(color))
-        painter.drawPath(path)
@@ -6,19 +6,29 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QGridLayout, QFrame, QSizePolicy
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QEasingCurve, QSize
-from PyQt6.QtGui import QFont, QCursor
+from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QEasingCurve, QSize, QRectF
+from PyQt6.QtGui import QFont, QCursor, QPainter, QPainterPath, QPixmap
 
 from data.genres import ALL_GENRES, Genre, GenreTheme
+from ui.previews import get_preview_scheduler
 from ui.theme import build_main_stylesheet
 
 
+# Genre effect previews sit faintly behind the card text
+PREVIEW_OPACITY = 0.35
+CARD_RADIUS = 16        # matches QPushButton#genre_btn border-radius
+CARD_BORDER = 2
+
+
 class GenreCard(QPushButton):
-    """A clickable genre selection card."""
+    """A clickable genre selection card with a live preview of its effect."""
+    hovered = pyqtSignal()
+    unhovered = pyqtSignal()
 
     def __init__(self, genre: Genre, parent=None):
         super().__init__(parent)
         self.genre = genre
+        self._preview: QPixmap = None
         self.setObjectName("genre_btn")
         self.setCheckable(True)
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
@@ -53,14 +63,45 @@ class GenreCard(QPushButton):
 
         self.setLayout(layout)
 
+    def set_preview(self, pixmap: QPixmap):
+        if pixmap is not self._preview:
+            self._preview = pixmap
+            self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._preview is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        inner = QRectF(self.rect()).adjusted(CARD_BORDER, CARD_BORDER, -CARD_BORDER, -CARD_BORDER)
+        clip = QPainterPath()
+        clip.addRoundedRect(inner, CARD_RADIUS - CARD_BORDER, CARD_RADIUS - CARD_BORDER)
+        painter.setClipPath(clip)
+        painter.setOpacity(PREVIEW_OPACITY)
+        painter.drawPixmap(inner, self._preview, QRectF(self._preview.rect()))
+        painter.end()
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        self.hovered.emit()
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.unhovered.emit()
+
 
 class GenreSelectScreen(QWidget):
     """
     Full genre selection screen.
-    Emits genre_selected(Genre) when the user picks a genre and clicks Start.
+    Emits genre_selected(Genre) when the user picks a genre and clicks Start,
+    and genre_hovered(Genre) as a hint that it may be picked soon.
     """
     genre_selected = pyqtSignal(object)  # Genre
+    genre_hovered = pyqtSignal(object)   # Genre
     stats_requested = pyqtSignal()
+    history_requested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -68,6 +109,10 @@ class GenreSelectScreen(QWidget):
         self._cards: list[GenreCard] = []
         self._build_ui()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        get_preview_scheduler().start_visit()
+
     def _build_ui(self):
         root = QVBoxLayout(self)
         root.setContentsMargins(48, 32, 48, 32)
@@ -102,9 +147,14 @@ class GenreSelectScreen(QWidget):
         grid.setSpacing(14)
         grid.setContentsMargins(0, 0, 0, 0)
 
+        previews = get_preview_scheduler()
         for i, genre in enumerate(ALL_GENRES):
             card = GenreCard(genre)
             card.clicked.connect(lambda checked, g=genre, c=card: self._on_genre_clicked(g, c))
+            card.hovered.connect(lambda g=genre: self.genre_hovered.emit(g))
+            card.hovered.connect(lambda c=card: previews.set_hovered(c))
+            card.unhovered.connect(lambda: previews.set_hovered(None))
+            previews.register(card, genre)
             self._cards.append(card)
             row, col = divmod(i, 3)
             grid.addWidget(card, row, col)
@@ -121,6 +171,11 @@ class GenreSelectScreen(QWidget):
         self._stats_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self._stats_btn.clicked.connect(self.stats_requested.emit)
 
+        self._history_btn = QPushButton("📜  Story History")
+        self._history_btn.setObjectName("secondary_btn")
+        self._history_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self._history_btn.clicked.connect(self.history_requested.emit)
+
         self._start_btn = QPushButton("🎭  START MADNESS")
         self._start_btn.setObjectName("large_btn")
         self._start_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
@@ -128,6 +183,7 @@ class GenreSelectScreen(QWidget):
         self._start_btn.setEnabled(False)
 
         bottom.addWidget(self._stats_btn)
+        bottom.addWidget(self._history_btn)
         bottom.addStretch()
         bottom.addWidget(self._start_btn)
 
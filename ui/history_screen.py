@@ -0,0 +1,292 @@
+"""
+MadVerse Story History Screen
+Virtualized browser over the story archive: rows are fetched in pages and
+painted by a delegate, so cost tracks the visible rows, not the archive size.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QListView, QLineEdit, QStyledItemDelegate, QStyle, QFrame
+)
+from PyQt6.QtCore import (Qt, pyqtSignal, QAbstractListModel, QModelIndex,
+                          QSize, QRectF)
+from PyQt6.QtGui import QFont, QCursor, QColor, QPainter, QFontMetrics
+
+from data.archive import get_archive
+from data.genres import GENRE_MAP
+from data.search import MAX_PREFIX_TERMS, get_search_index
+
+PAGE_SIZE = 200
+PREVIEW_CACHE_SIZE = 512
+
+# Custom item roles
+STORY_ID_ROLE = Qt.ItemDataRole.UserRole + 1
+PREVIEW_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class StoryHistoryModel(QAbstractListModel):
+    """
+    Newest-first list of archived stories.
+    Only story ids are held per row; previews are decoded on demand and
+    kept in a small LRU cache.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids: Optional[List[int]] = None   # None → whole archive
+        self._total = 0
+        self._loaded = 0
+        self._previews: "OrderedDict[int, dict]" = OrderedDict()
+
+    def reload(self, ids: Optional[List[int]] = None):
+        """Reset to the whole archive, or to a list of ids (e.g. search hits)."""
+        self.beginResetModel()
+        self._ids = sorted(ids, reverse=True) if ids is not None else None
+        self._total = len(self._ids) if ids is not None else len(get_archive())
+        self._loaded = 0
+        self._previews.clear()
+        self.endResetModel()
+
+    def total(self) -> int:
+        return self._total
+
+    def story_id(self, row: int) -> int:
+        if self._ids is not None:
+            return self._ids[row]
+        return self._total - 1 - row
+
+    # ─── QAbstractListModel ───────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(PAGE_SIZE, self._total - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        story_id = self.story_id(index.row())
+        if role == STORY_ID_ROLE:
+            return story_id
+        if role == PREVIEW_ROLE:
+            return self._preview(story_id)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._preview(story_id)["text"]
+        return None
+
+    # ─── PREVIEWS ─────────────────────────────────────────
+
+    def _preview(self, story_id: int) -> dict:
+        preview = self._previews.get(story_id)
+        if preview is not None:
+            self._previews.move_to_end(story_id)
+            return preview
+
+        record = get_archive().get(story_id)
+        genre = GENRE_MAP.get(record.get("genre"))
+        parts = record.get("parts", [])
+        try:
+            created = datetime.fromisoformat(record.get("created", "")).strftime("%b %d, %Y  %H:%M")
+        except ValueError:
+            created = ""
+        preview = {
+            "id": story_id,
+            "title": f"{genre.icon}  {genre.name}" if genre else record.get("genre", "?"),
+            "created": created,
+            "text": parts[0]["text"] if parts else "",
+            "is_ai": record.get("is_ai", False),
+        }
+        self._previews[story_id] = preview
+        if len(self._previews) > PREVIEW_CACHE_SIZE:
+            self._previews.popitem(last=False)
+        return preview
+
+
+class StoryPreviewDelegate(QStyledItemDelegate):
+    """Paints one history row: genre, date and the opening line."""
+    ROW_HEIGHT = 72
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._theme = None
+        self._title_font = QFont("Georgia", 12, QFont.Weight.Bold)
+        self._meta_font = QFont("Georgia", 9)
+        self._body_font = QFont("Georgia", 11)
+
+    def set_theme(self, theme):
+        self._theme = theme
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index):
+        preview = index.data(PREVIEW_ROLE)
+        if preview is None or self._theme is None:
+            return super().paint(painter, option, index)
+
+        theme = self._theme
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = QRectF(option.rect).adjusted(2, 3, -10, -3)
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        painter.setPen(QColor(theme.accent_color if hovered else theme.card_border))
+        painter.setBrush(QColor(theme.card_color))
+        painter.drawRoundedRect(rect, 10, 10)
+
+        inner = rect.adjusted(16, 8, -16, -8)
+        top = QRectF(inner.left(), inner.top(), inner.width(), inner.height() / 2)
+        bottom = QRectF(inner.left(), top.bottom(), inner.width(), inner.height() / 2)
+
+        painter.setFont(self._title_font)
+        painter.setPen(QColor(theme.accent_color))
+        title = preview["title"] + ("   🤖" if preview["is_ai"] else "")
+        painter.drawText(top, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+        painter.setFont(self._meta_font)
+        painter.setPen(QColor(theme.accent_secondary))
+        painter.drawText(top, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         f"#{preview['id']}   {preview['created']}")
+
+        painter.setFont(self._body_font)
+        painter.setPen(QColor(theme.text_color))
+        text = QFontMetrics(self._body_font).elidedText(
+            preview["text"], Qt.TextElideMode.ElideRight, int(bottom.width()))
+        painter.drawText(bottom, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+        painter.restore()
+
+
+class HistoryScreen(QWidget):
+    """Browse and search every archived story."""
+    back_requested = pyqtSignal()
+    story_opened = pyqtSignal(dict)    # archived story record
+    # Emitted on the index worker; queued to the GUI thread
+    _index_synced = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query = ""           # search the list currently shows
+        self._index = None         # index we listen to, once searched
+        self._index_synced.connect(self._on_index_synced)
+        self._build_ui()
+
+    def _build_ui(self):
+        root = QVBoxLayout(self)
+        root.setContentsMargins(40, 28, 40, 28)
+        root.setSpacing(0)
+
+        # ─── HEADER ───────────────────────────────────────
+        hdr = QHBoxLayout()
+        back_btn = QPushButton("← Back")
+        back_btn.setObjectName("secondary_btn")
+        back_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        back_btn.setFixedWidth(100)
+        back_btn.clicked.connect(self.back_requested.emit)
+
+        title = QLabel("📜  Story History")
+        title.setObjectName("section_title")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        hdr.addWidget(back_btn)
+        hdr.addStretch()
+        hdr.addWidget(title)
+        hdr.addStretch()
+        hdr.addSpacing(100)
+        root.addLayout(hdr)
+        root.addSpacing(20)
+
+        # ─── SEARCH ───────────────────────────────────────
+        self._search = QLineEdit()
+        self._search.setPlaceholderText("Search, e.g. banana   genre:horror type:callback   ban*")
+        self._search.setFixedHeight(40)
+        self._search.returnPressed.connect(self._on_search)
+        root.addWidget(self._search)
+        root.addSpacing(8)
+
+        self._count_lbl = QLabel("")
+        self._count_lbl.setObjectName("hint_label")
+        root.addWidget(self._count_lbl)
+        root.addSpacing(8)
+
+        # ─── LIST ─────────────────────────────────────────
+        self._model = StoryHistoryModel(self)
+        self._delegate = StoryPreviewDelegate(self)
+
+        self._list = QListView()
+        self._list.setObjectName("history_list")
+        self._list.setModel(self._model)
+        self._list.setItemDelegate(self._delegate)
+        self._list.setUniformItemSizes(True)
+        self._list.setFrameShape(QFrame.Shape.NoFrame)
+        self._list.setMouseTracking(True)
+        self._list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self._list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._list.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self._list.clicked.connect(self._on_activated)
+        root.addWidget(self._list, stretch=1)
+
+        self.setLayout(root)
+
+    def set_theme(self, theme):
+        self._delegate.set_theme(theme)
+        self._list.viewport().update()
+
+    def refresh(self):
+        """Re-read the archive (cheap: only the row count is loaded)."""
+        self._search.clear()
+        self._query = ""
+        self._model.reload()
+        self._update_count()
+
+    def _on_search(self):
+        self._query = self._search.text().strip()
+        if self._query:
+            # Stories not yet indexed show up when the worker reports the sync
+            index = get_search_index(background=True)
+            if index is not self._index:
+                self._index = index
+                index.add_listener(self._index_synced.emit)
+            index.request_sync()
+        self._run_query()
+
+    def _on_index_synced(self, indexed: int):
+        if self._query and self.isVisible():
+            self._run_query()
+
+    def _run_query(self):
+        truncated = None
+        if not self._query:
+            self._model.reload()
+        else:
+            ids, truncated = self._index.query(self._query)
+            self._model.reload(ids)
+        self._update_count(truncated)
+
+    def _update_count(self, truncated: Optional[List[str]] = None):
+        n = self._model.total()
+        text = f"{n} stor{'y' if n == 1 else 'ies'}"
+        if truncated:
+            text += (f"  ·  {', '.join(truncated)} matched over {MAX_PREFIX_TERMS} words; "
+                     f"only the first {MAX_PREFIX_TERMS} were searched")
+        self._count_lbl.setText(text)
+
+    def _on_activated(self, index: QModelIndex):
+        story_id = index.data(STORY_ID_ROLE)
+        if story_id is not None:
+            self.story_opened.emit(get_archive().get(story_id))
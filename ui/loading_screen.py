@@ -7,9 +7,11 @@ import random
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QProgressBar, QFrame
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
+from ui.animation_clock import get_animation_clock
+
 
 LOADING_MESSAGES = [
     "Consulting the chaos oracle…",
@@ -40,10 +42,6 @@ class LoadingScreen(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._build_ui()
-        self._msg_timer = QTimer(self)
-        self._msg_timer.timeout.connect(self._cycle_message)
-        self._progress_timer = QTimer(self)
-        self._progress_timer.timeout.connect(self._tick_progress)
         self._progress_val = 0
 
     def _build_ui(self):
@@ -91,12 +89,15 @@ class LoadingScreen(QWidget):
     def start(self):
         self._progress_val = 0
         self._progress.setValue(0)
-        self._msg_timer.start(1800)
-        self._progress_timer.start(200)
+        # Ticks pause by themselves whenever this screen is off screen
+        clock = get_animation_clock()
+        clock.subscribe(self._status_lbl, self._cycle_message, 1800)
+        clock.subscribe(self._progress, self._tick_progress, 200)
 
     def stop(self):
-        self._msg_timer.stop()
-        self._progress_timer.stop()
+        clock = get_animation_clock()
+        clock.unsubscribe(self._status_lbl)
+        clock.unsubscribe(self._progress)
         self._progress.setValue(100)
 
     def _cycle_message(self):
@@ -2,27 +2,33 @@
 MadVerse Main Window
 Orchestrates navigation between screens using QStackedWidget.
 Applies per-genre themes dynamically.
+
+Only what the first screen needs is imported and built up front: the
+loading, story and stats screens are built on first navigation, and the
+sound manager (QtMultimedia) and stats tracker load once the window is up.
 """
 
+import sys
+import time
+from collections import deque
+
 from PyQt6.QtWidgets import (
     QMainWindow, QStackedWidget, QWidget, QVBoxLayout,
     QLabel, QPushButton, QHBoxLayout, QFrame, QApplication,
     QCheckBox, QSlider
 )
 from PyQt6.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve, pyqtSignal
-from PyQt6.QtGui import QFont, QCloseEvent, QIcon
+from PyQt6.QtGui import QFont, QCloseEvent, QIcon, QColor, QPalette
 
 from data.genres import Genre, ALL_GENRES, GENRE_MAP
-from data.stats import get_tracker
-from ui.theme import build_main_stylesheet
+from data.archive import get_archive
+from data.search import get_search_index, close_search_index
+from ui.theme import apply_theme, build_app_stylesheet, preload_themes
 from ui.background import AnimatedBackground
 from ui.genre_select import GenreSelectScreen
 from ui.word_input import WordInputScreen
-from ui.story_reveal import StoryRevealScreen
-from ui.stats_screen import StatsScreen, AchievementPopup
-from ui.loading_screen import LoadingScreen
-from engine.story_engine import StoryEngine
-from audio.sounds import get_sound_manager
+from ui.history_screen import HistoryScreen
+from ui.transitions import ScreenTransition, FADE, SLIDE_LEFT, SLIDE_RIGHT
 
 # Screen indices
 SCREEN_GENRE   = 0
@@ -30,6 +36,29 @@ SCREEN_WORDS   = 1
 SCREEN_LOADING = 2
 SCREEN_STORY   = 3
 SCREEN_STATS   = 4
+SCREEN_HISTORY = 5
+
+# Built on first navigation; a placeholder holds their index until then
+LAZY_SCREENS = (SCREEN_LOADING, SCREEN_STORY, SCREEN_STATS)
+# The genre ambience plays through these; going anywhere else fades it out
+AMBIENCE_SCREENS = (SCREEN_WORDS, SCREEN_LOADING, SCREEN_STORY)
+
+THEME_TIMING_HISTORY = 50
+
+# Sound and stats load this long after the window is first shown
+DEFERRED_INIT_MS = 250
+
+
+def get_sound_manager():
+    """The sound manager, imported on first use (QtMultimedia is slow to load)."""
+    from audio.sounds import get_sound_manager
+    return get_sound_manager()
+
+
+def get_tracker():
+    """The stats tracker, imported on first use (it reads the stats file)."""
+    from data.stats import get_tracker
+    return get_tracker()
 
 
 class SettingsBar(QFrame):
@@ -41,12 +70,11 @@ class SettingsBar(QFrame):
         layout.setContentsMargins(10, 4, 10, 4)
         layout.setSpacing(10)
 
-        sound_mgr = get_sound_manager()
-
+        # Sound starts enabled; the manager is only created when it is used
         self._sound_cb = QCheckBox("🔊 Sound")
-        self._sound_cb.setChecked(sound_mgr.is_enabled())
+        self._sound_cb.setChecked(True)
         self._sound_cb.stateChanged.connect(
-            lambda s: sound_mgr.set_enabled(s == Qt.CheckState.Checked.value)
+            lambda s: get_sound_manager().set_enabled(s == Qt.CheckState.Checked.value)
         )
         layout.addWidget(self._sound_cb)
 
@@ -59,7 +87,7 @@ class SettingsBar(QFrame):
         self._vol_slider.setRange(0, 100)
         self._vol_slider.setValue(70)
         self._vol_slider.valueChanged.connect(
-            lambda v: sound_mgr.set_volume(v / 100)
+            lambda v: get_sound_manager().set_volume(v / 100)
         )
         layout.addWidget(self._vol_slider)
 
@@ -78,14 +106,27 @@ class MainWindow(QMainWindow):
         self._current_genre: Genre = None
         self._current_words: dict = {}
         self._current_parts: list = []
+        self._current_seed = None
+        self._current_ai_meta: dict = {}
         self._ai_worker = None
+        self._ai_started_at = 0.0
+        self._ai_latency = None
+        self._deferred_init_done = False
 
+        # Genre-switch timings (ms), most recent last
+        self._theme_genre: Genre = None
+        self._theme_switch: dict = None
+        self._theme_timings = deque(maxlen=THEME_TIMING_HISTORY)
+
+        preload_themes(ALL_GENRES)
         self._build_ui()
         self._apply_theme(ALL_GENRES[0])  # default theme
 
     def _build_ui(self):
         central = QWidget()
         self.setCentralWidget(central)
+        # Set once: a genre switch only changes which rules match, see _apply_theme
+        central.setStyleSheet(build_app_stylesheet(ALL_GENRES))
         root = QVBoxLayout(central)
         root.setContentsMargins(0, 0, 0, 0)
         root.setSpacing(0)
@@ -104,67 +145,213 @@ class MainWindow(QMainWindow):
 
         # ─── STACKED SCREENS ──────────────────────────────
         self._stack = QStackedWidget()
+        # Screen backdrop comes from the palette, so a genre switch recolors
+        # it without restyling every screen
+        self._stack.setAutoFillBackground(True)
 
         self._genre_screen  = GenreSelectScreen()
         self._words_screen  = WordInputScreen()
-        self._loading_screen = LoadingScreen()
-        self._story_screen  = StoryRevealScreen()
-        self._stats_screen  = StatsScreen()
+        self._loading_screen = None     # LAZY_SCREENS, see _screen()
+        self._story_screen  = None
+        self._stats_screen  = None
+        self._history_screen = HistoryScreen()
+        self._placeholders = {idx: QWidget() for idx in LAZY_SCREENS}
 
         self._stack.addWidget(self._genre_screen)   # 0
         self._stack.addWidget(self._words_screen)   # 1
-        self._stack.addWidget(self._loading_screen) # 2
-        self._stack.addWidget(self._story_screen)   # 3
-        self._stack.addWidget(self._stats_screen)   # 4
+        self._stack.addWidget(self._placeholders[SCREEN_LOADING])   # 2
+        self._stack.addWidget(self._placeholders[SCREEN_STORY])     # 3
+        self._stack.addWidget(self._placeholders[SCREEN_STATS])     # 4
+        self._stack.addWidget(self._history_screen) # 5
 
         root.addWidget(self._stack, stretch=1)
 
+        # ─── TRANSITION OVERLAY ───────────────────────────
+        self._transition = ScreenTransition(central)
+
         # ─── WIRE SIGNALS ─────────────────────────────────
         self._genre_screen.genre_selected.connect(self._on_genre_selected)
+        self._genre_screen.genre_hovered.connect(self._on_genre_hovered)
         self._genre_screen.stats_requested.connect(self._show_stats)
+        self._genre_screen.history_requested.connect(self._show_history)
 
         self._words_screen.words_collected.connect(self._on_words_collected)
         self._words_screen.back_requested.connect(lambda: self._go_to(SCREEN_GENRE))
 
-        self._story_screen.play_again.connect(self._on_play_again)
-        self._story_screen.change_genre.connect(self._on_change_genre)
-        self._story_screen.regenerate.connect(self._on_regenerate)
-        self._story_screen.achievement_unlocked.connect(self._show_achievements)
-
-        self._stats_screen.back_requested.connect(lambda: self._go_to(SCREEN_GENRE))
+        self._history_screen.back_requested.connect(lambda: self._go_to(SCREEN_GENRE))
+        self._history_screen.story_opened.connect(self._on_archived_story_opened)
 
         # ─── ACHIEVEMENT QUEUE ────────────────────────────
         self._achievement_queue: list = []
         self._achievement_showing = False
 
+    # ─── LAZY SCREENS ─────────────────────────────────────
+
+    def _screen(self, screen_idx: int) -> QWidget:
+        """The screen at screen_idx, building it in place on first use."""
+        widget = self._stack.widget(screen_idx)
+        if widget is not self._placeholders.get(screen_idx):
+            return widget
+        builder = {
+            SCREEN_LOADING: self._build_loading_screen,
+            SCREEN_STORY:   self._build_story_screen,
+            SCREEN_STATS:   self._build_stats_screen,
+        }[screen_idx]
+        screen = builder()
+        # Inserting before the placeholder keeps the current screen current
+        self._stack.insertWidget(screen_idx, screen)
+        self._stack.removeWidget(widget)
+        widget.deleteLater()
+        del self._placeholders[screen_idx]
+        return screen
+
+    def _build_loading_screen(self):
+        from ui.loading_screen import LoadingScreen
+        self._loading_screen = LoadingScreen()
+        return self._loading_screen
+
+    def _build_story_screen(self):
+        from ui.story_reveal import StoryRevealScreen
+        screen = self._story_screen = StoryRevealScreen()
+        screen.play_again.connect(self._on_play_again)
+        screen.change_genre.connect(self._on_change_genre)
+        screen.regenerate.connect(self._on_regenerate)
+        screen.achievement_unlocked.connect(self._show_achievements)
+        return screen
+
+    def _build_stats_screen(self):
+        from ui.stats_screen import StatsScreen
+        screen = self._stats_screen = StatsScreen()
+        screen.back_requested.connect(lambda: self._go_to(SCREEN_GENRE))
+        screen.set_theme(self._theme_genre.theme)
+        return screen
+
+    # ─── DEFERRED INIT ────────────────────────────────────
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._deferred_init_done:
+            self._deferred_init_done = True
+            QTimer.singleShot(DEFERRED_INIT_MS, self._deferred_init)
+
+    def _deferred_init(self):
+        """Load sound, stats and the search index while the user looks at the first screen."""
+        get_sound_manager()
+        get_tracker()
+        get_search_index(background=True)   # loads and catches up on its worker
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._bg.setGeometry(0, 0, self.width(), self.height())
+        self._transition.finish()   # snapshots no longer fit
 
     # ─────────────────────────────────────────────────────
     # NAVIGATION
     # ─────────────────────────────────────────────────────
 
-    def _go_to(self, screen_idx: int):
+    def _go_to(self, screen_idx: int, style: str = None):
+        """
+        Switch screens behind a snapshot transition. Callers that restyle
+        first call self._transition.cover() before doing so.
+        Default style: slide forward/back by screen order, fade in place.
+        """
+        current = self._stack.currentIndex()
+        if style is None:
+            if screen_idx == current:
+                style = FADE
+            else:
+                style = SLIDE_LEFT if screen_idx > current else SLIDE_RIGHT
+        self._screen(screen_idx)
+        if screen_idx not in AMBIENCE_SCREENS and "audio.sounds" in sys.modules:
+            get_sound_manager().set_ambience(None)
+        self._transition.cover()
         self._stack.setCurrentIndex(screen_idx)
+        page_ms = self._style_current_page()
+        self._transition.reveal(style)
+        if self._theme_switch is not None:
+            self._theme_switch["page_ms"] = page_ms
+            self._finish_theme_switch()
         get_sound_manager().play("click")
 
+    # ─────────────────────────────────────────────────────
+    # THEME
+    # ─────────────────────────────────────────────────────
+
     def _apply_theme(self, genre: Genre):
-        stylesheet = build_main_stylesheet(genre.theme, genre.id)
-        self.setStyleSheet(stylesheet)
+        """
+        The window stylesheet holds every genre, selected per screen by the
+        theme property, so a switch never re-parses a stylesheet. Re-polishing
+        still walks a whole subtree, so only the settings bar and the screen
+        being shown switch now, and every other screen when _go_to next shows it.
+        """
+        started = time.perf_counter()
+        self._theme_genre = genre
+        apply_theme(self._settings_bar, genre.id)
+        palette = self._stack.palette()
+        palette.setColor(QPalette.ColorRole.Window, QColor(genre.theme.bg_color))
+        self._stack.setPalette(palette)
+        page_ms = 0.0
+        if not self._transition.is_active():
+            page_ms = self._style_current_page()    # nothing covers it
+        styled = time.perf_counter()
         self._bg.set_effect(genre.theme.effect, genre.theme)
+        self._history_screen.set_theme(genre.theme)
+        if self._stats_screen is not None:
+            self._stats_screen.set_theme(genre.theme)
+        self._theme_switch = {
+            "genre": genre.id,
+            "started": started,
+            "stylesheet_ms": (styled - started) * 1000 - page_ms,
+            "effects_ms": (time.perf_counter() - styled) * 1000,
+            "page_ms": page_ms,
+        }
+        if not self._transition.is_active():
+            self._finish_theme_switch()
+
+    def _style_current_page(self) -> float:
+        """Bring the current screen up to the current theme; returns ms spent."""
+        started = time.perf_counter()
+        apply_theme(self._stack.currentWidget(), self._theme_genre.id)
+        return (time.perf_counter() - started) * 1000
+
+    def _finish_theme_switch(self):
+        switch, self._theme_switch = self._theme_switch, None
+        # Total runs until the incoming screen has been painted once
+        switch["total_ms"] = (time.perf_counter() - switch.pop("started")) * 1000
+        self._theme_timings.append({k: round(v, 3) if isinstance(v, float) else v
+                                    for k, v in switch.items()})
+
+    def theme_stats(self) -> dict:
+        """Recent genre-switch latencies: last breakdown, mean and max total."""
+        totals = [t["total_ms"] for t in self._theme_timings]
+        if not totals:
+            return {"switches": 0}
+        return {
+            "switches": len(totals),
+            "last": self._theme_timings[-1],
+            "mean_total_ms": round(sum(totals) / len(totals), 3),
+            "max_total_ms": round(max(totals), 3),
+        }
 
     # ─────────────────────────────────────────────────────
     # FLOW: Genre → Words → Generate → Story
     # ─────────────────────────────────────────────────────
 
+    def _on_genre_hovered(self, genre: Genre):
+        get_sound_manager().prefetch("select", f"{genre.id}_theme")
+
     def _on_genre_selected(self, genre: Genre):
         self._current_genre = genre
+        # Restyle behind the outgoing snapshot, then fade to the new theme
+        self._transition.cover()
         self._apply_theme(genre)
         get_sound_manager().play("select")
         get_sound_manager().play_genre_theme(genre.id)
+        get_sound_manager().set_ambience(genre.id)
         self._words_screen.set_genre(genre)
-        self._go_to(SCREEN_WORDS)
+        self._go_to(SCREEN_WORDS, FADE)
+        # Word input always leads to the reveal
+        get_sound_manager().prefetch("reveal", "complete", "achievement")
 
     def _on_words_collected(self, words: dict):
         self._current_words = words
@@ -176,8 +363,11 @@ class MainWindow(QMainWindow):
             self._generate_local_story()
 
     def _generate_local_story(self):
+        from engine.story_engine import StoryEngine
         engine = StoryEngine(self._current_genre, self._current_words)
         self._current_parts = engine.generate()
+        self._current_seed = engine.seed
+        self._current_ai_meta = {}
         self._show_story(is_ai=False)
 
     def _generate_ai_story(self):
@@ -190,11 +380,16 @@ class MainWindow(QMainWindow):
         self._ai_worker = AIWorker(self._current_words, sub_genre)
         self._ai_worker.finished.connect(self._on_ai_finished)
         self._ai_worker.error.connect(self._on_ai_error)
+        self._ai_started_at = time.monotonic()
         self._ai_worker.start()
 
     def _on_ai_finished(self, parts: list):
         self._loading_screen.stop()
         self._current_parts = parts
+        self._current_seed = None
+        self._current_ai_meta = self._ai_metadata(self._ai_worker.get_engine())
+        if not self._current_ai_meta.get("error"):
+            self._ai_latency = time.monotonic() - self._ai_started_at
         self._show_story(is_ai=True)
 
     def _on_ai_error(self, error: str):
@@ -203,15 +398,41 @@ class MainWindow(QMainWindow):
         from engine.ai_engine import AIStoryEngine
         engine = AIStoryEngine(self._current_words)
         self._current_parts = engine._error_story(error)
+        self._current_seed = None
+        self._current_ai_meta = self._ai_metadata(engine)
+        self._current_ai_meta["sub_genre"] = self._ai_worker.sub_genre
         self._show_story(is_ai=True)
 
+    @staticmethod
+    def _ai_metadata(engine) -> dict:
+        if engine is None:
+            return {}
+        return {
+            "sub_genre": engine.sub_genre,
+            "reflection": engine.ai_reflection,
+            "chaos_level": engine.chaos_level,
+            "best_word": engine.best_word,
+            "error": engine.error,
+        }
+
     def _show_story(self, is_ai: bool = False):
         # Record stats
         new_ach = get_tracker().record_story(
-            self._current_genre.id, self._current_words
+            self._current_genre.id, self._current_words,
+            is_ai=is_ai, ai_latency=self._ai_latency,
         )
+        self._ai_latency = None
+        get_archive().record_story(
+            self._current_genre.id,
+            self._current_words,
+            self._current_parts,
+            seed=self._current_seed,
+            is_ai=is_ai,
+            ai_meta=self._current_ai_meta,
+        )
+        get_search_index(background=True).request_sync()
 
-        self._story_screen.show_story(
+        self._screen(SCREEN_STORY).show_story(
             self._current_genre,
             self._current_words,
             self._current_parts,
@@ -245,9 +466,36 @@ class MainWindow(QMainWindow):
     # ─────────────────────────────────────────────────────
 
     def _show_stats(self):
-        self._stats_screen.refresh()
+        self._screen(SCREEN_STATS).refresh()
         self._go_to(SCREEN_STATS)
 
+    # ─────────────────────────────────────────────────────
+    # HISTORY
+    # ─────────────────────────────────────────────────────
+
+    def _show_history(self):
+        self._history_screen.refresh()
+        self._go_to(SCREEN_HISTORY)
+
+    def _on_archived_story_opened(self, record: dict):
+        """Re-read an archived story; it is not recorded again."""
+        genre = GENRE_MAP.get(record.get("genre"))
+        if genre is None:
+            return
+        self._current_genre = genre
+        self._current_words = record.get("words", {})
+        self._current_parts = record.get("parts", [])
+        self._transition.cover()
+        self._apply_theme(genre)
+        self._screen(SCREEN_STORY).show_story(
+            genre,
+            self._current_words,
+            self._current_parts,
+            is_ai=record.get("is_ai", False),
+            instant=True,
+        )
+        self._go_to(SCREEN_STORY, FADE)
+
     # ─────────────────────────────────────────────────────
     # ACHIEVEMENTS
     # ─────────────────────────────────────────────────────
@@ -266,6 +514,7 @@ class MainWindow(QMainWindow):
         ach = self._achievement_queue.pop(0)
         get_sound_manager().play("achievement")
 
+        from ui.stats_screen import AchievementPopup
         popup = AchievementPopup(ach, self)
         # Position bottom-right
         x = self.width() - popup.width() - 20
@@ -280,4 +529,10 @@ class MainWindow(QMainWindow):
         if self._ai_worker and self._ai_worker.isRunning():
             self._ai_worker.quit()
             self._ai_worker.wait(2000)
+        self._bg.simulation.stop()
+        if "audio.sounds" in sys.modules:
+            get_sound_manager().stop_ambience()
+            get_sound_manager().shutdown()
+        close_search_index()
+        get_archive().flush()
         super().closeEvent(event)
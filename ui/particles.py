@@ -0,0 +1,165 @@
+"""
+MadVerse Particle System
+Struct-of-arrays particle store for the animated background: every field is
+a preallocated array of fixed capacity, integration and culling are single
+vectorized passes, and spawning fills free slots in place.
+"""
+
+import random
+from typing import List, Optional, Sequence, Union
+
+# NumPy does the per-tick work in bulk; without it the same layout is
+# updated with plain Python loops
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+DEFAULT_CAPACITY = 4096
+GRAVITY = 0.05
+
+# Shape codes
+CIRCLE, STAR, HEART, CHAR = range(4)
+
+Range = Union[float, Sequence[float]]   # constant, or (low, high) for uniform
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particles. A slot is live while life > 0.
+
+    Fields: x, y, vx, vy, life, max_life, size, color (palette index), shape.
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "life", "max_life", "size", "color", "shape")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.limit = capacity       # live particles allowed (≤ capacity)
+        if HAS_NUMPY:
+            self._rng = np.random.default_rng(seed)
+            for name in self.FIELDS:
+                dtype = np.int16 if name in ("color", "shape") else np.float32
+                setattr(self, name, np.zeros(capacity, dtype=dtype))
+        else:
+            self._rng = random.Random(seed)
+            for name in self.FIELDS:
+                setattr(self, name, [0] * capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        if HAS_NUMPY:
+            self.life[:] = 0
+        else:
+            self.life[:] = [0] * self.capacity
+        self._count = 0
+
+    # ─── SPAWNING ─────────────────────────────────────────
+
+    def spawn(self, n: int, x: Range, y: Range, vx: Range, vy: Range,
+              life: Sequence[int], size: Range, color: int, shape: int) -> int:
+        """
+        Spawn up to n particles into free slots; returns how many fitted.
+        Range arguments are a constant or a (low, high) uniform range;
+        life is an inclusive (low, high) integer range.
+        """
+        n = min(n, self.limit - self._count)
+        if n <= 0:
+            return 0
+        if HAS_NUMPY:
+            slots = np.flatnonzero(self.life <= 0)[:n]
+            k = len(slots)
+            if k == 0:
+                return 0
+            self.x[slots] = self._draw(x, k)
+            self.y[slots] = self._draw(y, k)
+            self.vx[slots] = self._draw(vx, k)
+            self.vy[slots] = self._draw(vy, k)
+            lives = self._rng.integers(life[0], life[1] + 1, k)
+            self.life[slots] = lives
+            self.max_life[slots] = lives
+            self.size[slots] = self._draw(size, k)
+            self.color[slots] = color
+            self.shape[slots] = shape
+        else:
+            slots = [i for i, l in enumerate(self.life) if l <= 0][:n]
+            k = len(slots)
+            for i in slots:
+                self.x[i] = self._draw(x, 1)
+                self.y[i] = self._draw(y, 1)
+                self.vx[i] = self._draw(vx, 1)
+                self.vy[i] = self._draw(vy, 1)
+                self.life[i] = self.max_life[i] = self._rng.randint(life[0], life[1])
+                self.size[i] = self._draw(size, 1)
+                self.color[i] = color
+                self.shape[i] = shape
+        self._count += k
+        return k
+
+    def _draw(self, value: Range, k: int):
+        if isinstance(value, (int, float)):
+            return value
+        low, high = value
+        if HAS_NUMPY:
+            return self._rng.uniform(low, high, k)
+        return self._rng.uniform(low, high)
+
+    # ─── INTEGRATION ──────────────────────────────────────
+
+    def step(self, gravity: float = GRAVITY):
+        """Advance one tick: move, age, apply gravity; dead slots become free."""
+        if HAS_NUMPY:
+            live = self.life > 0
+            self.x += self.vx * live
+            self.y += self.vy * live
+            self.life -= live
+            self.vy += gravity * live
+            self._count = int(np.count_nonzero(self.life > 0))
+            return
+        count = 0
+        for i in range(self.capacity):
+            if self.life[i] > 0:
+                self.x[i] += self.vx[i]
+                self.y[i] += self.vy[i]
+                self.life[i] -= 1
+                self.vy[i] += gravity
+                if self.life[i] > 0:
+                    count += 1
+        self._count = count
+
+    # ─── READ-OUT ─────────────────────────────────────────
+
+    def live(self) -> List[int]:
+        """Indices of live particles."""
+        if HAS_NUMPY:
+            return np.flatnonzero(self.life > 0)
+        return [i for i, l in enumerate(self.life) if l > 0]
+
+    def columns(self, idx, *fields: str) -> List[list]:
+        """The named fields of the given particles as plain Python lists."""
+        if HAS_NUMPY:
+            return [getattr(self, f)[idx].tolist() for f in fields]
+        return [[getattr(self, f)[i] for i in idx] for f in fields]
+
+    def alphas(self, idx) -> List[int]:
+        """0–255 opacity of the given particles, fading with remaining life."""
+        if HAS_NUMPY:
+            return (255 * self.life[idx] / self.max_life[idx]).astype(np.int32).tolist()
+        return [int(255 * self.life[i] / self.max_life[i]) for i in idx]
+
+    def bounds(self, pad: float = 0.0):
+        """(left, top, right, bottom) around all live particles, or None."""
+        idx = self.live()
+        if len(idx) == 0:
+            return None
+        if HAS_NUMPY:
+            xs, ys = self.x[idx], self.y[idx]
+            return (float(xs.min()) - pad, float(ys.min()) - pad,
+                    float(xs.max()) + pad, float(ys.max()) + pad)
+        xs, ys = self.columns(idx, "x", "y")
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
@@ -0,0 +1,246 @@
+"""
+MadVerse Genre Previews
+Small looping previews of each genre's background effect for the genre
+cards. Each loop is rendered once, offscreen at preview resolution, by a
+single shared AnimatedBackground and kept in a bounded pixmap cache. One
+scheduler plays every loop back: idle cards at a reduced rate, the hovered
+card at the full background frame rate.
+
+Rendering a loop takes tens of milliseconds, so it is done a few frames at a
+time, within RENDER_BUDGET_MS of each background frame. Loops are rendered
+at device pixel ratio 1 whatever the screen's, so the cache holds every
+genre on any display. Idle cards play their loop once per visit to the
+genre screen and then hold still; only the hovered card keeps animating.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generator, List, Optional
+
+from PyQt6.QtCore import QObject, QSize, Qt
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from data.genres import Genre
+from ui.animation_clock import get_animation_clock
+from ui.background import AnimatedBackground, ANIMATED_EFFECTS, FRAME_MS
+
+
+PREVIEW_SIZE = QSize(180, 60)       # device pixels; scaled up to the card when drawn
+LOOP_FRAMES = 60                    # 2 s at the background's frame rate
+WARMUP_TICKS = 90                   # let effects fill up before recording
+IDLE_STRIDE = 4                     # idle cards show every 4th frame (~7.5 fps)
+CACHE_BYTES = 16 * 1024 * 1024      # every genre (~2.6 MB per animated loop)
+PREVIEW_SEED = 7
+RENDER_BUDGET_MS = 3.0              # GUI time per frame spent rendering loops
+
+
+class PreviewCache:
+    """Least-recently-used frame sequences, bounded by total pixmap bytes."""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._loops: "OrderedDict[str, List[QPixmap]]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _size(frames: List[QPixmap]) -> int:
+        return sum(f.width() * f.height() * f.depth() // 8 for f in frames)
+
+    def get(self, key: str) -> Optional[List[QPixmap]]:
+        frames = self._loops.get(key)
+        if frames is not None:
+            self._loops.move_to_end(key)
+        return frames
+
+    def put(self, key: str, frames: List[QPixmap]):
+        if key in self._loops:
+            self._bytes -= self._size(self._loops.pop(key))
+        self._loops[key] = frames
+        self._bytes += self._size(frames)
+        # Evict oldest first, but always keep the loop just added
+        while self._bytes > self.max_bytes and len(self._loops) > 1:
+            _key, evicted = self._loops.popitem(last=False)
+            self._bytes -= self._size(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._loops
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+
+class PreviewScheduler(QObject):
+    """
+    Drives the preview of every registered card from the animation clock.
+
+    Missing loops are rendered one at a time, the hovered card's first, in
+    slices of at most RENDER_BUDGET_MS per frame. A loop is rendered at most
+    once per visit (start_visit()); if the cache evicts it during the visit
+    its card shows no preview rather than rendering it again. Frame indices
+    come from wall time, so a card keeps its place when it switches between
+    the idle and the hovered rate.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = PreviewCache()
+        self._cards: Dict[QWidget, Genre] = {}
+        self._hovered: Optional[QWidget] = None
+        self._renderer: Optional[AnimatedBackground] = None
+        self._job: Optional[Generator] = None
+        self._job_genre: Optional[Genre] = None
+        self._visit_rendered = set()        # genre ids rendered since start_visit()
+        self._play_until = 0.0              # idle cards animate until then
+        self._started = time.monotonic()
+        self._stats = {"render_ticks": 0, "render_ms": 0.0, "render_max_ms": 0.0, "loops": 0}
+
+    def register(self, card: QWidget, genre: Genre):
+        """card gets set_preview(QPixmap) calls while it is on screen."""
+        self._cards[card] = genre
+        card.destroyed.connect(lambda _=None, c=card: self._cards.pop(c, None))
+        if len(self._cards) == 1:
+            self.start_visit()
+
+    def start_visit(self):
+        """The cards are being shown (again): render what is missing, play every loop once."""
+        self._visit_rendered.clear()
+        self._play_for_one_loop()
+        anchor = self._anchor()
+        if anchor is not None:
+            get_animation_clock().subscribe(anchor, self._tick_render, FRAME_MS)
+
+    def set_hovered(self, card: Optional[QWidget]):
+        """Play card's preview at full rate (None: no card hovered)."""
+        clock = get_animation_clock()
+        if self._hovered is not None:
+            clock.unsubscribe(self._hovered, self._tick_hovered)
+        self._hovered = card
+        if card is not None:
+            clock.subscribe(card, self._tick_hovered, FRAME_MS)
+            self._show(card)
+
+    # ─── PLAYBACK ─────────────────────────────────────────
+
+    def _frame_index(self, length: int, stride: int) -> int:
+        tick = int((time.monotonic() - self._started) * 1000 / FRAME_MS)
+        return (tick - tick % stride) % length
+
+    def _show(self, card: QWidget):
+        frames = self.cache.get(self._cards[card].id)
+        if frames is None:
+            card.set_preview(None)      # not rendered yet, or evicted
+            return
+        stride = 1 if card is self._hovered else IDLE_STRIDE
+        card.set_preview(frames[self._frame_index(len(frames), stride)])
+
+    def stats(self) -> dict:
+        """Loops rendered, and GUI time spent rendering them (total and worst frame)."""
+        return dict(self._stats)
+
+    def _anchor(self) -> Optional[QWidget]:
+        """The card whose visibility drives the idle and render ticks."""
+        return next(iter(self._cards), None)
+
+    def _play_for_one_loop(self):
+        """Keep idle cards animating until every loop shown so far has played once."""
+        self._play_until = time.monotonic() + LOOP_FRAMES * FRAME_MS / 1000
+        anchor = self._anchor()
+        if anchor is not None:
+            get_animation_clock().subscribe(anchor, self._tick_idle, FRAME_MS * IDLE_STRIDE)
+
+    def _tick_idle(self):
+        for card in self._cards:
+            if card is not self._hovered:
+                self._show(card)
+        if self._job is None and self._next_missing() is None and time.monotonic() >= self._play_until:
+            # Every card holds its current frame until the next visit
+            get_animation_clock().unsubscribe(self._anchor(), self._tick_idle)
+
+    def _tick_hovered(self):
+        if self._hovered is not None:
+            self._show(self._hovered)
+
+    # ─── RENDERING ────────────────────────────────────────
+
+    def _next_missing(self) -> Optional[Genre]:
+        # The hovered card's loop first, then in card order
+        order = ([self._hovered] if self._hovered is not None else []) + list(self._cards)
+        for card in order:
+            genre = self._cards[card]
+            if genre.id not in self.cache and genre.id not in self._visit_rendered:
+                return genre
+        return None
+
+    def _tick_render(self):
+        """Advance the loop being rendered for up to RENDER_BUDGET_MS."""
+        started = time.perf_counter()
+        deadline = started + RENDER_BUDGET_MS / 1000
+        while time.perf_counter() < deadline:
+            if self._job is None:
+                genre = self._next_missing()
+                if genre is None:
+                    get_animation_clock().unsubscribe(self._anchor(), self._tick_render)
+                    break
+                self._job, self._job_genre = self._render_steps(genre), genre
+            try:
+                next(self._job)
+            except StopIteration as done:
+                self.cache.put(self._job_genre.id, done.value)
+                self._visit_rendered.add(self._job_genre.id)
+                self._stats["loops"] += 1
+                self._job = self._job_genre = None
+                self._play_for_one_loop()
+        elapsed = (time.perf_counter() - started) * 1000
+        self._stats["render_ticks"] += 1
+        self._stats["render_ms"] += elapsed
+        self._stats["render_max_ms"] = max(self._stats["render_max_ms"], elapsed)
+
+    def render_loop(self, genre: Genre) -> List[QPixmap]:
+        """Genre's background as a frame loop (one frame for static effects), in one go."""
+        steps = self._render_steps(genre)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
+
+    def _render_steps(self, genre: Genre) -> Generator[None, None, List[QPixmap]]:
+        """Render genre's loop, yielding after every simulated or grabbed frame."""
+        bg = self._renderer
+        if bg is None:
+            bg = self._renderer = AnimatedBackground(seed=PREVIEW_SEED, threaded=False)
+            bg.adaptive = False
+            bg.resize(PREVIEW_SIZE)
+        bg.set_effect(genre.theme.effect, genre.theme)
+        animated = genre.theme.effect in ANIMATED_EFFECTS
+        if not animated:
+            return [self._grab(bg)]
+        for _ in range(WARMUP_TICKS):
+            yield
+            bg._update()
+        frames = []
+        for _ in range(LOOP_FRAMES):
+            yield
+            bg._update()
+            frames.append(self._grab(bg))
+        return frames
+
+    @staticmethod
+    def _grab(bg: AnimatedBackground) -> QPixmap:
+        """bg at device pixel ratio 1 (grab() would use the screen's)."""
+        pixmap = QPixmap(bg.size())
+        pixmap.fill(Qt.GlobalColor.transparent)
+        bg.render(pixmap)
+        return pixmap
+
+
+# Singleton
+_scheduler: Optional[PreviewScheduler] = None
+
+def get_preview_scheduler() -> PreviewScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PreviewScheduler()
+    return _scheduler
@@ -0,0 +1,254 @@
+"""
+MadVerse Background Simulation
+Steps the animated background's particles and per-tick effect state off the
+GUI thread. Each step publishes an immutable FrameSnapshot into a double
+buffer; the widget only ever reads the latest complete snapshot, so heavy
+effects never stall typing or text reveal.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ui.particles import ParticleSystem, CIRCLE, STAR, HEART, CHAR
+
+
+# Particle palette (ParticleSystem stores indices into this)
+PARTICLE_COLORS = [
+    (255, 215, 0),      # sparkle gold
+    (255, 80, 120),     # hearts pink
+    (0, 255, 80),       # matrix green
+    (120, 80, 200),     # void purple
+]
+GOLD, PINK, GREEN, PURPLE = range(len(PARTICLE_COLORS))
+
+# Steady-state live particles per effect at full quality: spawned per tick ×
+# mean life, from the spawn calls in _advance. Quality levels below the best
+# cap the population at a share of this.
+EFFECT_POPULATION = {
+    "sparkle": 37,      # 2 every 3 ticks, life 30–80
+    "hearts": 15,       # 1 every 6 ticks, life 60–120
+    "matrix": 53,       # 3 every 4 ticks, life 40–100
+    "void": 9,          # 1 every 8 ticks, life 50–100
+}
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """
+    One simulated tick, ready to paint. Particle columns are parallel
+    tuples of plain Python numbers (x, y, size, life, color, shape, alpha)
+    for the live particles only.
+    """
+    tick: int = 0
+    effect: str = "none"
+    columns: Tuple[tuple, ...] = ((),) * 7
+    bounds: Optional[Tuple[float, float, float, float]] = None
+    flicker_alpha: int = 255
+    noise_lines: Tuple[int, ...] = ()
+    glitch_active: bool = False
+    glitch_offset: int = 0
+    step_ms: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+
+EMPTY_FRAME = FrameSnapshot()
+
+
+class ParticleSimulation:
+    """
+    Owns the ParticleSystem and every random draw of the background.
+
+    request_step(w, h) asks for the next tick; latest() returns the newest
+    published snapshot. With threaded=True steps run on a worker thread that
+    sleeps until asked, and requests that arrive while a step is running are
+    coalesced. With threaded=False (benchmarks, reproducible renders) each
+    request steps inline.
+    """
+
+    def __init__(self, seed: Optional[int] = None, threaded: bool = True):
+        self.particles = ParticleSystem(seed=seed)
+        self.threaded = threaded
+        self._rng = random.Random(seed)
+        self._effect = "none"
+        self._tick = 0
+        self._particle_share = 1.0
+        self._spawn_scale = 1.0
+        self._spawn_credit = 0.0
+        self._flicker_alpha = 255
+        self._noise_lines: Tuple[int, ...] = ()
+        self._glitch_active = False
+        self._glitch_offset = 0
+
+        # Guards the simulation state; held for a whole step + publish so a
+        # reconfigure can never be overtaken by a frame of the old effect
+        self._state_lock = threading.Lock()
+        # Double buffer: the worker fills the back slot, then flips
+        self._buffers = [EMPTY_FRAME, EMPTY_FRAME]
+        self._front = 0
+        self._swap_lock = threading.Lock()
+
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple[int, int]] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ─── CONTROL (GUI THREAD) ─────────────────────────────
+
+    def configure(self, effect: str):
+        """Switch effect: clears particles and publishes an empty frame."""
+        with self._state_lock:
+            self._effect = effect
+            self._tick = 0
+            self._spawn_credit = 0.0
+            self._noise_lines = ()
+            self._glitch_active = False
+            self._glitch_offset = 0
+            self.particles.clear()
+            self._apply_limit()
+            self._publish(FrameSnapshot(effect=effect))
+
+    def set_quality(self, particle_share: float, spawn_scale: float):
+        """Cap live particles at a share of the effect's population and scale spawn counts."""
+        with self._state_lock:
+            self._particle_share = particle_share
+            self._spawn_scale = spawn_scale
+            self._apply_limit()
+
+    def request_step(self, w: int, h: int):
+        """Ask for the next tick at widget size w × h."""
+        if not self.threaded:
+            self._step(w, h)
+            return
+        with self._cond:
+            self._pending = (w, h)
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(
+                    target=self._run, name="background-sim", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def latest(self) -> FrameSnapshot:
+        """The most recently completed frame."""
+        with self._swap_lock:
+            return self._buffers[self._front]
+
+    def stop(self):
+        """Stop the worker thread (it restarts on the next request)."""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._running = False
+            self._cond.notify()
+        if thread is not None:
+            thread.join(1.0)
+
+    # ─── WORKER ───────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                w, h = self._pending
+                self._pending = None
+            self._step(w, h)
+
+    def _publish(self, frame: FrameSnapshot):
+        back = 1 - self._front
+        self._buffers[back] = frame
+        with self._swap_lock:
+            self._front = back
+
+    def _apply_limit(self):
+        ps = self.particles
+        population = EFFECT_POPULATION.get(self._effect)
+        if population is None or self._particle_share >= 1:
+            ps.limit = ps.capacity
+        else:
+            ps.limit = max(1, int(population * self._particle_share))
+
+    def _spawn(self, n: int, **kwargs):
+        """Spawn n particles scaled by the current quality's spawn rate."""
+        self._spawn_credit += n * self._spawn_scale
+        count = int(self._spawn_credit)
+        if count:
+            self._spawn_credit -= count
+            self.particles.spawn(count, **kwargs)
+
+    def _step(self, w: int, h: int):
+        with self._state_lock:
+            started = time.perf_counter()
+            self._advance(w, h)
+            ps = self.particles
+            idx = ps.live()
+            columns = tuple(tuple(col) for col in ps.columns(
+                idx, "x", "y", "size", "life", "color", "shape")) + (tuple(ps.alphas(idx)),)
+            self._publish(FrameSnapshot(
+                tick=self._tick,
+                effect=self._effect,
+                columns=columns,
+                bounds=ps.bounds() if len(idx) else None,
+                flicker_alpha=self._flicker_alpha,
+                noise_lines=self._noise_lines,
+                glitch_active=self._glitch_active,
+                glitch_offset=self._glitch_offset,
+                step_ms=(time.perf_counter() - started) * 1000,
+            ))
+
+    def _advance(self, w: int, h: int):
+        self._tick += 1
+        self.particles.step()
+
+        # Spawn new particles based on effect
+        if w == 0 or h == 0:
+            return
+
+        rng = self._rng
+        spawn = self._spawn
+        effect = self._effect
+        if effect == "sparkle":
+            if self._tick % 3 == 0:
+                spawn(2, x=(0, w), y=(0, h), vx=(-0.5, 0.5), vy=(-1.5, -0.5),
+                      life=(30, 80), size=(1.5, 4), color=GOLD, shape=STAR)
+
+        elif effect == "hearts":
+            if self._tick % 6 == 0:
+                spawn(1, x=(w * 0.1, w * 0.9), y=h + 20, vx=(-0.3, 0.3), vy=(-1.5, -0.8),
+                      life=(60, 120), size=(8, 18), color=PINK, shape=HEART)
+
+        elif effect == "matrix":
+            if self._tick % 4 == 0:
+                spawn(3, x=(0, w), y=0, vx=0, vy=(2, 6),
+                      life=(40, 100), size=(8, 14), color=GREEN, shape=CHAR)
+
+        elif effect == "void":
+            if self._tick % 8 == 0:
+                spawn(1, x=w / 2, y=h / 2, vx=(-2, 2), vy=(-2, 2),
+                      life=(50, 100), size=(1, 3), color=PURPLE, shape=CIRCLE)
+
+        # Flicker effect
+        if effect == "flicker":
+            if rng.random() < 0.03:
+                self._flicker_alpha = rng.randint(180, 255)
+            else:
+                self._flicker_alpha = min(255, self._flicker_alpha + 5)
+            # Random noise lines
+            self._noise_lines = ()
+            if rng.random() < 0.1:
+                self._noise_lines = tuple(rng.randint(0, h) for _ in range(rng.randint(1, 3)))
+
+        # Glitch effect
+        if effect == "glitch":
+            if rng.random() < 0.05:
+                self._glitch_active = True
+                self._glitch_offset = rng.randint(-8, 8)
+            else:
+                self._glitch_active = False
+                self._glitch_offset = 0
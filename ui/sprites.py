@@ -0,0 +1,175 @@
+"""
+MadVerse Sprite Atlases
+Pre-rasterized glyphs and shapes for the animated background, drawn in
+batches with QPainter.drawPixmapFragments instead of one draw call (and one
+font lookup or path build) per particle.
+"""
+
+import math
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import (QColor, QFont, QFontMetricsF, QPainter, QPainterPath,
+                         QPixmap, QPolygonF)
+
+
+Fragment = QPainter.PixmapFragment
+
+
+class GlyphAtlas:
+    """
+    Every character of `chars` rendered at each point size in `sizes` into
+    one pixmap: one row per size, one cell per character.
+    """
+
+    def __init__(self, chars: str, sizes: Sequence[int], color: QColor,
+                 family: str = "Courier New", dpr: float = 1.0):
+        self.chars = chars
+        self.sizes = list(sizes)
+        self.dpr = dpr
+        self._index = {c: i for i, c in enumerate(chars)}
+        # size → (cell width, cell height, ascent) in logical pixels
+        self._cells: Dict[int, Tuple[float, float, float]] = {}
+        self._rows: Dict[int, float] = {}
+        self._glyph_cache: Dict[Tuple[str, int], Tuple[QRectF, float, float]] = {}
+        self._scale = 1 / dpr   # source rects are in device pixels
+
+        fonts = {}
+        width = height = 0.0
+        for size in self.sizes:
+            font = QFont(family, size)
+            fm = QFontMetricsF(font)
+            cell_w = max(fm.horizontalAdvance(c) for c in chars) + 2
+            cell_h = fm.height() + 2
+            fonts[size] = font
+            self._cells[size] = (cell_w, cell_h, fm.ascent() + 1)
+            self._rows[size] = height
+            width = max(width, cell_w * len(chars))
+            height += cell_h
+
+        self.pixmap = QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+        self.pixmap.setDevicePixelRatio(dpr)
+        self.pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setPen(color)
+        for size in self.sizes:
+            cell_w, _cell_h, ascent = self._cells[size]
+            painter.setFont(fonts[size])
+            top = self._rows[size]
+            for i, c in enumerate(chars):
+                painter.drawText(QPointF(i * cell_w + 1, top + ascent), c)
+        painter.end()
+
+    def nearest_size(self, size: float) -> int:
+        return min(self.sizes, key=lambda s: abs(s - size))
+
+    def fragment(self, char: str, size: int, x: float, y: float, opacity: float) -> Fragment:
+        """A fragment drawing `char` with its baseline origin at (x, y), like drawText."""
+        source, dx, dy = self._glyph(char, size)
+        return Fragment.create(QPointF(x + dx, y + dy), source, self._scale, self._scale, 0, opacity)
+
+    def _glyph(self, char: str, size: int):
+        """(source rect, centre offset x, centre offset y), cached per glyph."""
+        key = (char, size)
+        glyph = self._glyph_cache.get(key)
+        if glyph is None:
+            if size not in self._cells:
+                size = self.nearest_size(size)
+            cell_w, cell_h, ascent = self._cells[size]
+            d = self.dpr
+            source = QRectF(self._index[char] * cell_w * d, self._rows[size] * d,
+                            cell_w * d, cell_h * d)
+            # Fragments are positioned by their centre, in device-independent pixels
+            glyph = self._glyph_cache[key] = (source, cell_w / 2 - 1, cell_h / 2 - ascent)
+        return glyph
+
+    def draw(self, painter: QPainter, fragments: List[Fragment]):
+        if fragments:
+            painter.drawPixmapFragments(fragments, self.pixmap)
+
+
+# ─────────────────────────────────────────────────────────────
+# SHAPES
+# ─────────────────────────────────────────────────────────────
+
+def star_polygon(cx: float, cy: float, r: float) -> QPolygonF:
+    """Five-pointed star of outer radius r centred on (cx, cy)."""
+    points = []
+    ir = r * 0.4
+    for i in range(5):
+        angle = math.radians(i * 72 - 90)
+        points.append(QPointF(cx + r * math.cos(angle), cy + r * math.sin(angle)))
+        angle2 = math.radians(i * 72 - 90 + 36)
+        points.append(QPointF(cx + ir * math.cos(angle2), cy + ir * math.sin(angle2)))
+    return QPolygonF(points)
+
+
+def heart_path(cx: float, cy: float, r: float) -> QPainterPath:
+    """Heart of size r anchored at (cx, cy)."""
+    path = QPainterPath()
+    path.moveTo(cx, cy + r * 0.3)
+    path.cubicTo(cx - r * 1.1, cy - r * 0.3,
+                 cx - r * 1.1, cy - r,
+                 cx, cy - r * 0.4)
+    path.cubicTo(cx + r * 1.1, cy - r,
+                 cx + r * 1.1, cy - r * 0.3,
+                 cx, cy + r * 0.3)
+    return path
+
+
+def draw_circle(painter: QPainter, cx: float, cy: float, r: float):
+    painter.drawEllipse(QRectF(cx - r, cy - r, r * 2, r * 2))
+
+
+def draw_star(painter: QPainter, cx: float, cy: float, r: float):
+    painter.drawPolygon(star_polygon(cx, cy, r))
+
+
+def draw_heart(painter: QPainter, cx: float, cy: float, r: float):
+    painter.drawPath(heart_path(cx, cy, r))
+
+
+class ShapeAtlas:
+    """
+    One filled shape pre-rendered in `color` at sizes lo, lo+step, … hi,
+    laid out in a single row. Each sprite's anchor (the shape's cx, cy) is
+    at the centre of its cell, so fragments are placed at particle positions.
+    """
+
+    def __init__(self, draw: Callable[[QPainter, float, float, float], None],
+                 lo: float, hi: float, step: float, color: QColor, dpr: float = 1.0):
+        self.lo = lo
+        self.step = step
+        self.dpr = dpr
+        self._scale = 1 / dpr
+        count = int(round((hi - lo) / step)) + 1
+        sizes = [lo + i * step for i in range(count)]
+        # Shapes reach ~1.1 r from their anchor; leave room for antialiasing
+        extents = [math.ceil(size * 1.2) + 2 for size in sizes]
+
+        width = sum(2 * e for e in extents)
+        height = 2 * max(extents)
+        self.pixmap = QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+        self.pixmap.setDevicePixelRatio(dpr)
+        self.pixmap.fill(Qt.GlobalColor.transparent)
+
+        self._sources: List[QRectF] = []
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        left = 0
+        for size, e in zip(sizes, extents):
+            draw(painter, left + e, e, size)
+            self._sources.append(QRectF(left * dpr, 0, 2 * e * dpr, 2 * e * dpr))
+            left += 2 * e
+        painter.end()
+
+    def fragment(self, x: float, y: float, size: float, opacity: float) -> Fragment:
+        i = min(len(self._sources) - 1, max(0, int(round((size - self.lo) / self.step))))
+        return Fragment.create(QPointF(x, y), self._sources[i], self._scale, self._scale, 0, opacity)
+
+    def draw(self, painter: QPainter, fragments: List[Fragment]):
+        if fragments:
+            painter.drawPixmapFragments(fragments, self.pixmap)
@@ -2,15 +2,37 @@
 MadVerse Stats & Achievements Screen
 """
 
+import time
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QScrollArea, QFrame, QGridLayout,
-    QSizePolicy
+    QPushButton, QFrame, QGridLayout, QListView,
+    QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QCursor
+from PyQt6.QtCore import (Qt, pyqtSignal, QAbstractListModel, QModelIndex,
+                          QSortFilterProxyModel, QSize, QRectF, QPointF)
+from PyQt6.QtGui import QFont, QCursor, QColor, QPainter, QPainterPath, QPen
+
+from data.stats import get_tracker
+from data.rollups import lttb
+
+
+# (label, summary keys it depends on, formatter)
+STAT_BOXES = [
+    ("Stories Generated", ("total_stories",), lambda s: str(s["total_stories"])),
+    ("Stories Saved",     ("stories_saved",), lambda s: str(s["stories_saved"])),
+    ("Regenerations",     ("regenerations",), lambda s: str(s["regenerations"])),
+    ("Favorite Genre",    ("favorite_genre",),
+        lambda s: s["favorite_genre"].title() if s["favorite_genre"] != "none" else "—"),
+    ("Most Used Word",    ("most_used_word",),
+        lambda s: s["most_used_word"].title() if s["most_used_word"] != "none yet" else "—"),
+    ("Achievements",      ("achievements_unlocked", "total_achievements"),
+        lambda s: f"{s['achievements_unlocked']}/{s['total_achievements']}"),
+]
 
-from data.stats import get_tracker, ACHIEVEMENTS
+# Custom item roles
+ACHIEVEMENT_ROLE = Qt.ItemDataRole.UserRole + 1
+SORT_ROLE = Qt.ItemDataRole.UserRole + 2
 
 
 class StatBox(QFrame):
@@ -23,80 +45,219 @@ class StatBox(QFrame):
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.setSpacing(4)
 
-        num_lbl = QLabel(str(number))
-        num_lbl.setObjectName("stat_number")
-        num_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._num_lbl = QLabel(str(number))
+        self._num_lbl.setObjectName("stat_number")
+        self._num_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         lbl = QLabel(label.upper())
         lbl.setObjectName("stat_label")
         lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        layout.addWidget(num_lbl)
+        layout.addWidget(self._num_lbl)
         layout.addWidget(lbl)
 
+    def set_value(self, number: str):
+        self._num_lbl.setText(str(number))
 
-class AchievementCard(QFrame):
-    """Single achievement display."""
-    def __init__(self, ach: dict, parent=None):
-        super().__init__(parent)
-        self.setObjectName("card")
-        self.setMinimumHeight(70)
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(16, 12, 16, 12)
-        layout.setSpacing(14)
-
-        unlocked = ach.get("unlocked", False)
-
-        # Icon
-        icon_lbl = QLabel(ach["icon"] if unlocked else "🔒")
-        icon_lbl.setFont(QFont("Segoe UI Emoji", 22))
-        icon_lbl.setFixedWidth(40)
-        icon_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(icon_lbl)
 
-        # Text
-        text_col = QVBoxLayout()
-        text_col.setSpacing(2)
+class AchievementListModel(QAbstractListModel):
+    """Achievement catalogue with unlock state; unlocks update single rows."""
 
-        name_lbl = QLabel(ach["name"])
-        name_lbl.setObjectName("achievement_name")
-        if not unlocked:
-            name_lbl.setStyleSheet("color: #666666;")
-
-        desc_lbl = QLabel(ach["desc"])
-        desc_lbl.setObjectName("achievement_desc")
-        if not unlocked:
-            desc_lbl.setStyleSheet("color: #444444;")
-
-        text_col.addWidget(name_lbl)
-        text_col.addWidget(desc_lbl)
-        layout.addLayout(text_col)
-        layout.addStretch()
+    def __init__(self, achievements: list, parent=None):
+        super().__init__(parent)
+        self._achievements = achievements
+        self._rows = {a["id"]: i for i, a in enumerate(achievements)}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._achievements)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ach = self._achievements[index.row()]
+        if role == ACHIEVEMENT_ROLE:
+            return ach
+        if role == SORT_ROLE:
+            # Unlocked first, then by name
+            return f"{0 if ach['unlocked'] else 1}{ach['name']}"
+        if role == Qt.ItemDataRole.DisplayRole:
+            return ach["name"]
+        return None
+
+    def set_unlocked(self, ach_id: str):
+        row = self._rows.get(ach_id)
+        if row is None or self._achievements[row]["unlocked"]:
+            return
+        self._achievements[row]["unlocked"] = True
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx)
+
+
+class AchievementDelegate(QStyledItemDelegate):
+    """Paints one achievement row: icon, name, description and status badge."""
+    ROW_HEIGHT = 78
 
-        # Status badge
-        if unlocked:
-            badge = QLabel("✓ UNLOCKED")
-            badge.setStyleSheet("color: #00cc66; font-size: 10px; font-weight: bold; letter-spacing: 1px;")
-        else:
-            badge = QLabel("LOCKED")
-            badge.setStyleSheet("color: #555555; font-size: 10px; letter-spacing: 1px;")
-        badge.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        layout.addWidget(badge)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._theme = None
+        self._icon_font = QFont("Segoe UI Emoji", 22)
+        self._name_font = QFont("Georgia", 11, QFont.Weight.Bold)
+        self._desc_font = QFont("Georgia", 9)
+        self._badge_font = QFont("Georgia", 8, QFont.Weight.Bold)
+        self._badge_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1)
+
+    def set_theme(self, theme):
+        self._theme = theme
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index):
+        ach = index.data(ACHIEVEMENT_ROLE)
+        if ach is None or self._theme is None:
+            return super().paint(painter, option, index)
+
+        theme = self._theme
+        unlocked = ach["unlocked"]
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = QRectF(option.rect).adjusted(0, 4, -8, -4)
+        painter.setPen(QColor(theme.card_border))
+        painter.setBrush(QColor(theme.card_color))
+        painter.drawRoundedRect(rect, 12, 12)
+
+        inner = rect.adjusted(16, 10, -16, -10)
+        icon_rect = QRectF(inner.left(), inner.top(), 40, inner.height())
+        painter.setFont(self._icon_font)
+        painter.setPen(QColor(theme.text_color))
+        painter.drawText(icon_rect, Qt.AlignmentFlag.AlignCenter, ach["icon"] if unlocked else "🔒")
+
+        text_left = icon_rect.right() + 14
+        badge_w = 110
+        text_rect = QRectF(text_left, inner.top(), inner.right() - text_left - badge_w, inner.height())
+        half = text_rect.height() / 2
+        painter.setFont(self._name_font)
+        painter.setPen(QColor(theme.text_color if unlocked else "#666666"))
+        painter.drawText(QRectF(text_rect.left(), text_rect.top(), text_rect.width(), half),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom, ach["name"])
+        painter.setFont(self._desc_font)
+        painter.setPen(QColor(theme.accent_secondary if unlocked else "#444444"))
+        painter.drawText(QRectF(text_rect.left(), text_rect.top() + half + 2, text_rect.width(), half),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, ach["desc"])
+
+        painter.setFont(self._badge_font)
+        painter.setPen(QColor("#00cc66" if unlocked else "#555555"))
+        painter.drawText(QRectF(inner.right() - badge_w, inner.top(), badge_w, inner.height()),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         "✓ UNLOCKED" if unlocked else "LOCKED")
+        painter.restore()
+
+
+class UsageChart(QWidget):
+    """
+    Stories-over-time line chart drawn from a fixed-size rollup window, so
+    cost does not grow with history. Series are reduced with LTTB to about
+    one point per few pixels and the path is cached until data or size change.
+    """
+    PX_PER_POINT = 6
+    DATE_FORMATS = {"hour": "%a %H:%M", "day": "%b %d, %Y", "week": "%b %d, %Y"}
 
-        # Dim locked cards
-        if not unlocked:
-            self.setStyleSheet(self.styleSheet() + "QFrame { opacity: 0.5; }")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(90)
+        self._theme = None
+        self._resolution = "day"
+        self._series = []
+        self._path = None
+        self._max = 0
+        self._label_font = QFont("Georgia", 8)
+
+    def set_theme(self, theme):
+        self._theme = theme
+        self.update()
+
+    def set_resolution(self, resolution: str):
+        self._resolution = resolution
+        self.reload()
+
+    def reload(self):
+        self._series = get_tracker().rollups[self._resolution].series("stories")
+        self._path = None
+        self.update()
+
+    def is_stale(self) -> bool:
+        """True once the current bucket is past the last one loaded."""
+        if not self._series:
+            return True
+        rollup = get_tracker().rollups[self._resolution]
+        return rollup.bucket_of(time.time()) != self._series[-1][0]
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._path = None
+
+    def _build_path(self, plot: QRectF):
+        points = lttb(self._series, max(3, int(plot.width() // self.PX_PER_POINT)))
+        self._max = max((v for _, v in points), default=0)
+        first, last = self._series[0][0], self._series[-1][0]
+        span = max(1, last - first)
+        scale = plot.height() / max(1, self._max)
+
+        path = QPainterPath()
+        for i, (b, v) in enumerate(points):
+            pt = QPointF(plot.left() + (b - first) / span * plot.width(), plot.bottom() - v * scale)
+            if i == 0:
+                path.moveTo(pt)
+            else:
+                path.lineTo(pt)
+        self._path = path
+
+    def paintEvent(self, event):
+        if self._theme is None or not self._series:
+            return
+        theme = self._theme
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        plot = QRectF(self.rect()).adjusted(8, 8, -8, -22)
+        if self._path is None:
+            self._build_path(plot)
+
+        painter.setPen(QPen(QColor(theme.card_border), 1))
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+
+        painter.setPen(QPen(QColor(theme.accent_color), 2))
+        painter.drawPath(self._path)
+
+        rollup = get_tracker().rollups[self._resolution]
+        fmt = self.DATE_FORMATS[self._resolution]
+        painter.setFont(self._label_font)
+        painter.setPen(QColor(theme.accent_secondary))
+        label_rect = QRectF(plot.left(), plot.bottom() + 4, plot.width(), 16)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignLeft,
+                         rollup.bucket_start(self._series[0][0]).strftime(fmt))
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignRight,
+                         rollup.bucket_start(self._series[-1][0]).strftime(fmt))
+        painter.drawText(plot, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                         f"peak {self._max:g}")
+        painter.end()
 
 
 class StatsScreen(QWidget):
-    """Full stats and achievements screen."""
+    """
+    Full stats and achievements screen.
+    Built once; tracker change notifications are queued and applied in
+    place by refresh(), so opening the screen only touches changed values.
+    """
     back_requested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._pending_changes: dict = {}
+        self._pending_unlocks: list = []
         self._build_ui()
+        get_tracker().add_listener(self._on_tracker_changed)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -125,29 +286,53 @@ class StatsScreen(QWidget):
 
         # ─── STATS GRID ───────────────────────────────────
         tracker = get_tracker()
-        summary = tracker.get_stats_summary()
+        self._summary = tracker.get_stats_summary()
 
         stats_grid = QGridLayout()
         stats_grid.setSpacing(12)
 
-        stat_data = [
-            (str(summary["total_stories"]),         "Stories Generated"),
-            (str(summary["stories_saved"]),          "Stories Saved"),
-            (str(summary["regenerations"]),          "Regenerations"),
-            (summary["favorite_genre"].title() if summary["favorite_genre"] != "none" else "—",
-                                                     "Favorite Genre"),
-            (summary["most_used_word"].title() if summary["most_used_word"] != "none yet" else "—",
-                                                     "Most Used Word"),
-            (f"{summary['achievements_unlocked']}/{summary['total_achievements']}",
-                                                     "Achievements"),
-        ]
-
-        for i, (num, lbl) in enumerate(stat_data):
-            box = StatBox(num, lbl)
+        self._stat_boxes = []
+        for i, (lbl, keys, fmt) in enumerate(STAT_BOXES):
+            box = StatBox(fmt(self._summary), lbl)
+            self._stat_boxes.append((keys, fmt, box))
             stats_grid.addWidget(box, i // 3, i % 3)
 
         root.addLayout(stats_grid)
-        root.addSpacing(28)
+        root.addSpacing(20)
+
+        # ─── USAGE OVER TIME ──────────────────────────────
+        chart_hdr = QHBoxLayout()
+        chart_title = QLabel("📈  Usage Over Time")
+        chart_title.setObjectName("section_title")
+        chart_hdr.addWidget(chart_title)
+        chart_hdr.addSpacing(12)
+        self._mix_lbl = QLabel(self._format_mix(self._summary))
+        self._mix_lbl.setObjectName("hint_label")
+        chart_hdr.addWidget(self._mix_lbl)
+        chart_hdr.addStretch()
+
+        self._chart = UsageChart()
+        self._res_buttons = {}
+        for res, text in (("hour", "Hours"), ("day", "Days"), ("week", "Weeks")):
+            btn = QPushButton(text)
+            btn.setObjectName("secondary_btn")
+            btn.setCheckable(True)
+            btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+            btn.clicked.connect(lambda checked, r=res: self._set_resolution(r))
+            chart_hdr.addWidget(btn)
+            self._res_buttons[res] = btn
+        root.addLayout(chart_hdr)
+        root.addSpacing(8)
+
+        chart_frame = QFrame()
+        chart_frame.setObjectName("card")
+        chart_frame.setFixedHeight(120)
+        chart_layout = QVBoxLayout(chart_frame)
+        chart_layout.setContentsMargins(4, 4, 4, 4)
+        chart_layout.addWidget(self._chart)
+        root.addWidget(chart_frame)
+        root.addSpacing(20)
+        self._set_resolution("day")
 
         # ─── ACHIEVEMENTS ─────────────────────────────────
         ach_title = QLabel("🏆  Achievements")
@@ -155,38 +340,70 @@ class StatsScreen(QWidget):
         root.addWidget(ach_title)
         root.addSpacing(12)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setContentsMargins(0, 0, 8, 0)
-        scroll_layout.setSpacing(8)
-
-        achievements = tracker.get_all_achievements()
-        # Sort: unlocked first
-        achievements.sort(key=lambda a: (0 if a["unlocked"] else 1, a["name"]))
-
-        for ach in achievements:
-            card = AchievementCard(ach)
-            scroll_layout.addWidget(card)
-        scroll_layout.addStretch()
-
-        scroll.setWidget(scroll_content)
-        root.addWidget(scroll, stretch=1)
+        self._ach_model = AchievementListModel(tracker.get_all_achievements(), self)
+        self._ach_proxy = QSortFilterProxyModel(self)
+        self._ach_proxy.setSourceModel(self._ach_model)
+        self._ach_proxy.setSortRole(SORT_ROLE)
+        self._ach_proxy.setDynamicSortFilter(True)
+        self._ach_proxy.sort(0)
+
+        self._ach_delegate = AchievementDelegate(self)
+        self._ach_list = QListView()
+        self._ach_list.setObjectName("achievement_list")
+        self._ach_list.setModel(self._ach_proxy)
+        self._ach_list.setItemDelegate(self._ach_delegate)
+        self._ach_list.setUniformItemSizes(True)
+        self._ach_list.setFrameShape(QFrame.Shape.NoFrame)
+        self._ach_list.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self._ach_list.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self._ach_list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self._ach_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        root.addWidget(self._ach_list, stretch=1)
         self.setLayout(root)
 
+    def set_theme(self, theme):
+        self._ach_delegate.set_theme(theme)
+        self._ach_list.viewport().update()
+        self._chart.set_theme(theme)
+
+    def _set_resolution(self, resolution: str):
+        for res, btn in self._res_buttons.items():
+            btn.setChecked(res == resolution)
+        self._chart.set_resolution(resolution)
+
+    @staticmethod
+    def _format_mix(summary: dict) -> str:
+        text = f"AI {summary['ai_stories']}  ·  Local {summary['local_stories']}"
+        if summary["avg_ai_latency"] is not None:
+            text += f"  ·  avg AI wait {summary['avg_ai_latency']:.1f}s"
+        return text
+
+    def _on_tracker_changed(self, changed: dict, unlocked_ids: list):
+        self._pending_changes.update(changed)
+        self._pending_unlocks.extend(unlocked_ids)
+        if self.isVisible():
+            self.refresh()
+
     def refresh(self):
-        """Rebuild the screen with fresh data."""
-        # Clear and rebuild
-        layout = self.layout()
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self._build_ui()
+        """Apply stat and achievement changes queued since the last refresh."""
+        # The window ends at the current bucket, so it also moves with the clock
+        reload_chart = self._chart.is_stale()
+        if self._pending_changes:
+            changed = self._pending_changes
+            self._pending_changes = {}
+            self._summary.update(changed)
+            for keys, fmt, box in self._stat_boxes:
+                if any(k in changed for k in keys):
+                    box.set_value(fmt(self._summary))
+            if "total_stories" in changed:
+                self._mix_lbl.setText(self._format_mix(self._summary))
+                reload_chart = True
+        if reload_chart:
+            self._chart.reload()
+
+        unlocks, self._pending_unlocks = self._pending_unlocks, []
+        for ach_id in unlocks:
+            self._ach_model.set_unlocked(ach_id)
 
 
 class AchievementPopup(QFrame):
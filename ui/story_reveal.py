@@ -317,7 +317,8 @@ class StoryRevealScreen(QWidget):
         self.setLayout(root)
         self._speed = 600  # ms between parts
 
-    def show_story(self, genre: Genre, words: dict, parts: list, is_ai: bool = False):
+    def show_story(self, genre: Genre, words: dict, parts: list, is_ai: bool = False,
+                   instant: bool = False):
         self._genre = genre
         self._words = words
         self._parts = parts
@@ -327,6 +328,8 @@ class StoryRevealScreen(QWidget):
         self._action_frame.setVisible(False)
 
         self._reveal_widget.start_reveal(parts, genre.theme, self._speed)
+        if instant:
+            self._reveal_widget.reveal_all_instantly()
 
     def _on_reveal_complete(self):
         self._action_frame.setVisible(True)
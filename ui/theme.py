@@ -1,9 +1,17 @@
 """
 MadVerse Theme System
 Per-genre QSS stylesheets and shared UI constants.
+Stylesheets and story format tables are built once per genre and cached;
+the window carries all genres in one stylesheet, selected by THEME_PROPERTY.
 """
 
-from data.genres import GenreTheme
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from data.genres import Genre, GenreTheme
 
 
 GOOGLE_FONTS_CSS = """
@@ -213,6 +221,13 @@ QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
     height: 0;
 }}
 
+/* ─── DELEGATE-PAINTED LISTS ─────────────────────────────── */
+QListView#history_list, QListView#achievement_list {{
+    background-color: transparent;
+    border: none;
+    outline: none;
+}}
+
 /* ─── STORY TEXT ─────────────────────────────────────────── */
 QTextEdit#story_text {{
     background-color: transparent;
@@ -327,9 +342,9 @@ QCheckBox::indicator:checked {{
 """
 
 
-def get_story_type_format(part_type: str, theme: GenreTheme) -> dict:
-    """Return formatting hints for each story segment type."""
-    formats = {
+def _build_story_formats(theme: GenreTheme) -> Dict[str, dict]:
+    """Formatting hints for every story segment type."""
+    return {
         "opening": {
             "color": theme.text_color,
             "size": 15,
@@ -387,4 +402,91 @@ def get_story_type_format(part_type: str, theme: GenreTheme) -> dict:
             "margin_top": 12,
         },
     }
+
+
+# ─────────────────────────────────────────────────────────────
+# CACHES
+# ─────────────────────────────────────────────────────────────
+
+# Property naming the genre a themed subtree (settings bar, screen) shows.
+# The genre rules are selected on it, so one stylesheet covers every genre.
+THEME_PROPERTY = "theme_genre"
+
+_QSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_QSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+_stylesheets: Dict[str, str] = {}
+_app_stylesheet: Optional[str] = None
+# Keyed by the colors the formats use
+_story_formats: Dict[Tuple[str, ...], Dict[str, dict]] = {}
+
+
+def get_stylesheet(theme: GenreTheme, genre_id: str) -> str:
+    """build_main_stylesheet, built once per genre."""
+    stylesheet = _stylesheets.get(genre_id)
+    if stylesheet is None:
+        stylesheet = _stylesheets[genre_id] = build_main_stylesheet(theme, genre_id)
+    return stylesheet
+
+
+def _scope_stylesheet(stylesheet: str, genre_id: str) -> str:
+    """Restrict every rule to widgets inside a THEME_PROPERTY == genre_id subtree."""
+    scope = f'[{THEME_PROPERTY}="{genre_id}"]'
+    rules = []
+    for selectors, body in _QSS_RULE.findall(_QSS_COMMENT.sub("", stylesheet)):
+        selectors = [" ".join(sel.split()) for sel in selectors.split(",")]
+        scoped = [f"*{scope} {sel}" for sel in selectors]
+        if "QWidget" in selectors:
+            scoped.append(f"QWidget{scope}")     # the subtree root itself
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return "\n".join(rules)
+
+
+def build_app_stylesheet(genres: Iterable[Genre]) -> str:
+    """Every genre's stylesheet in one, each scoped to its THEME_PROPERTY value."""
+    global _app_stylesheet
+    if _app_stylesheet is None:
+        _app_stylesheet = "\n".join(
+            _scope_stylesheet(get_stylesheet(genre.theme, genre.id), genre.id)
+            for genre in genres
+        )
+    return _app_stylesheet
+
+
+def apply_theme(widget: QWidget, genre_id: str) -> bool:
+    """
+    Show widget (and its children) in genre_id unless it already is.
+    Needs build_app_stylesheet set on an ancestor. Only the property changes;
+    the subtree is re-polished, as setStyleSheet would, so the style picks up
+    the newly matching rules without re-parsing any stylesheet.
+    Returns whether it restyled, so the caller should only apply to widgets
+    that are about to be seen.
+    """
+    if widget.property(THEME_PROPERTY) == genre_id:
+        return False
+    widget.setProperty(THEME_PROPERTY, genre_id)
+    for target in [widget, *widget.findChildren(QWidget)]:
+        style = target.style()
+        style.unpolish(target)
+        style.polish(target)
+        # Box model changes (frame width, margins) are taken up on StyleChange
+        QApplication.sendEvent(target, QEvent(QEvent.Type.StyleChange))
+    widget.update()
+    return True
+
+
+def get_story_type_format(part_type: str, theme: GenreTheme) -> dict:
+    """Formatting hints for a story segment type (shared; do not modify)."""
+    key = (theme.text_color, theme.highlight_color, theme.accent_secondary, theme.accent_color)
+    formats = _story_formats.get(key)
+    if formats is None:
+        formats = _story_formats[key] = _build_story_formats(theme)
     return formats.get(part_type, formats["middle"])
+
+
+def preload_themes(genres: Iterable[Genre]):
+    """Build every genre's stylesheet and format table up front."""
+    genres = list(genres)
+    build_app_stylesheet(genres)
+    for genre in genres:
+        get_story_type_format("middle", genre.theme)
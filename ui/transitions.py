@@ -0,0 +1,109 @@
+"""
+MadVerse Screen Transitions
+An overlay that hides screen switches and restyles behind two snapshots.
+cover() grabs the outgoing look once and holds it on top; the caller then
+restyles and switches screens underneath; reveal() grabs the incoming look
+once and cross-fades or slides between the two pixmaps. Each animation
+frame only composites those two pixmaps.
+"""
+
+import time
+from typing import Optional
+
+from PyQt6.QtCore import QEasingCurve
+from PyQt6.QtGui import QPainter, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from ui.animation_clock import get_animation_clock
+
+
+TRANSITION_MS = 220
+TRANSITION_FRAME_MS = 16    # ~60fps while a transition runs
+
+# Transition styles
+FADE = "fade"
+SLIDE_LEFT = "slide_left"       # incoming screen enters from the right
+SLIDE_RIGHT = "slide_right"     # incoming screen enters from the left
+
+
+class ScreenTransition(QWidget):
+    """
+    Child overlay of `target` (normally the central widget, so the animated
+    background is part of both snapshots). Hidden when idle.
+    """
+
+    def __init__(self, target: QWidget):
+        super().__init__(target)
+        self._target = target
+        self._outgoing: Optional[QPixmap] = None
+        self._incoming: Optional[QPixmap] = None
+        self._style = FADE
+        self._started = 0.0
+        self._progress = 0.0
+        self._easing = QEasingCurve(QEasingCurve.Type.OutCubic)
+        self.hide()
+
+    def is_active(self) -> bool:
+        return self.isVisible()
+
+    def cover(self):
+        """Freeze what target shows now, until reveal()."""
+        if not self._target.isVisible():
+            return
+        if self.isVisible():
+            if self._incoming is None:
+                return      # already covering
+            # Mid-animation: continue from what is on screen right now
+            get_animation_clock().unsubscribe(self)
+            self._outgoing = self.grab()
+            self._incoming = None
+        else:
+            self._outgoing = self._target.grab()
+        self.setGeometry(self._target.rect())
+        self.raise_()
+        self.show()
+
+    def reveal(self, style: str = FADE):
+        """Snapshot target as it now looks and animate to it."""
+        if not self.isVisible():
+            return
+        # Hidden only for the grab; no paint happens before it is shown again
+        self.hide()
+        self._incoming = self._target.grab()
+        self.show()
+        self._style = style
+        self._progress = 0.0
+        self._started = time.monotonic()
+        get_animation_clock().subscribe(self, self._step, TRANSITION_FRAME_MS)
+        self.update()
+
+    def finish(self):
+        """Drop the overlay immediately, showing the live screen."""
+        get_animation_clock().unsubscribe(self)
+        self._outgoing = self._incoming = None
+        self.hide()
+
+    def _step(self):
+        t = (time.monotonic() - self._started) * 1000 / TRANSITION_MS
+        if t >= 1:
+            self.finish()
+            return
+        self._progress = self._easing.valueForProgress(t)
+        self.update()
+
+    def paintEvent(self, event):
+        if self._outgoing is None:
+            return
+        painter = QPainter(self)
+        if self._incoming is None:
+            painter.drawPixmap(0, 0, self._outgoing)
+        elif self._style == FADE:
+            painter.drawPixmap(0, 0, self._incoming)
+            painter.setOpacity(1 - self._progress)
+            painter.drawPixmap(0, 0, self._outgoing)
+        else:
+            sign = 1 if self._style == SLIDE_RIGHT else -1
+            offset = int(sign * self.width() * self._progress)
+            painter.drawPixmap(offset, 0, self._outgoing)
+            painter.drawPixmap(offset - sign * self.width(), 0, self._incoming)
+        painter.end()
@@ -8,10 +8,11 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QLineEdit, QProgressBar, QFrame, QSizePolicy
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QKeyEvent, QCursor
 
 from data.genres import Genre
+from ui.animation_clock import get_animation_clock
 
 
 RANDOM_WORD_BANKS = {
@@ -200,9 +201,8 @@ class WordInputScreen(QWidget):
             f"Story quality: deteriorating (as intended)…",
         ]
         self._corruption_idx = 0
-        self._corruption_timer = QTimer(self)
-        self._corruption_timer.timeout.connect(self._cycle_corruption)
-        self._corruption_timer.start(2500)
+        # Only ticks while this screen is on screen
+        get_animation_clock().subscribe(self._corruption_label, self._cycle_corruption, 2500)
 
     def set_genre(self, genre: Genre):
         self._genre = genre